@@ -0,0 +1,139 @@
+"""Micro-benchmark for parallel cleansing, compared against a git revision.
+
+Runs a billing rule (standardize, fill_missing, two deduplicate steps) over a
+synthetic dataset serially with `CleansingEngine.run` and on a process pool
+with `run_parallel`, and prints wall time plus the CPU time spent in the
+parent process. Parent CPU is the serial share (transposition, pickling,
+routing, reordering) that does not shrink as workers are added. The same
+benchmark is run on `--against` (default HEAD~1, the commit before the
+current one) from a temporary export of its `src/` tree, and the delta is
+printed next to each number. Run from the repository root:
+
+    python scripts/benchmark_cleansing_parallel.py --rows 200000 --workers 4
+    python scripts/benchmark_cleansing_parallel.py --against none
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from typing import Dict, Optional
+
+
+def build_dataset(rows: int, seed: int = 42) -> list:
+    """Billing-like rows with repeated invoice numbers and sparse nulls."""
+    rng = random.Random(seed)
+    currencies = ["usd", "eur", "gbp", None]
+    return [
+        {
+            "InvoiceNumber": f"INV-{rng.randrange(rows // 2):08d}",
+            "Currency": rng.choice(currencies),
+            "CustomerId": f"C{rng.randrange(5000)}" if rng.random() > 0.1 else None,
+            "Amount": round(rng.uniform(0, 1000), 2),
+            "Status": rng.choice(["PAID", "FAILED", "OPEN"]),
+        }
+        for _ in range(rows)
+    ]
+
+
+def measure(rows: int, workers: int, repeats: int) -> Dict[str, float]:
+    """Best-of-`repeats` seconds for the `dq_cleansing` currently on sys.path."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    from dq_cleansing import (
+        CleansingEngine,
+        CleansingJob,
+        CleansingRule,
+        TransformationStep,
+    )
+
+    dataset = build_dataset(rows)
+    rule = CleansingRule(
+        rule_id="benchmark",
+        name="Benchmark",
+        dataset_type="billing",
+        version="1",
+        transformations=[
+            TransformationStep(type="deduplicate", target_fields=["InvoiceNumber"]),
+            TransformationStep(type="standardize", target_fields=["Currency"], parameters={"format": "ISO-4217"}),
+            TransformationStep(type="fill_missing", target_fields=["CustomerId"], parameters={"default": "UNKNOWN"}),
+            TransformationStep(type="deduplicate", target_fields=["CustomerId", "Currency"]),
+        ],
+    )
+    job = CleansingJob(job_id="benchmark", tenant_id="benchmark", dataset_type="billing", rule_id="benchmark")
+    engine = CleansingEngine()
+
+    results = {"serial_wall": float("inf"), "parallel_wall": float("inf"), "parallel_parent_cpu": float("inf")}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        engine.run_parallel(job, rule, dataset[:1000], workers=workers, executor=pool)  # Warm up the pool.
+        for _ in range(repeats):
+            started = time.perf_counter()
+            engine.run(job, rule, dataset)
+            results["serial_wall"] = min(results["serial_wall"], time.perf_counter() - started)
+
+            started, cpu = time.perf_counter(), time.process_time()
+            engine.run_parallel(job, rule, dataset, workers=workers, executor=pool)
+            results["parallel_wall"] = min(results["parallel_wall"], time.perf_counter() - started)
+            results["parallel_parent_cpu"] = min(results["parallel_parent_cpu"], time.process_time() - cpu)
+    return results
+
+
+def measure_revision(revision: str, rows: int, workers: int, repeats: int) -> Dict[str, float]:
+    """Run this script against `src/` as of `revision` in a subprocess."""
+    archive = subprocess.run(["git", "archive", revision, "src"], check=True, capture_output=True).stdout
+    with tempfile.TemporaryDirectory() as directory:
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            tar.extractall(directory)
+        output = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--rows", str(rows),
+                "--workers", str(workers),
+                "--repeats", str(repeats),
+                "--src", os.path.join(directory, "src"),
+                "--json",
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def report(current: Dict[str, float], baseline: Optional[Dict[str, float]], revision: str) -> None:
+    for name, seconds in current.items():
+        line = f"  {name:<20} {seconds:>8.2f} s"
+        if baseline and name in baseline:
+            delta = (seconds / baseline[name] - 1) * 100
+            line += f"   {revision}: {baseline[name]:>8.2f} s  ({delta:+.1f}%)"
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--against", default="HEAD~1", help="git revision to compare with, or 'none'")
+    parser.add_argument("--src", default="src", help=argparse.SUPPRESS)
+    parser.add_argument("--json", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    sys.path.insert(0, args.src)
+    current = measure(args.rows, args.workers, args.repeats)
+    if args.json:
+        print(json.dumps(current))
+        sys.exit(0)
+
+    baseline = None
+    if args.against.lower() != "none":
+        baseline = measure_revision(args.against, args.rows, args.workers, args.repeats)
+    print(f"--- Cleansing {args.rows} rows, {args.workers} workers, {os.cpu_count()} CPUs (best of {args.repeats}) ---")
+    report(current, baseline, args.against)
@@ -0,0 +1,134 @@
+"""Micro-benchmark for the profiler, compared against a git revision.
+
+Profiles a wide synthetic billing dataset and prints rows per second for each
+profiling mode, plus the pandas path over the same data read as strings (the
+CSV case). The same benchmark is run on `--against` (default HEAD~1, the
+commit before the current one) from a temporary export of its `src/` tree,
+and the delta is printed next to each number. Pass `--against HEAD` to
+measure uncommitted changes before committing them. Run from the
+repository root:
+
+    python scripts/benchmark_profiler.py --rows 50000 --columns 40
+    python scripts/benchmark_profiler.py --against HEAD
+    python scripts/benchmark_profiler.py --against none
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from typing import Dict, Optional
+
+
+def build_dataset(rows: int, columns: int, seed: int = 42) -> list:
+    """Billing-like rows: amounts, statuses, IDs, free text and sparse nulls."""
+    rng = random.Random(seed)
+    statuses = ["PAID", "FAILED", "OPEN", "REFUNDED"]
+    dataset = []
+    for index in range(rows):
+        row = {"InvoiceNumber": f"INV-{index:08d}", "CustomerId": f"C{rng.randrange(5000)}"}
+        for column in range(columns - 2):
+            kind = column % 4
+            if rng.random() < 0.05:
+                value = None
+            elif kind == 0:
+                value = round(rng.uniform(0, 1000), 2)
+            elif kind == 1:
+                value = rng.randrange(100)
+            elif kind == 2:
+                value = rng.choice(statuses)
+            else:
+                value = f"note-{rng.randrange(200)}"
+            row[f"field_{column}"] = value
+        dataset.append(row)
+    return dataset
+
+
+def measure(rows: int, columns: int, repeats: int) -> Dict[str, float]:
+    """Best-of-`repeats` rows/s per mode for the `dq_profiling` currently on sys.path."""
+    from dq_profiling import ProfilingEngine, ProfilingJob
+
+    dataset = build_dataset(rows, columns)
+    job = ProfilingJob(job_id="benchmark", tenant_id="benchmark", dataset_type="billing")
+    cases = {mode: (ProfilingEngine(mode=mode), dataset) for mode in ("exact", "sketch")}
+    try:
+        import pandas as pd
+
+        from dq_engine.pandas_engine import PandasDatasetHandle
+    except ImportError:
+        pass
+    else:
+        frame = pd.DataFrame(dataset).astype("string").astype(object)
+        frame = frame.where(frame.notna(), None)
+        cases["pandas"] = (ProfilingEngine(), PandasDatasetHandle(frame))
+
+    results = {}
+    for name, (engine, data) in cases.items():
+        best = float("inf")
+        for _ in range(repeats):
+            started = time.perf_counter()
+            engine.profile(job, data)
+            best = min(best, time.perf_counter() - started)
+        results[name] = rows / best
+    return results
+
+
+def measure_revision(revision: str, rows: int, columns: int, repeats: int) -> Dict[str, float]:
+    """Run this script against `src/` as of `revision` in a subprocess."""
+    archive = subprocess.run(["git", "archive", revision, "src"], check=True, capture_output=True).stdout
+    with tempfile.TemporaryDirectory() as directory:
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            tar.extractall(directory)
+        output = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--rows", str(rows),
+                "--columns", str(columns),
+                "--repeats", str(repeats),
+                "--src", os.path.join(directory, "src"),
+                "--json",
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def report(current: Dict[str, float], baseline: Optional[Dict[str, float]], revision: str) -> None:
+    for name, rate in current.items():
+        line = f"  {name:<6} {rate:>12,.0f} rows/s"
+        if baseline and name in baseline:
+            delta = (rate / baseline[name] - 1) * 100
+            line += f"   {revision}: {baseline[name]:>10,.0f} rows/s  ({delta:+.1f}%)"
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--columns", type=int, default=40)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--against", default="HEAD~1", help="git revision to compare with, or 'none'")
+    parser.add_argument("--src", default="src", help=argparse.SUPPRESS)
+    parser.add_argument("--json", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    sys.path.insert(0, args.src)
+    current = measure(args.rows, args.columns, args.repeats)
+    if args.json:
+        print(json.dumps(current))
+        sys.exit(0)
+
+    baseline = None
+    if args.against.lower() != "none":
+        baseline = measure_revision(args.against, args.rows, args.columns, args.repeats)
+    print(f"--- Profiling {args.rows} rows x {args.columns} columns (best of {args.repeats}) ---")
+    report(current, baseline, args.against)
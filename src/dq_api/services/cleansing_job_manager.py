@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from dq_cleansing import (
     CleansingEngine,
@@ -12,6 +12,7 @@ from dq_cleansing import (
     CleansingRule,
     CleansingRuleLibrary,
 )
+from dq_cleansing.engine.rejections import read_rejections
 
 
 class CleansingJobManager:
@@ -93,6 +94,14 @@ class CleansingJobManager:
 
         return self._outputs.get(job_id)
 
+    def iter_rejected_rows(self, job_id: str) -> Optional[Iterator[Dict[str, Any]]]:
+        """Stream the full rejection set of a job from its spill file, if one was written."""
+
+        result = self._results.get(job_id)
+        if not result or not result.rejected_ref:
+            return None
+        return read_rejections(result.rejected_ref)
+
     def link_validation_job(self, job_id: str, validation_job_id: str) -> Optional[CleansingJobResult]:
         """Persist the validation job id that consumed the cleansing output."""
 
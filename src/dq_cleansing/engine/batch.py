@@ -0,0 +1,135 @@
+"""Columnar batch representation used by the cleansing engine.
+
+A batch stores one list per field instead of one dict per row. Steps replace
+only the columns they change and share every other column list with the
+previous batch (copy-on-write), so running N steps no longer makes N copies of
+the dataset. Column lists are never mutated in place once a batch exists.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Iterator, List, Sequence
+
+
+class _Missing:
+    """Marks a field that was absent from a row (distinct from an explicit None)."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+    def __reduce__(self) -> str:
+        # Unpickle to the module singleton so `is MISSING` holds across processes.
+        return "MISSING"
+
+
+MISSING: Any = _Missing()
+
+
+class ColumnarBatch:
+    """Immutable dict-of-lists view of a row dataset."""
+
+    __slots__ = ("_columns", "_length", "_sparse")
+
+    def __init__(self, columns: Dict[str, List[Any]], length: int, *, sparse: bool = False) -> None:
+        self._columns = columns
+        self._length = length
+        # True when some rows lacked some fields; rows are then rebuilt without them.
+        self._sparse = sparse
+
+    @classmethod
+    def concat(cls, batches: Sequence["ColumnarBatch"]) -> "ColumnarBatch":
+        """Stack batches row-wise; fields absent from a batch become MISSING there."""
+        names: Dict[str, None] = {}
+        for batch in batches:
+            names.update(dict.fromkeys(batch._columns))
+        columns: Dict[str, List[Any]] = {name: [] for name in names}
+        sparse = False
+        for batch in batches:
+            for name, column in columns.items():
+                column.extend(batch.column(name))
+            if len(batch):
+                sparse = sparse or batch._sparse or len(batch._columns) != len(names)
+        return cls(columns, sum(len(batch) for batch in batches), sparse=sparse)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> "ColumnarBatch":
+        """Transpose rows in a single pass; fields a row lacks are stored as MISSING."""
+        columns: Dict[str, List[Any]] = {}
+        length = 0
+        sparse = False
+        for row in rows:
+            for name, value in row.items():
+                column = columns.get(name)
+                if column is None:
+                    column = columns[name] = [MISSING] * length
+                    sparse = sparse or length > 0
+                column.append(value)
+            length += 1
+            # Row keys are unique, so a full-width row appended to every column.
+            if len(row) != len(columns):
+                sparse = True
+                for column in columns.values():
+                    if len(column) < length:
+                        column.append(MISSING)
+        return cls(columns, length, sparse=sparse)
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def field_names(self) -> List[str]:
+        return list(self._columns)
+
+    def column(self, name: str) -> Sequence[Any]:
+        """Values of one field; MISSING for every row when the field never appeared."""
+        column = self._columns.get(name)
+        return column if column is not None else [MISSING] * self._length
+
+    def has_column(self, name: str) -> bool:
+        return name in self._columns
+
+    def with_columns(self, replacements: Dict[str, List[Any]]) -> "ColumnarBatch":
+        """New batch with `replacements` swapped in; all other columns are shared."""
+        if not replacements:
+            return self
+        columns = dict(self._columns)
+        columns.update(replacements)
+        return ColumnarBatch(columns, self._length, sparse=self._sparse)
+
+    def without_columns(self, names: Iterable[str]) -> "ColumnarBatch":
+        """New batch without the given fields; all other columns are shared."""
+        dropped = set(names)
+        columns = {name: column for name, column in self._columns.items() if name not in dropped}
+        return ColumnarBatch(columns, self._length, sparse=self._sparse)
+
+    def take(self, indices: Sequence[int]) -> "ColumnarBatch":
+        """New batch holding only the rows at `indices`, in that order."""
+        if len(indices) == self._length and all(index == position for position, index in enumerate(indices)):
+            return self
+        columns = {name: [column[index] for index in indices] for name, column in self._columns.items()}
+        return ColumnarBatch(columns, len(indices), sparse=self._sparse)
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """Rebuild a single row, e.g. for rejection payloads."""
+        return {
+            name: column[index]
+            for name, column in self._columns.items()
+            if column[index] is not MISSING
+        }
+
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        names = list(self._columns)
+        if not names:
+            return iter([{} for _ in range(self._length)])
+        values = zip(*self._columns.values())
+        if not self._sparse:
+            return (dict(zip(names, row)) for row in values)
+        return (
+            {name: value for name, value in zip(names, row) if value is not MISSING}
+            for row in values
+        )
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        return list(self.iter_rows())
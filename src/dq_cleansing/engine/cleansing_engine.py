@@ -1,20 +1,24 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Tuple
 
-from ..models.cleansing_job import (
-    CleansingJob,
-    CleansingJobResult,
-    CleansingJobStatus,
-)
+from ..models.cleansing_job import CleansingJob, CleansingJobResult
 from ..models.cleansing_rule import CleansingRule
 try:
     from dq_engine.base import ExecutionEngine
-    from dq_engine.pandas_engine import PandasExecutionEngine
+    from dq_engine.pandas_engine import PandasDatasetHandle, PandasExecutionEngine
 except Exception:  # pragma: no cover - engine abstraction optional during stub phase
     ExecutionEngine = None  # type: ignore
+    PandasDatasetHandle = None  # type: ignore
     PandasExecutionEngine = None  # type: ignore
-from .transformer import TransformationOutcome, apply_transformation
+from .batch import ColumnarBatch
+from .key_index import PersistentKeyIndex, ScopedKeyIndex
+from .parallel import run_parallel
+from .planner import compile_plan
+from .rejections import RejectedRowSink
+from .streaming import CleansingStream, chunk_rows, job_result
 from .validators import validate_rule
 
 Dataset = List[Dict[str, Any]]
@@ -23,42 +27,154 @@ Dataset = List[Dict[str, Any]]
 class CleansingEngine:
     """Executes cleansing transformations in order and captures metrics."""
 
-    def __init__(self, execution_engine: ExecutionEngine | None = None) -> None:
+    def __init__(
+        self,
+        execution_engine: ExecutionEngine | None = None,
+        rejected_sample_size: int = 10,
+        rejected_spill_dir: str | None = None,
+        key_index: PersistentKeyIndex | None = None,
+    ) -> None:
         self._validator = validate_rule
+        # Jobs may override the sample size via `options["rejected_sample_size"]`.
+        self.rejected_sample_size = rejected_sample_size
+        # When set, every rejected row is streamed to `<job_id>.rejected.ndjson.gz` here.
+        self.rejected_spill_dir = rejected_spill_dir
+        # Backs `deduplicate` steps with `parameters["cross_batch"]`, scoped per tenant and dataset type.
+        self.key_index = key_index
         # TODO: delegate dataset operations to execution_engine once cleansing
-        # pipeline is refactored. For now, keep in-memory list-of-dicts logic.
+        # pipeline is refactored. For now, steps run on an in-memory columnar batch.
         self.execution_engine = execution_engine or (PandasExecutionEngine() if PandasExecutionEngine else None)
 
+    def _pandas_engine(self) -> PandasExecutionEngine:
+        if isinstance(self.execution_engine, PandasExecutionEngine):
+            return self.execution_engine
+        return PandasExecutionEngine()
+
+    def _scoped_key_index(self, job: CleansingJob) -> ScopedKeyIndex | None:
+        if self.key_index is None:
+            return None
+        return ScopedKeyIndex(self.key_index, job.tenant_id, job.dataset_type)
+
+    def _rejection_sink(self, job: CleansingJob) -> RejectedRowSink:
+        spill_path = None
+        if self.rejected_spill_dir:
+            os.makedirs(self.rejected_spill_dir, exist_ok=True)
+            spill_path = os.path.join(self.rejected_spill_dir, f"{job.job_id}.rejected.ndjson.gz")
+        sample_size = int(job.options.get("rejected_sample_size", self.rejected_sample_size))
+        return RejectedRowSink(sample_size=sample_size, spill_path=spill_path)
+
     def run(
         self,
         job: CleansingJob,
         rule: CleansingRule,
-        dataset: Dataset,
-    ) -> Tuple[CleansingJobResult, Dataset, List[str]]:
-        """Execute a cleansing job, returning the result, cleansed dataset, and warnings."""
+        dataset: Iterable[Dict[str, Any]] | PandasDatasetHandle,
+    ) -> Tuple[CleansingJobResult, Dataset | PandasDatasetHandle, List[str]]:
+        """Execute a cleansing job, returning the result, cleansed dataset, and warnings.
+
+        Rows are processed in chunks (see `run_stream`), so rejected rows are
+        held one chunk at a time; the result carries per-reason counts, a
+        bounded sample and, with `rejected_spill_dir`, a reference to the full
+        rejection file. Consecutive row-local steps are fused by the
+        execution plan. A
+        `PandasDatasetHandle` is cleansed with native pandas operations and a
+        cleansed handle is returned instead of rows.
+        """
+        if PandasDatasetHandle is not None and isinstance(dataset, PandasDatasetHandle):
+            if _uses_key_index(rule):
+                # The persistent key index is only wired into the row path.
+                result, rows, warnings = self.run(job, rule, dataset.df.to_dict("records"))
+                frame = type(dataset.df)(rows) if rows else dataset.df.iloc[0:0]
+                return result, PandasDatasetHandle(frame), warnings
+            warnings = self._validator(rule)
+            compile_plan(rule.transformations)  # Same unsupported-step errors as the row path.
+            sink = self._rejection_sink(job)
+            try:
+                # Each step's rejections go to the sink as soon as the step finishes.
+                cleansed, outcomes = self._pandas_engine().run_transformations(
+                    dataset, rule.transformations, on_step=lambda step, _, rejected: sink.add(rejected, step)
+                )
+            finally:
+                sink.close()
+            step_metrics = [metrics for metrics, _ in outcomes]
+            return job_result(job, rule, len(dataset.df), len(cleansed.df), step_metrics, sink), cleansed, warnings
+
+        stream = self.run_stream(job, rule, dataset)
+        cleansed = list(stream.rows())
+        return stream.result, cleansed, stream.warnings
+
+    def run_chunks(
+        self,
+        job: CleansingJob,
+        rule: CleansingRule,
+        chunks: Iterable[Iterable[Dict[str, Any]]],
+    ) -> CleansingStream:
+        """Stream cleansed chunks; `result` on the returned stream is set once it is exhausted.
+
+        Chunks are processed one at a time, so memory is bounded by the chunk
+        size plus the state global steps need (e.g. the dedup key set).
+        """
         warnings = self._validator(rule)
-        current_dataset = list(dataset)
-        aggregated_metrics: Dict[str, Any] = {}
-        aggregated_rejected: List[Dict[str, Any]] = []
-
-        for step in rule.transformations:
-            outcome: TransformationOutcome = apply_transformation(current_dataset, step)
-            current_dataset = outcome.dataset
-            aggregated_metrics[step.type] = outcome.metrics
-            aggregated_rejected.extend(outcome.rejected)
-
-        before_counts = {"rows": len(dataset)}
-        after_counts = {
-            "rows": len(current_dataset),
-            "rejected": len(aggregated_rejected),
-        }
-
-        result = CleansingJobResult(
-            job_id=job.job_id,
-            status=CleansingJobStatus.SUCCEEDED,
-            before_counts=before_counts,
-            after_counts=after_counts,
-            rejected_sample=aggregated_rejected[0] if aggregated_rejected else {},
-            metrics=aggregated_metrics,
+        plan = compile_plan(rule.transformations)
+        return CleansingStream(
+            job, rule, chunks, plan, warnings, self._rejection_sink(job), self._scoped_key_index(job)
         )
-        return result, current_dataset, warnings
+
+    def run_stream(
+        self,
+        job: CleansingJob,
+        rule: CleansingRule,
+        rows: Iterable[Dict[str, Any]],
+        chunk_size: int = 10_000,
+    ) -> CleansingStream:
+        """Like `run_chunks`, splitting a row iterator into chunks of `chunk_size` rows."""
+        return self.run_chunks(job, rule, chunk_rows(rows, chunk_size))
+
+    def run_parallel(
+        self,
+        job: CleansingJob,
+        rule: CleansingRule,
+        dataset: Iterable[Dict[str, Any]],
+        workers: int | None = None,
+        executor: Executor | None = None,
+    ) -> Tuple[CleansingJobResult, Dataset, List[str]]:
+        """Like `run`, spreading the work over `workers` processes (default: CPU count).
+
+        Pass `executor` to reuse an existing pool; `workers` then sets the
+        number of partitions.
+
+        Row-local steps run over contiguous slices and each deduplicate step
+        over hash partitions of its keys. Output order, metrics and
+        rejections match `run`.
+        """
+        warnings = self._validator(rule)
+        compile_plan(rule.transformations)  # Reject unsupported steps before starting workers.
+        batch = ColumnarBatch.from_rows(dataset)
+        partitions = workers or os.cpu_count() or 1
+        key_index = self._scoped_key_index(job)
+        sink = self._rejection_sink(job)
+
+        def on_step(step: int, metrics: Dict[str, Any], rejected: List[Dict[str, Any]]) -> None:
+            # Rejections go to the sink as each segment finishes.
+            sink.add(rejected, step)
+
+        try:
+            if executor is not None:
+                output, outcomes = run_parallel(rule.transformations, batch, executor, partitions, key_index, on_step)
+            else:
+                with ProcessPoolExecutor(max_workers=partitions) as pool:
+                    output, outcomes = run_parallel(rule.transformations, batch, pool, partitions, key_index, on_step)
+        except BaseException:
+            if key_index is not None:
+                key_index.rollback()
+            raise
+        finally:
+            sink.close()
+        if key_index is not None:
+            key_index.commit()
+
+        step_metrics = [metrics for metrics, _ in outcomes]
+        return job_result(job, rule, len(batch), len(output), step_metrics, sink), output.to_rows(), warnings
+
+
+def _uses_key_index(rule: CleansingRule) -> bool:
+    return any(step.type == "deduplicate" and step.parameters.get("cross_batch") for step in rule.transformations)
@@ -0,0 +1,148 @@
+"""Compiled, column-at-a-time evaluation of `TransformationStep.condition`.
+
+A condition is a Python expression over field names, for example
+``Country == 'GR' and Amount >= 100``. It is parsed once, checked against a
+whitelist of node types (no calls, attributes or subscripts) and compiled
+into functions that map whole columns of a `ColumnarBatch` to a boolean
+mask. Compiled conditions are cached by expression text. Absent fields
+evaluate as None; ordering comparisons that raise TypeError (e.g. ``None >
+1``) are False.
+"""
+
+from __future__ import annotations
+
+import ast
+import operator
+from functools import lru_cache
+from typing import Any, Callable, FrozenSet, List
+
+from .batch import MISSING, ColumnarBatch
+
+Vector = Callable[[ColumnarBatch], List[Any]]
+
+
+class ConditionError(ValueError):
+    """Raised when a condition cannot be parsed or uses unsupported syntax."""
+
+
+def _ordering(compare: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    def safe(left: Any, right: Any) -> bool:
+        try:
+            return compare(left, right)
+        except TypeError:
+            return False
+
+    return safe
+
+
+def _contains(left: Any, right: Any) -> bool:
+    try:
+        return left in right
+    except TypeError:
+        return False
+
+
+_COMPARISONS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: _ordering(operator.lt),
+    ast.LtE: _ordering(operator.le),
+    ast.Gt: _ordering(operator.gt),
+    ast.GtE: _ordering(operator.ge),
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+    ast.In: _contains,
+    ast.NotIn: lambda left, right: not _contains(left, right),
+}
+
+
+class CompiledCondition:
+    """A parsed condition; `mask(batch)` evaluates it for every row at once."""
+
+    def __init__(self, expression: str, vector: Vector, fields: FrozenSet[str]) -> None:
+        self.expression = expression
+        self.fields = fields
+        self._vector = vector
+
+    def mask(self, batch: ColumnarBatch) -> List[bool]:
+        return [bool(value) for value in self._vector(batch)]
+
+
+class _Compiler:
+    def __init__(self) -> None:
+        self.fields: set[str] = set()
+
+    def compile(self, node: ast.AST) -> Vector:
+        if isinstance(node, ast.Name):
+            return self._field(node.id)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            operand = self.compile(node.operand)
+            return lambda batch: [not value for value in operand(batch)]
+        if isinstance(node, (ast.Constant, ast.List, ast.Tuple, ast.Set, ast.UnaryOp)):
+            value = self._literal(node)
+            return lambda batch: [value] * len(batch)
+        if isinstance(node, ast.BoolOp):
+            operands = [self.compile(value) for value in node.values]
+            combine = all if isinstance(node.op, ast.And) else any
+            return lambda batch: [combine(values) for values in zip(*(operand(batch) for operand in operands))]
+        if isinstance(node, ast.Compare):
+            return self._compare(node)
+        raise ConditionError(f"unsupported syntax in condition: {type(node).__name__}")
+
+    def _field(self, name: str) -> Vector:
+        self.fields.add(name)
+
+        def column(batch: ColumnarBatch) -> List[Any]:
+            if not batch.has_column(name):
+                return [None] * len(batch)
+            return [None if value is MISSING else value for value in batch.column(name)]
+
+        return column
+
+    def _literal(self, node: ast.AST) -> Any:
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            value = self._literal(node.operand)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ConditionError("unary minus/plus only applies to numbers")
+            return -value if isinstance(node.op, ast.USub) else value
+        if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+            values = tuple(self._literal(element) for element in node.elts)
+            try:
+                return frozenset(values)
+            except TypeError:
+                return values
+        raise ConditionError(f"unsupported literal in condition: {type(node).__name__}")
+
+    def _compare(self, node: ast.Compare) -> Vector:
+        operands = [self.compile(node.left), *(self.compile(comparator) for comparator in node.comparators)]
+        operators = []
+        for op in node.ops:
+            compare = _COMPARISONS.get(type(op))
+            if compare is None:
+                raise ConditionError(f"unsupported comparison in condition: {type(op).__name__}")
+            operators.append(compare)
+
+        def evaluate(batch: ColumnarBatch) -> List[Any]:
+            columns = [operand(batch) for operand in operands]
+            result = list(map(operators[0], columns[0], columns[1]))
+            for index in range(1, len(operators)):
+                # Chained comparisons: a < b < c is a < b and b < c.
+                pairwise = map(operators[index], columns[index], columns[index + 1])
+                result = [left and right for left, right in zip(result, pairwise)]
+            return result
+
+        return evaluate
+
+
+@lru_cache(maxsize=256)
+def compile_condition(expression: str) -> CompiledCondition:
+    """Parse and compile a condition; results are cached by expression text."""
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as exc:
+        raise ConditionError(f"invalid condition {expression!r}: {exc.msg}") from exc
+    compiler = _Compiler()
+    vector = compiler.compile(tree.body)
+    return CompiledCondition(expression, vector, frozenset(compiler.fields))
@@ -0,0 +1,208 @@
+"""Persistent dedup key index for duplicates across deliveries.
+
+Keys seen by `deduplicate` steps with `cross_batch` enabled are stored as
+128-bit digests in a SQLite table, scoped by (tenant, dataset_type, keys).
+A key is "seen" until it is older than the index TTL; expired keys are
+ignored by lookups, overwritten when they reappear and physically removed
+by `evict`. A cleansing run does not write to the index directly: its new
+keys are staged under a run id and only become visible to later runs when
+the run succeeds and `commit` is called, so a failed or retried job never
+loses rows to keys of an attempt that did not finish. Staged keys of a run
+that neither committed nor rolled back (a killed worker) are removed by
+`evict` once they are older than the staging timeout. Lookups and inserts
+are batched (one `IN` query per
+`LOOKUP_BATCH` keys and one `executemany` per call), so a million keys cost
+about a thousand queries and one bulk insert rather than a million round
+trips.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Sequence
+
+from .spill import key_digest
+
+# Stays under SQLite's default host-parameter limit together with the scope.
+LOOKUP_BATCH = 900
+
+# Staged keys older than this belong to a run that died without committing.
+DEFAULT_STAGING_TIMEOUT = 24 * 3600.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dedup_keys (
+    scope TEXT NOT NULL,
+    digest BLOB NOT NULL,
+    seen_at REAL NOT NULL,
+    PRIMARY KEY (scope, digest)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS dedup_keys_seen_at ON dedup_keys (scope, seen_at);
+CREATE TABLE IF NOT EXISTS dedup_staged (
+    run_id TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    digest BLOB NOT NULL,
+    seen_at REAL NOT NULL,
+    PRIMARY KEY (run_id, scope, digest)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS dedup_staged_seen_at ON dedup_staged (scope, seen_at);
+"""
+
+
+class PersistentKeyIndex:
+    """SQLite-backed set of key digests with time-based expiry.
+
+    `staging_timeout` must exceed the longest run: staged keys older than it
+    are treated as abandoned by `evict`. Instances can be pickled to worker
+    processes; each process opens its own connection on first use.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: Optional[float] = None,
+        staging_timeout: float = DEFAULT_STAGING_TIMEOUT,
+    ) -> None:
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be positive")
+        if staging_timeout <= 0:
+            raise ValueError("staging_timeout must be positive")
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.staging_timeout = staging_timeout
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "ttl_seconds": self.ttl_seconds,
+            "staging_timeout": self.staging_timeout,
+            "_connection": None,
+        }
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            # Thread pools share one connection; sqlite3 serialises access to it.
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _cutoff(self, now: float) -> float:
+        return now - self.ttl_seconds if self.ttl_seconds is not None else float("-inf")
+
+    def check_and_add(self, scope: str, keys: Sequence[Any], now: Optional[float] = None) -> List[bool]:
+        """For each key, whether it was stored (and not expired) before this call; stores the rest."""
+        return self._check(scope, keys, now, None)
+
+    def stage(self, run_id: str, scope: str, keys: Sequence[Any], now: Optional[float] = None) -> List[bool]:
+        """Like `check_and_add`, but new keys are held under `run_id` until `commit`."""
+        return self._check(scope, keys, now, run_id)
+
+    def commit(self, run_id: str, now: Optional[float] = None) -> None:
+        """Publish the keys staged under `run_id`, then evict expired keys in their scopes."""
+        with self.connection as connection:
+            scopes = [
+                scope
+                for (scope,) in connection.execute("SELECT DISTINCT scope FROM dedup_staged WHERE run_id = ?", (run_id,))
+            ]
+            connection.execute(
+                "INSERT INTO dedup_keys (scope, digest, seen_at) "
+                "SELECT scope, digest, seen_at FROM dedup_staged WHERE run_id = ? "
+                "ON CONFLICT (scope, digest) DO UPDATE SET seen_at = excluded.seen_at",
+                (run_id,),
+            )
+            connection.execute("DELETE FROM dedup_staged WHERE run_id = ?", (run_id,))
+        for scope in scopes:
+            self.evict(scope, now)
+
+    def rollback(self, run_id: str) -> None:
+        """Discard the keys staged under `run_id`."""
+        with self.connection as connection:
+            connection.execute("DELETE FROM dedup_staged WHERE run_id = ?", (run_id,))
+
+    def _check(self, scope: str, keys: Sequence[Any], now: Optional[float], run_id: Optional[str]) -> List[bool]:
+        now = time.time() if now is None else now
+        cutoff = self._cutoff(now)
+        digests = [key_digest(key) for key in keys]
+        seen: set[bytes] = set()
+        connection = self.connection
+        unique = list(dict.fromkeys(digests))
+        for start in range(0, len(unique), LOOKUP_BATCH):
+            chunk = unique[start : start + LOOKUP_BATCH]
+            placeholders = ",".join("?" * len(chunk))
+            # Expiry is checked here rather than in SQL so the planner always
+            # probes the primary key instead of range-scanning the seen_at index.
+            rows = connection.execute(
+                f"SELECT digest, seen_at FROM dedup_keys WHERE scope = ? AND digest IN ({placeholders})",
+                (scope, *chunk),
+            )
+            seen.update(digest for digest, seen_at in rows if seen_at >= cutoff)
+
+        # Sorted inserts walk the primary-key B-tree in order.
+        fresh = sorted(digest for digest in unique if digest not in seen)
+        with connection:
+            if run_id is None:
+                # Expired rows for reappearing keys are refreshed in place.
+                connection.executemany(
+                    "INSERT INTO dedup_keys (scope, digest, seen_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT (scope, digest) DO UPDATE SET seen_at = excluded.seen_at",
+                    [(scope, digest, now) for digest in fresh],
+                )
+            else:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO dedup_staged (run_id, scope, digest, seen_at) VALUES (?, ?, ?, ?)",
+                    [(run_id, scope, digest, now) for digest in fresh],
+                )
+        return [digest in seen for digest in digests]
+
+    def evict(self, scope: Optional[str] = None, now: Optional[float] = None) -> int:
+        """Delete expired keys and abandoned staged keys (in one scope or all).
+
+        Returns how many rows were removed from both tables.
+        """
+        now = time.time() if now is None else now
+        removed = 0
+        with self.connection as connection:
+            for table, cutoff in (("dedup_keys", self._cutoff(now)), ("dedup_staged", now - self.staging_timeout)):
+                if scope is None:
+                    cursor = connection.execute(f"DELETE FROM {table} WHERE seen_at < ?", (cutoff,))
+                else:
+                    cursor = connection.execute(f"DELETE FROM {table} WHERE scope = ? AND seen_at < ?", (scope, cutoff))
+                removed += cursor.rowcount
+        return removed
+
+
+class ScopedKeyIndex:
+    """A `PersistentKeyIndex` bound to one tenant, dataset type and run.
+
+    Keys checked through `stage` are held under the run id; whoever owns the
+    run calls `commit` once it succeeded, or `rollback`.
+    """
+
+    def __init__(self, index: PersistentKeyIndex, tenant_id: str, dataset_type: str) -> None:
+        self.index = index
+        self.tenant_id = tenant_id
+        self.dataset_type = dataset_type
+        self.run_id = uuid.uuid4().hex
+
+    def scope(self, keys: Sequence[str]) -> str:
+        return "\x1f".join([self.tenant_id, self.dataset_type, *keys])
+
+    def stage(self, scope: str, keys: Sequence[Any]) -> List[bool]:
+        return self.index.stage(self.run_id, scope, keys)
+
+    def commit(self) -> None:
+        self.index.commit(self.run_id)
+
+    def rollback(self) -> None:
+        self.index.rollback(self.run_id)
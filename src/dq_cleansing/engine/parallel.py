@@ -0,0 +1,175 @@
+"""Process-pool execution of a cleansing plan.
+
+The plan is cut into segments at every global step. The first segment holds
+only row-local steps and runs over contiguous slices of the dataset. Each
+later segment starts with a deduplicate step and runs over hash partitions
+of its `keys`, so every worker sees all rows of a key and can deduplicate
+on its own; a plan that starts with a deduplicate step gets an empty first
+segment whose workers only route their slice. Workers exchange
+`ColumnarBatch` pieces (cheaper to pickle than row dicts), split their
+output by the next segment's partition and put the pieces they receive back
+in original order, so between segments the parent only hands pieces on.
+Every row carries its original position through the workers; rows and
+rejections are put back in that order, so output and metrics match a serial
+run.
+"""
+
+from __future__ import annotations
+
+import zlib
+from concurrent.futures import Executor
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..models.cleansing_rule import TransformationStep
+from .batch import ColumnarBatch
+from .key_index import ScopedKeyIndex
+from .planner import compile_plan
+from .spill import key_bytes
+from .transformer import (
+    GLOBAL_STEP_FACTORIES,
+    Metrics,
+    Rejected,
+    dedup_key,
+    deduplicate_keys,
+    merge_metrics,
+)
+
+# Hidden column that carries each row's original position through the workers.
+POSITION = "\x00position"
+
+Segment = Tuple[Optional[List[str]], List[TransformationStep]]
+TaggedRejected = List[Tuple[int, Dict[str, Any]]]
+SegmentOutput = Tuple[List[ColumnarBatch], List[Tuple[Metrics, TaggedRejected]]]
+
+
+def plan_segments(steps: Sequence[TransformationStep]) -> List[Segment]:
+    """Cut steps before each global step; returns (partition keys or None, steps) per segment."""
+    segments: List[Segment] = []
+    for step in steps:
+        if step.type in GLOBAL_STEP_FACTORIES:
+            segments.append((deduplicate_keys(step), [step]))
+        elif segments:
+            segments[-1][1].append(step)
+        else:
+            segments.append((None, [step]))
+    return segments
+
+
+def partition_of(key: Tuple[Any, ...], partitions: int) -> int:
+    """Stable partition for a key tuple, identical in every process (unlike `hash`).
+
+    Uses the dedup digest's canonical encoding, so keys that compare equal
+    (e.g. `(1,)` and `(1.0,)`) meet in the same partition.
+    """
+    return zlib.crc32(key_bytes(key)) % partitions
+
+
+def partitions_for(batch: ColumnarBatch, keys: Sequence[str], partitions: int) -> List[int]:
+    """Partition of every row of `batch` by its `keys` tuple."""
+    columns = [batch.column(field) for field in keys]
+    return [partition_of(dedup_key(key), partitions) for key in zip(*columns)]
+
+
+def run_segment(
+    steps: List[TransformationStep],
+    pieces: List[ColumnarBatch],
+    next_keys: Optional[List[str]],
+    partitions: int,
+    key_index: Optional[ScopedKeyIndex] = None,
+) -> SegmentOutput:
+    """Worker entry point: run `steps` on position-tagged pieces of one partition.
+
+    Returns the output (still tagged) split into the next segment's
+    partitions, or as a single batch after the last segment, and (metrics,
+    position-tagged rejections) per step.
+    """
+    batch = ColumnarBatch.concat(pieces) if len(pieces) > 1 else pieces[0]
+    positions = batch.column(POSITION)
+    if any(earlier > later for earlier, later in zip(positions, positions[1:])):
+        # Each piece is in order already; the sort merges those runs.
+        batch = batch.take(sorted(range(len(positions)), key=positions.__getitem__))
+    output, outcomes = compile_plan(steps).run(batch, key_index)
+    results = [
+        (outcome.metrics, [(entry["row"].pop(POSITION), entry) for entry in outcome.rejected])
+        for outcome in outcomes
+    ]
+    if not next_keys:
+        return [output], results
+    grouped: List[List[int]] = [[] for _ in range(partitions)]
+    for index, bucket in enumerate(partitions_for(output, next_keys, partitions)):
+        grouped[bucket].append(index)
+    return [output.take(indices) for indices in grouped], results
+
+
+def run_parallel(
+    steps: Sequence[TransformationStep],
+    batch: ColumnarBatch,
+    executor: Executor,
+    partitions: int,
+    key_index: Optional[ScopedKeyIndex] = None,
+    on_step: Optional[Callable[[int, Metrics, Rejected], None]] = None,
+) -> Tuple[ColumnarBatch, List[Tuple[Metrics, Rejected]]]:
+    """Run `steps` on `batch` across `executor`; returns the output batch and (metrics, rejected) per step.
+
+    With `on_step`, each step's (position, metrics, rejected) is handed over
+    as soon as its segment finishes and not kept; the returned rejected lists
+    are then empty.
+    """
+    if partitions < 1:
+        raise ValueError("partitions must be positive")
+    segments = plan_segments(steps)
+    if not segments or segments[0][0] is not None:
+        # Start with a row-local segment, empty if need be, so that workers
+        # rather than the parent hash rows for the first deduplicate.
+        segments.insert(0, (None, []))
+    batch = batch.with_columns({POSITION: list(range(len(batch)))})
+    step_results: List[Tuple[Metrics, Rejected]] = []
+
+    size = max(1, -(-len(batch) // partitions))
+    parts = [[batch.take(range(start, min(start + size, len(batch))))] for start in range(0, len(batch), size)]
+
+    for index, (_, segment) in enumerate(segments):
+        next_keys = segments[index + 1][0] if index + 1 < len(segments) else None
+        if parts:
+            futures = [
+                executor.submit(run_segment, segment, pieces, next_keys, partitions, key_index) for pieces in parts
+            ]
+            outputs = [future.result() for future in futures]
+        else:
+            # No rows: run locally once so every step still reports its metrics.
+            outputs = [run_segment(segment, [batch], next_keys, partitions, key_index)]
+
+        for position in range(len(segment)):
+            metrics: Metrics = {}
+            tagged: TaggedRejected = []
+            for _, results in outputs:
+                merge_metrics(metrics, results[position][0])
+                tagged.extend(results[position][1])
+            tagged.sort(key=itemgetter(0))
+            rejected = [entry for _, entry in tagged]
+            if on_step is not None:
+                on_step(len(step_results), metrics, rejected)
+                rejected = []
+            step_results.append((metrics, rejected))
+
+        if next_keys is not None:
+            # Workers already split their output; hand each partition its pieces.
+            parts = []
+            for bucket in range(partitions):
+                pieces = [split[bucket] for split, _ in outputs if len(split[bucket])]
+                if pieces:
+                    parts.append(pieces)
+
+    batch = ColumnarBatch.concat([split[0] for split, _ in outputs])
+    return batch.take(_original_order(batch)).without_columns([POSITION]), step_results
+
+
+def _original_order(batch: ColumnarBatch) -> List[int]:
+    """Row indices of `batch` sorted by original position."""
+    positions = batch.column(POSITION)
+    # Positions are unique, so placing indices by position avoids a sort.
+    slots: List[Optional[int]] = [None] * (max(positions) + 1 if positions else 0)
+    for index, position in enumerate(positions):
+        slots[position] = index
+    return [index for index in slots if index is not None]
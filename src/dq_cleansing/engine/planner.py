@@ -0,0 +1,170 @@
+"""Compile cleansing rule transformations into a fused execution plan.
+
+Consecutive row-local steps (standardize, fill_missing, and any type
+registered in `ROW_LOCAL_COMPILERS`) are fused into one stage that makes a
+single pass per touched column. Global steps, such as deduplicate, become
+stage boundaries and keep their state (e.g. the seen-key set) for the whole
+run, so a plan can process one batch or a stream of chunks. Per-step metrics
+and rejections are identical to running the steps one at a time.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+from ..models.cleansing_rule import TransformationStep
+from .batch import ColumnarBatch
+from .key_index import ScopedKeyIndex
+from .transformer import (
+    GLOBAL_STEP_FACTORIES,
+    ROW_LOCAL_COMPILERS,
+    Deduplicator,
+    TransformationError,
+    TransformationOutcome,
+    combine_outcomes,
+    compile_row_local,
+    run_row_local,
+    step_condition,
+)
+
+StageRunner = Callable[[ColumnarBatch], Tuple[ColumnarBatch, List[TransformationOutcome]]]
+
+
+@dataclass
+class PlanStage:
+    """Steps executed together: a fused run of row-local steps or one global step."""
+
+    steps: List[TransformationStep]
+    fused: bool
+
+    def runner(self, key_index: Optional[ScopedKeyIndex] = None) -> StageRunner:
+        """Fresh runner for one execution; global steps keep their state inside it."""
+        if not self.fused:
+            (step,) = self.steps
+            return _GlobalRunner(GLOBAL_STEP_FACTORIES[step.type](step, key_index=key_index))
+
+        compiled = [compile_row_local(step) for step in self.steps]
+
+        def run_fused(batch: ColumnarBatch) -> Tuple[ColumnarBatch, List[TransformationOutcome]]:
+            updated, results = run_row_local(batch, compiled)
+            # Fused steps share one output batch; intermediate batches never exist.
+            return updated, [TransformationOutcome(updated, metrics, rejected) for metrics, rejected in results]
+
+        return run_fused
+
+
+class _GlobalRunner:
+    """Stage runner around a stateful global step handler."""
+
+    def __init__(self, handler: Deduplicator) -> None:
+        self.handler = handler
+
+    def __call__(self, batch: ColumnarBatch) -> Tuple[ColumnarBatch, List[TransformationOutcome]]:
+        outcome = self.handler.process(batch)
+        return outcome.dataset, [outcome]
+
+    def finish(self) -> Iterator[Tuple[ColumnarBatch, List[TransformationOutcome]]]:
+        for outcome in self.handler.finish():
+            yield outcome.dataset, [outcome]
+
+    def close(self) -> None:
+        close = getattr(self.handler, "close", None)
+        if close is not None:
+            close()
+
+
+class PlanExecution:
+    """One run of a plan; feed it the whole dataset or consecutive chunks, in order."""
+
+    def __init__(self, stages: Sequence[PlanStage], key_index: Optional[ScopedKeyIndex] = None) -> None:
+        self._runners = [stage.runner(key_index) for stage in stages]
+        self._step_counts = [len(stage.steps) for stage in stages]
+
+    def process(self, batch: ColumnarBatch) -> Tuple[ColumnarBatch, List[TransformationOutcome]]:
+        """Run every stage on `batch`; returns the output batch and one outcome per step."""
+        outcomes: List[TransformationOutcome] = []
+        for runner in self._runners:
+            batch, stage_outcomes = runner(batch)
+            outcomes.extend(stage_outcomes)
+        return batch, outcomes
+
+    def finish(self) -> Iterator[Tuple[ColumnarBatch, List[TransformationOutcome]]]:
+        """Flush rows held back by global steps (a spilled deduplicate), in input order.
+
+        Call once after the last `process`. Each flushed batch runs through
+        the later stages; earlier steps get empty outcomes.
+        """
+        for position, runner in enumerate(self._runners):
+            finish = getattr(runner, "finish", None)
+            if finish is None:
+                continue
+            skipped = sum(self._step_counts[:position])
+            for batch, stage_outcomes in finish():
+                outcomes = [TransformationOutcome(ColumnarBatch({}, 0), {}, []) for _ in range(skipped)]
+                outcomes.extend(stage_outcomes)
+                for later in self._runners[position + 1 :]:
+                    batch, later_outcomes = later(batch)
+                    outcomes.extend(later_outcomes)
+                yield batch, outcomes
+
+    def close(self) -> None:
+        """Release resources held by global steps, such as dedup spill files."""
+        for runner in self._runners:
+            close = getattr(runner, "close", None)
+            if close is not None:
+                close()
+
+
+@dataclass
+class ExecutionPlan:
+    """Ordered stages compiled from a rule's transformations."""
+
+    stages: List[PlanStage]
+
+    def start(self, key_index: Optional[ScopedKeyIndex] = None) -> PlanExecution:
+        """Begin an execution; `key_index` backs `cross_batch` deduplicate steps."""
+        return PlanExecution(self.stages, key_index)
+
+    def run(
+        self,
+        batch: ColumnarBatch,
+        key_index: Optional[ScopedKeyIndex] = None,
+    ) -> Tuple[ColumnarBatch, List[TransformationOutcome]]:
+        """Execute every stage on a single batch."""
+        execution = self.start(key_index)
+        try:
+            results = [execution.process(batch), *execution.finish()]
+        finally:
+            execution.close()
+        if len(results) == 1:
+            return results[0]
+        output = ColumnarBatch.concat([output for output, _ in results])
+        return output, [combine_outcomes(step_outcomes) for step_outcomes in zip(*(outcomes for _, outcomes in results))]
+
+    def describe(self) -> List[List[str]]:
+        """Step types per stage, e.g. `[["standardize", "fill_missing"], ["deduplicate"]]`."""
+        return [[step.type for step in stage.steps] for stage in self.stages]
+
+
+def compile_plan(steps: Sequence[TransformationStep]) -> ExecutionPlan:
+    """Group steps into stages, fusing consecutive row-local steps.
+
+    A conditional step starts a new stage when an earlier step of the current
+    stage targets a field its condition reads, since fused steps evaluate
+    their conditions on the stage input.
+    """
+    stages: List[PlanStage] = []
+    for step in steps:
+        condition = step_condition(step)
+        if step.type in ROW_LOCAL_COMPILERS:
+            touched = {field for earlier in stages[-1].steps for field in earlier.target_fields} if stages else set()
+            if stages and stages[-1].fused and not (condition and condition.fields & touched):
+                stages[-1].steps.append(step)
+            else:
+                stages.append(PlanStage(steps=[step], fused=True))
+        elif step.type in GLOBAL_STEP_FACTORIES:
+            stages.append(PlanStage(steps=[step], fused=False))
+        else:
+            raise TransformationError(f"unsupported transformation type: {step.type}")
+    return ExecutionPlan(stages=stages)
@@ -0,0 +1,79 @@
+"""Bounded-memory sink for rejected rows.
+
+The sink keeps per-reason counters, the first rejection of each step and a
+uniform reservoir sample in memory. When given a spill path it also streams every
+rejection to a gzip-compressed NDJSON file, so the full rejection report can
+be served later without holding it in memory. The file is created on the
+first rejection only.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import random
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional
+
+Rejection = Dict[str, Any]
+
+
+class RejectedRowSink:
+    """Collects rejections one chunk at a time; call `close` when the job ends."""
+
+    def __init__(self, sample_size: int = 10, spill_path: Optional[str] = None, seed: int = 0) -> None:
+        if sample_size < 0:
+            raise ValueError("sample_size cannot be negative")
+        self.sample_size = sample_size
+        self.spill_path = spill_path
+        self.count = 0
+        self.counts: Dict[str, int] = {}
+        self._first: Dict[int, Rejection] = {}
+        self.sample: List[Rejection] = []
+        self._rng = random.Random(seed)
+        self._handle: Optional[IO[str]] = None
+        self._spilled = False
+
+    def add(self, rejections: Iterable[Rejection], step: int = 0) -> None:
+        """Record rejections of the step at position `step` in the rule."""
+        for rejection in rejections:
+            self.count += 1
+            reason = str(rejection.get("reason", ""))
+            self.counts[reason] = self.counts.get(reason, 0) + 1
+            if step not in self._first:
+                self._first[step] = rejection
+            # Reservoir sample (Algorithm R).
+            if len(self.sample) < self.sample_size:
+                self.sample.append(rejection)
+            elif self.sample_size:
+                slot = self._rng.randrange(self.count)
+                if slot < self.sample_size:
+                    self.sample[slot] = rejection
+            if self.spill_path is not None:
+                if self._handle is None:
+                    self._handle = gzip.open(self.spill_path, "wt", encoding="utf-8")
+                    self._spilled = True
+                self._handle.write(json.dumps(rejection, default=str))
+                self._handle.write("\n")
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    @property
+    def first(self) -> Rejection:
+        """First rejection of the earliest step that rejected a row, whatever order chunks arrived in."""
+        return self._first[min(self._first)] if self._first else {}
+
+    @property
+    def ref(self) -> Optional[str]:
+        """Location of the full rejection set, if any rejection was spilled."""
+        return self.spill_path if self._spilled else None
+
+
+def read_rejections(ref: str) -> Iterator[Rejection]:
+    """Stream rejections back from a spill file written by `RejectedRowSink`."""
+    with gzip.open(ref, "rt", encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
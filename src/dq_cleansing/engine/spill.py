@@ -0,0 +1,263 @@
+"""Bounded-memory key set for deduplication.
+
+Keys are reduced to 128-bit BLAKE2b digests of a canonical encoding
+(`key_bytes`), so keys that compare equal, such as `1`, `1.0` and `True`,
+get the same digest, as they match in a plain set. Up to
+`max_keys_in_memory` digests are held in a set and checked immediately.
+Once the budget is reached the set is written to hash-partitioned temporary
+files and the deduplicator switches to an external two-pass dedup for the
+rest of its input:
+
+1. every later row is held on disk: the batch is appended to a spool file
+   and a (digest, position) record for each keyed row to the partition file
+   its digest hashes to; nothing is read back while input keeps arriving;
+2. at `drain`, each partition file is read once, front to back, into a set
+   (the digests flushed from memory come first, then records in row order),
+   which marks every later repeat of a digest as a duplicate. A partition
+   with more distinct digests than the budget is split on the next digest
+   byte and each part resolved the same way;
+3. the spooled batches are read back in order with their duplicate flags.
+
+Total I/O is linear in the input, and first-seen order is kept because
+positions are written in row order.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import (
+    IO,
+    Any,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from .batch import ColumnarBatch
+
+_DIGEST_SIZE = 16
+_POSITION_SIZE = 8
+_RECORD_SIZE = _DIGEST_SIZE + _POSITION_SIZE
+# Records read per block while resolving a partition.
+_READ_RECORDS = 65_536
+
+
+def _canonical(value: Any) -> Any:
+    # bool and integral floats compare (and hash) equal to the matching int.
+    if type(value) is bool:
+        return int(value)
+    if type(value) is float and value.is_integer():
+        return int(value)
+    return value
+
+
+def key_bytes(key: Tuple[Any, ...]) -> bytes:
+    """Encoding of a key tuple that is equal for keys that compare equal."""
+    return repr(tuple(_canonical(value) for value in key)).encode("utf-8")
+
+
+def key_digest(key: Tuple[Any, ...]) -> bytes:
+    """Fixed-size digest of a key tuple's canonical encoding."""
+    return hashlib.blake2b(key_bytes(key), digest_size=_DIGEST_SIZE).digest()
+
+
+class SpillingKeySet:
+    """Seen-key set that switches to an external hash-partitioned dedup past a memory budget.
+
+    Call `check_and_add` while `spilled` is False, `hold` afterwards, and
+    `drain` once the input is exhausted.
+    """
+
+    def __init__(self, max_keys_in_memory: int, *, partitions: int = 16, directory: Optional[str] = None) -> None:
+        if max_keys_in_memory < 1:
+            raise ValueError("max_keys_in_memory must be positive")
+        if not 2 <= partitions <= 256:
+            raise ValueError("partitions must be between 2 and 256")
+        self.max_keys_in_memory = max_keys_in_memory
+        self.partitions = partitions
+        self._directory = directory
+        self._spill_dir: Optional[tempfile.TemporaryDirectory] = None
+        self._memory: Set[bytes] = set()
+        self._handles: Dict[str, IO[bytes]] = {}
+        self._held_keys = 0
+        self._stats: Dict[str, int] = {}
+        self._reset_stats()
+
+    @property
+    def spilled(self) -> bool:
+        return self._spill_dir is not None
+
+    def _reset_stats(self) -> None:
+        self._stats = {"spilled_keys": 0, "spilled_rows": 0, "spill_bytes": 0, "spill_partition_reads": 0}
+
+    def check_and_add(self, keys: Sequence[Hashable]) -> List[bool]:
+        """Whether each key was seen before, for the keys checked before the budget ran out.
+
+        The result is shorter than `keys` when the budget was reached; the
+        set is then spilled and the remaining keys must be passed to `hold`.
+        """
+        memory = self._memory
+        duplicates: List[bool] = []
+        for key in keys:
+            if len(memory) >= self.max_keys_in_memory:
+                self._spill()
+                break
+            digest = key_digest(key)
+            duplicates.append(digest in memory)
+            memory.add(digest)
+        return duplicates
+
+    def hold(self, batch: ColumnarBatch, keys: Sequence[Hashable]) -> None:
+        """Keep `batch` on disk until `drain`; `keys` are its keyed rows, in order."""
+        records: Dict[int, List[bytes]] = {}
+        for key in keys:
+            self._held_keys += 1
+            digest = key_digest(key)
+            records.setdefault(digest[0] % self.partitions, []).append(
+                digest + self._held_keys.to_bytes(_POSITION_SIZE, "little")
+            )
+        for partition, partition_records in records.items():
+            self._append(self._path("keys", partition), b"".join(partition_records))
+        spool = self._handle(self._path("rows"))
+        start = spool.tell()
+        pickle.dump((batch, len(keys)), spool, protocol=pickle.HIGHEST_PROTOCOL)
+        self._stats["spilled_rows"] += len(batch)
+        self._stats["spill_bytes"] += spool.tell() - start
+
+    def drain(self) -> Iterator[Tuple[ColumnarBatch, List[bool]]]:
+        """Held batches in input order, each with duplicate flags for its keyed rows."""
+        if not self.spilled:
+            return
+        for handle in self._handles.values():
+            handle.close()
+        self._handles = {}
+        flags = bytearray((self._held_keys + 7) // 8)
+        for partition in range(self.partitions):
+            self._resolve(self._path("keys", partition), 0, flags)
+
+        spool_path = self._path("rows")
+        if not os.path.exists(spool_path):
+            return
+        position = 0
+        with open(spool_path, "rb") as spool:
+            while True:
+                try:
+                    batch, keyed = pickle.load(spool)
+                except EOFError:
+                    return
+                yield batch, [
+                    bool(flags[index >> 3] & (1 << (index & 7))) for index in range(position, position + keyed)
+                ]
+                position += keyed
+
+    def drain_stats(self) -> Dict[str, int]:
+        """Spill counters accumulated since the previous call."""
+        stats = dict(self._stats)
+        self._reset_stats()
+        return stats
+
+    def close(self) -> None:
+        """Delete the spill files."""
+        for handle in self._handles.values():
+            handle.close()
+        self._handles = {}
+        if self._spill_dir is not None:
+            self._spill_dir.cleanup()
+            self._spill_dir = None
+
+    def _spill(self) -> None:
+        self._spill_dir = tempfile.TemporaryDirectory(prefix="dq-dedup-", dir=self._directory)
+        # Flushed digests get position 0: seen before every held row.
+        zero = bytes(_POSITION_SIZE)
+        records: Dict[int, List[bytes]] = {}
+        for digest in self._memory:
+            records.setdefault(digest[0] % self.partitions, []).append(digest + zero)
+        for partition, partition_records in records.items():
+            self._append(self._path("keys", partition), b"".join(partition_records))
+        self._stats["spilled_keys"] += len(self._memory)
+        self._memory = set()
+
+    def _resolve(self, path: str, depth: int, flags: bytearray) -> None:
+        """Mark repeats in one partition file; split it when its digests exceed the budget."""
+        if not os.path.exists(path):
+            return
+        seen: Set[bytes] = set()
+        budget = self.max_keys_in_memory if depth + 1 < _DIGEST_SIZE else None
+        overflow = False
+        self._stats["spill_partition_reads"] += 1
+        with open(path, "rb") as handle:
+            while not overflow:
+                block = handle.read(_READ_RECORDS * _RECORD_SIZE)
+                if not block:
+                    break
+                for offset in range(0, len(block), _RECORD_SIZE):
+                    digest = block[offset : offset + _DIGEST_SIZE]
+                    if digest not in seen:
+                        seen.add(digest)
+                        if budget is not None and len(seen) > budget:
+                            overflow = True
+                            break
+                        continue
+                    position = int.from_bytes(block[offset + _DIGEST_SIZE : offset + _RECORD_SIZE], "little")
+                    if position:
+                        flags[(position - 1) >> 3] |= 1 << ((position - 1) & 7)
+        if overflow:
+            # Flags set so far are final (a digest's records all land in one part), so
+            # resolving the parts from the start marks the same repeats again and the rest.
+            seen = set()
+            self._split(path, depth + 1)
+            for part in range(self.partitions):
+                self._resolve(f"{path}.{part}", depth + 1, flags)
+        os.remove(path)
+
+    def _split(self, path: str, depth: int) -> None:
+        records: Dict[int, List[bytes]] = {}
+        self._stats["spill_partition_reads"] += 1
+        with open(path, "rb") as handle:
+            while True:
+                block = handle.read(_READ_RECORDS * _RECORD_SIZE)
+                if not block:
+                    break
+                for offset in range(0, len(block), _RECORD_SIZE):
+                    record = block[offset : offset + _RECORD_SIZE]
+                    records.setdefault(record[depth] % self.partitions, []).append(record)
+                for part, part_records in records.items():
+                    self._append(f"{path}.{part}", b"".join(part_records))
+                records = {}
+        for handle in self._handles.values():
+            handle.close()
+        self._handles = {}
+
+    def _path(self, kind: str, partition: Optional[int] = None) -> str:
+        name = f"{kind}.bin" if partition is None else f"{kind}-{partition:03d}.bin"
+        return os.path.join(self._spill_dir.name, name)
+
+    def _handle(self, path: str) -> IO[bytes]:
+        handle = self._handles.get(path)
+        if handle is None:
+            handle = self._handles[path] = open(path, "ab")
+        return handle
+
+    def _append(self, path: str, data: bytes) -> None:
+        self._handle(path).write(data)
+        self._stats["spill_bytes"] += len(data)
+
+
+def spilling_key_set(parameters: Dict[str, Any]) -> Optional[SpillingKeySet]:
+    """Build a spilling key set from deduplicate step parameters, or None for the in-memory mode."""
+    budget = parameters.get("max_keys_in_memory")
+    if budget is None:
+        return None
+    return SpillingKeySet(
+        int(budget),
+        partitions=int(parameters.get("spill_partitions", 16)),
+        directory=parameters.get("spill_dir"),
+    )
@@ -0,0 +1,138 @@
+"""Streaming execution of cleansing rules over chunked input."""
+
+from __future__ import annotations
+
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from ..models.cleansing_job import CleansingJob, CleansingJobResult, CleansingJobStatus
+from ..models.cleansing_rule import CleansingRule
+from .batch import ColumnarBatch
+from .key_index import ScopedKeyIndex
+from .planner import ExecutionPlan
+from .rejections import RejectedRowSink
+from .transformer import Metrics, merge_metrics
+
+Row = Dict[str, Any]
+
+
+def chunk_rows(rows: Iterable[Row], chunk_size: int) -> Iterator[List[Row]]:
+    """Split a row iterator into lists of at most `chunk_size` rows."""
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def job_result(
+    job: CleansingJob,
+    rule: CleansingRule,
+    rows_in: int,
+    rows_out: int,
+    step_metrics: List[Metrics],
+    sink: RejectedRowSink,
+) -> CleansingJobResult:
+    """Job result from per-step metrics and the rejections collected by `sink`."""
+    aggregated_metrics: Dict[str, Any] = {}
+    for step, metrics in zip(rule.transformations, step_metrics):
+        aggregated_metrics[step.type] = metrics
+    return CleansingJobResult(
+        job_id=job.job_id,
+        status=CleansingJobStatus.SUCCEEDED,
+        before_counts={"rows": rows_in},
+        after_counts={"rows": rows_out, "rejected": sink.count},
+        rejected_sample=sink.first,
+        rejected_counts=dict(sink.counts),
+        rejected_samples=list(sink.sample),
+        rejected_ref=sink.ref,
+        metrics=aggregated_metrics,
+    )
+
+
+class CleansingStream:
+    """Yields cleansed chunks as they are produced; `result` is set once exhausted.
+
+    Only one chunk is held at a time. Global steps keep their minimum state
+    across chunks (the dedup key set), metrics are merged per chunk, and
+    rejections go to a `RejectedRowSink` (counters, a bounded sample and an
+    optional spill file). Keys staged in the persistent key index are
+    committed once the input is exhausted and rolled back if the run fails
+    or the stream is abandoned.
+    """
+
+    def __init__(
+        self,
+        job: CleansingJob,
+        rule: CleansingRule,
+        chunks: Iterable[Iterable[Row]],
+        plan: ExecutionPlan,
+        warnings: List[str],
+        sink: Optional[RejectedRowSink] = None,
+        key_index: Optional[ScopedKeyIndex] = None,
+    ) -> None:
+        self.job = job
+        self.rule = rule
+        self.warnings = warnings
+        self.result: Optional[CleansingJobResult] = None
+        self._chunks = chunks
+        self._plan = plan
+        self._sink = sink or RejectedRowSink()
+        self._key_index = key_index
+
+    def __iter__(self) -> Iterator[List[Row]]:
+        execution = self._plan.start(self._key_index)
+        step_metrics: List[Dict[str, Any]] = [{} for _ in self.rule.transformations]
+        rows_in = rows_out = 0
+        sink = self._sink
+        processed = False
+        succeeded = False
+
+        try:
+            for chunk in self._chunks:
+                batch = ColumnarBatch.from_rows(chunk)
+                if processed and not len(batch):
+                    continue
+                processed = True
+                rows_in += len(batch)
+                output, outcomes = execution.process(batch)
+                for step, (metrics, outcome) in enumerate(zip(step_metrics, outcomes)):
+                    merge_metrics(metrics, outcome.metrics)
+                    sink.add(outcome.rejected, step)
+                rows_out += len(output)
+                if len(output):
+                    yield output.to_rows()
+
+            if not processed:
+                # An empty input still reports each step's (zero) metrics.
+                _, outcomes = execution.process(ColumnarBatch({}, 0))
+                for metrics, outcome in zip(step_metrics, outcomes):
+                    merge_metrics(metrics, outcome.metrics)
+
+            # Rows a spilled deduplicate held back until the end of input.
+            for output, outcomes in execution.finish():
+                for step, (metrics, outcome) in enumerate(zip(step_metrics, outcomes)):
+                    merge_metrics(metrics, outcome.metrics)
+                    sink.add(outcome.rejected, step)
+                rows_out += len(output)
+                if len(output):
+                    yield output.to_rows()
+            succeeded = True
+        finally:
+            execution.close()
+            sink.close()
+            if self._key_index is not None:
+                if succeeded:
+                    self._key_index.commit()
+                else:
+                    self._key_index.rollback()
+
+        self.result = job_result(self.job, self.rule, rows_in, rows_out, step_metrics, sink)
+
+    def rows(self) -> Iterator[Row]:
+        """Flatten the cleansed chunks, e.g. to feed `ProfilingEngine.profile`."""
+        for chunk in self:
+            yield from chunk
@@ -3,9 +3,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
 from ..models.cleansing_rule import TransformationStep
+from .batch import MISSING, ColumnarBatch
+from .conditions import CompiledCondition, ConditionError, compile_condition
+from .key_index import ScopedKeyIndex
+from .spill import spilling_key_set
 
 Dataset = List[Dict[str, Any]]
 Metrics = Dict[str, Any]
@@ -20,100 +24,415 @@ class TransformationError(RuntimeError):
 class TransformationOutcome:
     """Container describing the result of a transformation step."""
 
-    dataset: Dataset
+    dataset: ColumnarBatch
     metrics: Metrics
     rejected: Rejected
 
 
-def _standardize(dataset: Dataset, step: TransformationStep) -> TransformationOutcome:
+@dataclass
+class RowLocalStep:
+    """Per-value form of a row-local step, so consecutive steps can share one pass per column.
+
+    For each target field, `checks` flags values that fail the step and
+    `transforms` maps input values to output values; both see the value left
+    by earlier steps. Failing rows are rejected only when `rejects` is set.
+    A `condition` limits the step to the rows where it holds.
+    """
+
+    step: TransformationStep
+    transforms: Dict[str, Callable[[Any], Any]]
+    checks: Dict[str, Callable[[Any], bool]]
+    rejects: bool
+    metrics: Callable[[int], Metrics]
+    condition: Optional[CompiledCondition] = None
+
+
+def _is_missing(value: Any) -> bool:
+    # NaN counts as missing so DataFrame-sourced rows behave like the pandas engine.
+    return value is MISSING or value in (None, "") or (type(value) is float and value != value)
+
+
+def _compile_standardize(step: TransformationStep) -> RowLocalStep:
     """Upper/lower-case strings depending on the requested format."""
 
     format_hint = step.parameters.get("format", "").lower()
-    updated: Dataset = []
-    for row in dataset:
-        new_row = dict(row)
-        for field in step.target_fields:
-            if field not in new_row or new_row[field] is None:
-                continue
-            value = new_row[field]
-            if isinstance(value, str):
-                if format_hint in {"iso-4217", "upper"}:
-                    new_row[field] = value.upper()
-                elif format_hint in {"lower"}:
-                    new_row[field] = value.lower()
-        updated.append(new_row)
-    return TransformationOutcome(updated, {"standardized_fields": step.target_fields}, [])
-
-
-def _fill_missing(dataset: Dataset, step: TransformationStep) -> TransformationOutcome:
+    if format_hint in {"iso-4217", "upper"}:
+        convert: Callable[[str], str] | None = str.upper
+    elif format_hint in {"lower"}:
+        convert = str.lower
+    else:
+        convert = None
+
+    transforms: Dict[str, Callable[[Any], Any]] = {}
+    if convert is not None:
+        def transform(value: Any) -> Any:
+            return convert(value) if isinstance(value, str) else value
+
+        transforms = {field: transform for field in step.target_fields}
+    return RowLocalStep(
+        step=step,
+        transforms=transforms,
+        checks={},
+        rejects=False,
+        metrics=lambda rejected: {"standardized_fields": step.target_fields},
+    )
+
+
+def _compile_fill_missing(step: TransformationStep) -> RowLocalStep:
     """Fill null/empty values or reject rows when no default is supplied."""
 
     default_value = step.parameters.get("default")
-    rejected: Rejected = []
-    updated: Dataset = []
-    severity = step.severity
-
-    for row in dataset:
-        new_row = dict(row)
-        failure = False
-        for field in step.target_fields:
-            value = new_row.get(field)
-            if value in (None, ""):
-                if default_value is not None:
-                    new_row[field] = default_value
-                else:
-                    failure = True
-        if failure and severity == "hard":
-            rejected.append({"row": row, "reason": f"{step.type} failed for {step.target_fields}"})
+    transforms: Dict[str, Callable[[Any], Any]] = {}
+    checks: Dict[str, Callable[[Any], bool]] = {}
+    if default_value is not None:
+        def fill(value: Any) -> Any:
+            return default_value if _is_missing(value) else value
+
+        transforms = {field: fill for field in step.target_fields}
+    else:
+        checks = {field: _is_missing for field in step.target_fields}
+    return RowLocalStep(
+        step=step,
+        transforms=transforms,
+        checks=checks,
+        rejects=step.severity == "hard",
+        metrics=lambda rejected: {"filled_fields": step.target_fields, "rejected": rejected},
+    )
+
+
+ROW_LOCAL_COMPILERS: Dict[str, Callable[[TransformationStep], RowLocalStep]] = {
+    "standardize": _compile_standardize,
+    "standardise": _compile_standardize,
+    "fill_missing": _compile_fill_missing,
+}
+
+
+def step_condition(step: TransformationStep) -> Optional[CompiledCondition]:
+    """Compiled form of `step.condition`, or None for unconditional steps."""
+
+    if not step.condition:
+        return None
+    try:
+        return compile_condition(step.condition)
+    except ConditionError as exc:
+        raise TransformationError(str(exc)) from exc
+
+
+def compile_row_local(step: TransformationStep) -> RowLocalStep:
+    """Compile a registered row-local step together with its condition."""
+
+    compiled = ROW_LOCAL_COMPILERS[step.type](step)
+    compiled.condition = step_condition(step)
+    return compiled
+
+
+def _compose(functions: List[Callable[[Any], Any]]) -> Callable[[Any], Any]:
+    if len(functions) == 1:
+        return functions[0]
+
+    def composed(value: Any) -> Any:
+        for function in functions:
+            value = function(value)
+        return value
+
+    return composed
+
+
+def run_row_local(
+    batch: ColumnarBatch,
+    steps: List[RowLocalStep],
+) -> Tuple[ColumnarBatch, List[Tuple[Metrics, Rejected]]]:
+    """Run consecutive row-local steps with one pass per touched column.
+
+    Results match running the steps one after another: a row rejected by a
+    step is invisible to later steps, and rejection payloads show the row as
+    that step received it. Conditions are evaluated once on the input batch,
+    so a conditional step must not depend on fields changed by earlier steps
+    in the same call (the planner starts a new stage instead). Returns the
+    output batch plus (metrics, rejected) per step.
+    """
+
+    fields: List[str] = []
+    for compiled in steps:
+        for field in (*compiled.checks, *compiled.transforms):
+            if field not in fields:
+                fields.append(field)
+
+    masks = [compiled.condition.mask(batch) if compiled.condition else None for compiled in steps]
+    replacements: Dict[str, List[Any]] = {}
+    failures: List[set[int]] = [set() for _ in steps]
+    for field in fields:
+        chain = [
+            (position, compiled.checks.get(field), compiled.transforms.get(field), masks[position])
+            for position, compiled in enumerate(steps)
+            if field in compiled.checks or field in compiled.transforms
+        ]
+        column = batch.column(field)
+        if all(check is None and mask is None for _, check, _, mask in chain):
+            values = list(map(_compose([transform for _, _, transform, _ in chain]), column))
+        else:
+            values = []
+            append = values.append
+            for index, value in enumerate(column):
+                for position, check, transform, mask in chain:
+                    if mask is not None and not mask[index]:
+                        continue
+                    if check is not None and check(value):
+                        failures[position].add(index)
+                    if transform is not None:
+                        value = transform(value)
+                append(value)
+        if batch.has_column(field) or any(value is not MISSING for value in values):
+            replacements[field] = values
+
+    # Attribute each rejected row to the first rejecting step that saw it.
+    rejected_by: Dict[int, int] = {}
+    for position, compiled in enumerate(steps):
+        if compiled.rejects:
+            for index in failures[position]:
+                rejected_by.setdefault(index, position)
+
+    results: List[Tuple[Metrics, Rejected]] = []
+    for position, compiled in enumerate(steps):
+        indices = sorted(index for index, owner in rejected_by.items() if owner == position)
+        reason = f"{compiled.step.type} failed for {compiled.step.target_fields}"
+        rejected = [
+            {"row": _row_before(batch, steps, masks, position, index), "reason": reason} for index in indices
+        ]
+        metrics = compiled.metrics(len(rejected))
+        mask = masks[position]
+        if mask is not None:
+            # Rows rejected by an earlier step never reach this one.
+            metrics["matched_rows"] = sum(
+                1 for index, matched in enumerate(mask) if matched and rejected_by.get(index, position) >= position
+            )
+        results.append((metrics, rejected))
+
+    updated = batch.with_columns(replacements)
+    if rejected_by:
+        updated = updated.take([index for index in range(len(batch)) if index not in rejected_by])
+    return updated, results
+
+
+def _row_before(
+    batch: ColumnarBatch,
+    steps: List[RowLocalStep],
+    masks: Sequence[Optional[List[bool]]],
+    position: int,
+    index: int,
+) -> Dict[str, Any]:
+    """Replay earlier steps on one row to rebuild the input row of `steps[position]`."""
+    row = batch.row(index)
+    for compiled, mask in zip(steps[:position], masks):
+        if mask is not None and not mask[index]:
             continue
-        updated.append(new_row)
+        for field, transform in compiled.transforms.items():
+            value = transform(row.get(field, MISSING))
+            if value is not MISSING:
+                row[field] = value
+    return row
 
-    metrics = {"filled_fields": step.target_fields, "rejected": len(rejected)}
+
+def _row_local_handler(batch: ColumnarBatch, step: TransformationStep) -> TransformationOutcome:
+    updated, ((metrics, rejected),) = run_row_local(batch, [compile_row_local(step)])
     return TransformationOutcome(updated, metrics, rejected)
 
 
-def _deduplicate(dataset: Dataset, step: TransformationStep) -> TransformationOutcome:
-    """Drop duplicate rows based on configured keys/fields."""
+def dedup_key(values: Sequence[Any]) -> Tuple[Any, ...]:
+    """Key tuple for deduplication: absent fields and NaN key as None, like `row.get` and pandas."""
+
+    return tuple(None if value is MISSING or (type(value) is float and value != value) else value for value in values)
+
+
+def deduplicate_keys(step: TransformationStep) -> List[str]:
+    """Fields a deduplicate step keys on: `parameters.keys`, else `target_fields`."""
+
+    return step.parameters.get("keys") or step.target_fields
+
+
+class Deduplicator:
+    """Drop duplicate rows based on configured keys/fields.
+
+    The set of seen keys persists across `process` calls, so a stream of
+    batches is deduplicated as a whole; it is the only state kept. Setting
+    `max_keys_in_memory` in the step parameters bounds that set by spilling
+    key digests to disk (see `spill.SpillingKeySet`). With a `condition`,
+    only matching rows are deduplicated; the rest pass through. With
+    `cross_batch` set, first occurrences are also checked against a
+    persistent index of keys from earlier runs (see `key_index`).
+    """
+
+    def __init__(self, step: TransformationStep, key_index: Optional[ScopedKeyIndex] = None) -> None:
+        self.keys = deduplicate_keys(step)
+        if not self.keys:
+            raise TransformationError("deduplicate step requires keys or target_fields")
+        try:
+            self.spill = spilling_key_set(step.parameters)
+        except (TypeError, ValueError) as exc:
+            raise TransformationError(f"invalid deduplicate spill parameters: {exc}") from exc
+        self.condition = step_condition(step)
+        self.seen: set = set()
+        self.key_index: Optional[ScopedKeyIndex] = None
+        if step.parameters.get("cross_batch"):
+            if key_index is None:
+                raise TransformationError("cross_batch deduplicate requires a persistent key index")
+            self.key_index = key_index
+            self.scope = key_index.scope(self.keys)
+
+    def process(self, batch: ColumnarBatch) -> TransformationOutcome:
+        mask, row_keys = self._row_keys(batch)
+        if self.spill is None:
+            seen = self.seen
+            duplicates = []
+            for key in row_keys:
+                duplicates.append(key in seen)
+                seen.add(key)
+            return self._outcome(batch, mask, row_keys, duplicates)
+
+        if self.spill.spilled:
+            self.spill.hold(batch, row_keys)
+            return self._outcome(batch.take([]), [] if mask is not None else None, [], [])
+        duplicates = self.spill.check_and_add(row_keys)
+        if len(duplicates) < len(row_keys):
+            # The budget ran out: resolve the rows checked so far and hold the rest until `finish`.
+            split = len(duplicates)
+            if mask is not None:
+                split = [index for index, matched in enumerate(mask) if matched][split]
+            self.spill.hold(batch.take(range(split, len(batch))), row_keys[len(duplicates) :])
+            batch = batch.take(range(split))
+            mask = mask[:split] if mask is not None else None
+            row_keys = row_keys[: len(duplicates)]
+        return self._outcome(batch, mask, row_keys, duplicates)
+
+    def finish(self) -> Iterator[TransformationOutcome]:
+        """Outcomes for the batches held back after a spill, in input order."""
+        if self.spill is None:
+            return
+        for batch, duplicates in self.spill.drain():
+            if self.key_index is None:
+                # Keys are only needed again for the persistent index lookup.
+                mask = self.condition.mask(batch) if self.condition else None
+                yield self._outcome(batch, mask, None, duplicates)
+            else:
+                mask, row_keys = self._row_keys(batch)
+                yield self._outcome(batch, mask, row_keys, duplicates)
 
-    keys = step.parameters.get("keys") or step.target_fields
-    if not keys:
-        raise TransformationError("deduplicate step requires keys or target_fields")
+    def _row_keys(self, batch: ColumnarBatch) -> Tuple[Optional[List[bool]], List[Tuple[Any, ...]]]:
+        key_columns = [batch.column(field) for field in self.keys]
+        mask = self.condition.mask(batch) if self.condition else None
+        row_keys = [
+            dedup_key(key)
+            for index, key in enumerate(zip(*key_columns))
+            if mask is None or mask[index]
+        ]
+        return mask, row_keys
 
-    seen = set()
-    deduped: Dataset = []
+    def _outcome(
+        self,
+        batch: ColumnarBatch,
+        mask: Optional[List[bool]],
+        row_keys: Optional[List[Tuple[Any, ...]]],
+        duplicates: List[bool],
+    ) -> TransformationOutcome:
+        keys = self.keys
+        kept: List[int] = []
+        rejected: Rejected = []
+        matched = len(duplicates)
+        previous = [False] * matched
+        if self.key_index is not None and row_keys is not None:
+            # Only first occurrences in this run are looked up, in one batch.
+            first = [position for position, duplicate in enumerate(duplicates) if not duplicate]
+            # New keys are only staged; the run's owner commits them on success.
+            flags = self.key_index.stage(self.scope, [row_keys[position] for position in first])
+            for position, seen_before in zip(first, flags):
+                previous[position] = seen_before
+
+        if mask is not None:
+            flags = iter(zip(duplicates, previous))
+            per_row = [next(flags) if matched else (False, False) for matched in mask]
+            duplicates = [duplicate for duplicate, _ in per_row]
+            previous = [seen_before for _, seen_before in per_row]
+
+        for index, (duplicate, seen_before) in enumerate(zip(duplicates, previous)):
+            if duplicate:
+                # Duplicates are removed for both severities.
+                rejected.append({"row": batch.row(index), "reason": f"duplicate on {keys}"})
+            elif seen_before:
+                rejected.append({"row": batch.row(index), "reason": f"duplicate on {keys} from an earlier delivery"})
+            else:
+                kept.append(index)
+
+        metrics = {
+            "keys": keys,
+            "deduplicated": len(batch) - len(kept),
+            "retained": len(kept),
+        }
+        if mask is not None:
+            metrics["matched_rows"] = matched
+        if self.key_index is not None:
+            metrics["previously_seen"] = sum(previous)
+        if self.spill is not None:
+            metrics.update(self.spill.drain_stats())
+        return TransformationOutcome(batch.take(kept), metrics, rejected)
+
+    def close(self) -> None:
+        """Release spill files, if any."""
+        if self.spill is not None:
+            self.spill.close()
+
+
+def combine_outcomes(outcomes: Sequence[TransformationOutcome]) -> TransformationOutcome:
+    """One outcome for a step from the outcomes of consecutive pieces of its input."""
+
+    if len(outcomes) == 1:
+        return outcomes[0]
+    metrics: Metrics = {}
     rejected: Rejected = []
+    for outcome in outcomes:
+        merge_metrics(metrics, outcome.metrics)
+        rejected.extend(outcome.rejected)
+    return TransformationOutcome(ColumnarBatch.concat([outcome.dataset for outcome in outcomes]), metrics, rejected)
 
-    for row in dataset:
-        key = tuple(row.get(field) for field in keys)
-        if key in seen:
-            rejected.append({"row": row, "reason": f"duplicate on {keys}"})
-            if step.severity == "soft":
-                continue
-            # Hard duplicates are removed entirely.
-        else:
-            seen.add(key)
-            deduped.append(row)
 
-    metrics = {
-        "keys": keys,
-        "deduplicated": len(dataset) - len(deduped),
-        "retained": len(deduped),
-    }
-    return TransformationOutcome(deduped, metrics, rejected)
+def _deduplicate(batch: ColumnarBatch, step: TransformationStep) -> TransformationOutcome:
+    """Deduplicate a single batch."""
+
+    deduplicator = Deduplicator(step)
+    try:
+        return combine_outcomes([deduplicator.process(batch), *deduplicator.finish()])
+    finally:
+        deduplicator.close()
+
+
+GLOBAL_STEP_FACTORIES: Dict[str, Callable[..., Deduplicator]] = {
+    "deduplicate": Deduplicator,
+}
+
+
+def merge_metrics(total: Metrics, chunk: Metrics) -> Metrics:
+    """Fold one chunk's step metrics into a running total: counts add up, descriptors are kept."""
+
+    for key, value in chunk.items():
+        if key in total and isinstance(value, int) and not isinstance(value, bool):
+            total[key] += value
+        else:
+            total.setdefault(key, value)
+    return total
 
 
-TRANSFORMATION_HANDLERS: Dict[str, Callable[[Dataset, TransformationStep], TransformationOutcome]] = {
-    "standardize": _standardize,
-    "standardise": _standardize,
-    "fill_missing": _fill_missing,
+TRANSFORMATION_HANDLERS: Dict[str, Callable[[ColumnarBatch, TransformationStep], TransformationOutcome]] = {
+    "standardize": _row_local_handler,
+    "standardise": _row_local_handler,
+    "fill_missing": _row_local_handler,
     "deduplicate": _deduplicate,
 }
 
 
-def apply_transformation(dataset: Dataset, step: TransformationStep) -> TransformationOutcome:
-    """Apply a single transformation step to a dataset."""
+def apply_transformation(dataset: Dataset | ColumnarBatch, step: TransformationStep) -> TransformationOutcome:
+    """Apply a single transformation step to a dataset or columnar batch."""
 
     handler = TRANSFORMATION_HANDLERS.get(step.type)
     if not handler:
         raise TransformationError(f"unsupported transformation type: {step.type}")
-    return handler(dataset, step)
+    batch = dataset if isinstance(dataset, ColumnarBatch) else ColumnarBatch.from_rows(dataset)
+    return handler(batch, step)
@@ -5,6 +5,7 @@ from __future__ import annotations
 from typing import List
 
 from ..models.cleansing_rule import CleansingRule, TransformationStep
+from .conditions import ConditionError, compile_condition
 
 
 def validate_rule(rule: CleansingRule) -> List[str]:
@@ -23,3 +24,13 @@ def _validate_step(step: TransformationStep, index: int, warnings: List[str]) ->
         warnings.append(f"step {index} requires target_fields for {step.type}")
     if step.type == "deduplicate" and not (step.parameters.get("keys") or step.target_fields):
         warnings.append(f"step {index} must define keys for deduplicate")
+    budget = step.parameters.get("max_keys_in_memory") if step.type == "deduplicate" else None
+    if budget is not None and (not isinstance(budget, int) or isinstance(budget, bool) or budget < 1):
+        warnings.append(f"step {index} max_keys_in_memory must be a positive integer")
+    if step.parameters.get("cross_batch") and step.type != "deduplicate":
+        warnings.append(f"step {index} cross_batch only applies to deduplicate")
+    if step.condition:
+        try:
+            compile_condition(step.condition)
+        except ConditionError as exc:
+            warnings.append(f"step {index} has an invalid condition: {exc}")
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -43,7 +43,22 @@ class CleansingJobResult(BaseModel):
     status: CleansingJobStatus
     before_counts: Dict[str, int]
     after_counts: Dict[str, int]
-    rejected_sample: Dict[str, Any] = Field(default_factory=dict)
+    rejected_sample: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="First rejection of the earliest step that rejected a row.",
+    )
+    rejected_counts: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Number of rejected rows per rejection reason.",
+    )
+    rejected_samples: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="Uniform reservoir sample of rejected rows.",
+    )
+    rejected_ref: Optional[str] = Field(
+        default=None,
+        description="Gzip NDJSON file holding every rejected row, when spilling is enabled.",
+    )
     output_dataset: Optional[str] = None
     linked_validation_job_id: Optional[str] = None
     metrics: Dict[str, Any] = Field(default_factory=dict)
@@ -56,6 +71,9 @@ class CleansingJobResult(BaseModel):
             "before_counts": self.before_counts,
             "after_counts": self.after_counts,
             "rejected_sample": self.rejected_sample,
+            "rejected_counts": self.rejected_counts,
+            "rejected_samples": self.rejected_samples,
+            "rejected_ref": self.rejected_ref,
             "output_dataset": self.output_dataset,
             "linked_validation_job_id": self.linked_validation_job_id,
             "metrics": self.metrics,
@@ -0,0 +1,137 @@
+"""Batch evaluation of profiling rule templates against profiling snapshots."""
+
+from __future__ import annotations
+
+import operator
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from dq_core.models.data_quality_rule import ProfilingRuleTemplate
+from dq_profiling.models.profiling_snapshot import ProfilingSnapshot
+
+RuleKey = Tuple[str, Optional[str], str]
+
+_COMPARATORS: Dict[str, Callable[[float, float], bool]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+# Metrics that describe the dataset rather than a field.
+DATASET_METRICS = {"record_count"}
+
+
+@dataclass
+class ProfilingRuleResult:
+    """Outcome of one profiling rule against one field."""
+
+    rule_id: str
+    dataset_type: str
+    field: Optional[str]
+    metric: str
+    comparison: str
+    threshold: float
+    tolerance: Optional[float]
+    observed: Optional[float]
+    status: str  # passed, failed, or skipped when the metric is unavailable
+
+    @property
+    def passed(self) -> bool:
+        return self.status == "passed"
+
+
+class ProfilingRuleEvaluator:
+    """Indexes profiling rules by (dataset_type, field, metric) for one-pass evaluation.
+
+    Rules without a `field` apply to every field in the snapshot, except
+    dataset-level metrics such as `record_count`.
+    """
+
+    def __init__(self, rules: Iterable[ProfilingRuleTemplate]) -> None:
+        self._index: Dict[RuleKey, List[ProfilingRuleTemplate]] = defaultdict(list)
+        self._keys_by_dataset: Dict[str, List[RuleKey]] = defaultdict(list)
+        for rule in rules:
+            self.add_rule(rule)
+
+    def add_rule(self, rule: ProfilingRuleTemplate) -> None:
+        key = (rule.dataset_type, rule.field, rule.profile_metric.strip().lower())
+        if key not in self._index:
+            self._keys_by_dataset[rule.dataset_type].append(key)
+        self._index[key].append(rule)
+
+    def rules_for(self, dataset_type: str, field: Optional[str], metric: str) -> List[ProfilingRuleTemplate]:
+        """Hash lookup of the rules registered for a key."""
+        return self._index.get((dataset_type, field, metric.strip().lower()), [])
+
+    def evaluate(self, snapshot: ProfilingSnapshot, as_of: Optional[date] = None) -> List[ProfilingRuleResult]:
+        """Evaluate every active rule for the snapshot's dataset type."""
+        as_of = as_of or date.today()
+        metric_cache: Dict[Tuple[Optional[str], str], Optional[float]] = {}
+        results: List[ProfilingRuleResult] = []
+
+        for key in self._keys_by_dataset.get(snapshot.dataset_type, []):
+            _, field, metric = key
+            if metric in DATASET_METRICS:
+                targets: Iterable[Optional[str]] = [None]
+            elif field is None:
+                targets = snapshot.field_stats.keys()
+            else:
+                targets = [field]
+
+            for target in targets:
+                cache_key = (target, metric)
+                if cache_key not in metric_cache:
+                    metric_cache[cache_key] = self._resolve_metric(snapshot, target, metric)
+                observed = metric_cache[cache_key]
+                for rule in self._index[key]:
+                    if not self._is_active(rule, as_of):
+                        continue
+                    results.append(self._evaluate_rule(rule, target, metric, observed))
+        return results
+
+    def _resolve_metric(self, snapshot: ProfilingSnapshot, field: Optional[str], metric: str) -> Optional[float]:
+        if metric == "record_count":
+            return float(snapshot.record_count)
+        stats = snapshot.field_stats.get(field) if field is not None else None
+        return stats.get_metric(metric) if stats is not None else None
+
+    def _is_active(self, rule: ProfilingRuleTemplate, as_of: date) -> bool:
+        if rule.active_from and as_of < rule.active_from:
+            return False
+        if rule.active_to and as_of > rule.active_to:
+            return False
+        return True
+
+    def _evaluate_rule(
+        self,
+        rule: ProfilingRuleTemplate,
+        field: Optional[str],
+        metric: str,
+        observed: Optional[float],
+    ) -> ProfilingRuleResult:
+        if observed is None:
+            status = "skipped"
+        else:
+            status = "passed" if self._compare(rule, observed) else "failed"
+        return ProfilingRuleResult(
+            rule_id=rule.rule_id,
+            dataset_type=rule.dataset_type,
+            field=field,
+            metric=metric,
+            comparison=rule.comparison,
+            threshold=rule.threshold,
+            tolerance=rule.tolerance,
+            observed=observed,
+            status=status,
+        )
+
+    def _compare(self, rule: ProfilingRuleTemplate, observed: float) -> bool:
+        """Apply the comparator, widening the threshold by the tolerance band."""
+        tolerance = rule.tolerance or 0.0
+        if rule.comparison == "==":
+            return abs(observed - rule.threshold) <= tolerance
+        threshold = rule.threshold + tolerance if rule.comparison in {"<", "<="} else rule.threshold - tolerance
+        return _COMPARATORS[rule.comparison](observed, threshold)
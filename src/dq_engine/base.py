@@ -23,7 +23,11 @@ class ExecutionEngine(ABC):
 
     @abstractmethod
     def load_dataset(self, source_ref: Mapping[str, Any]) -> DatasetHandle:
-        """Load a dataset from a source reference (blob URI, table name, etc.)."""
+        """Load a dataset from a source reference (blob URI, table name, etc.).
+
+        When `source_ref` carries a `columns` list (see
+        `ProfilingSpec.project_source_ref`), only those columns should be read.
+        """
 
     @abstractmethod
     def persist_dataset(self, handle: DatasetHandle, target_ref: Mapping[str, Any]) -> Mapping[str, Any]:
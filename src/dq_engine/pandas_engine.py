@@ -8,8 +8,11 @@ TODO; configuration still comes from contracts + libraries + catalog.
 
 from __future__ import annotations
 
-from typing import Any, Iterable, Mapping
+import math
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 from .base import DatasetHandle, ExecutionEngine
@@ -46,25 +49,111 @@ class PandasExecutionEngine(ExecutionEngine):
         raise NotImplementedError("Dataset persistence for PandasExecutionEngine not implemented yet.")
 
     def apply_transformations(self, handle: DatasetHandle, transformations: Iterable[Any]) -> DatasetHandle:
+        """Apply cleansing transformations to the DataFrame; see `run_transformations`."""
+
+        cleansed, _ = self.run_transformations(handle, transformations)
+        return cleansed
+
+    def run_transformations(
+        self,
+        handle: DatasetHandle,
+        transformations: Iterable[Any],
+        on_step: Optional[Callable[[int, Dict[str, Any], List[Dict[str, Any]]], None]] = None,
+    ) -> Tuple[PandasDatasetHandle, List[Tuple[Dict[str, Any], List[Dict[str, Any]]]]]:
         """
-        Apply cleansing transformations to the DataFrame.
+        Apply `dq_cleansing` transformation steps with native pandas operations.
 
-        TODO: map logical transformations from contracts/cleansing rules to
-        pandas operations, or delegate to dq_cleansing transformers directly.
-        See docs/diagrams/cleansing_job_flow.mmd.
+        Returns the cleansed handle plus `(metrics, rejected)` per step, equal
+        to `TRANSFORMATION_HANDLERS` on `df.to_dict("records")`. With
+        `on_step`, each step's `(position, metrics, rejected)` is handed over
+        as soon as the step finishes and not kept, so the returned rejected
+        lists are empty. `standardize`
+        maps to `str.upper`/`str.lower`, `fill_missing` to `mask` (or a
+        rejection mask for hard steps without a default) and `deduplicate` to
+        `duplicated(keep="first")`. Steps with a `condition`, spill settings,
+        or other registered types run through the row-based handlers.
         """
 
-        raise NotImplementedError("Transformation mapping for PandasExecutionEngine not implemented yet.")
+        if not isinstance(handle, PandasDatasetHandle):
+            raise TypeError("PandasExecutionEngine.run_transformations expects a PandasDatasetHandle")
+
+        # Imported lazily: dq_cleansing depends on this module, not the other way.
+        from dq_cleansing.engine.transformer import apply_transformation
+        from dq_cleansing.models.cleansing_rule import TransformationStep
+
+        df = handle.df
+        outcomes: List[Tuple[Dict[str, Any], List[Dict[str, Any]]]] = []
+        for transformation in transformations:
+            step = (
+                transformation
+                if isinstance(transformation, TransformationStep)
+                else TransformationStep(**transformation)
+            )
+            native = _NATIVE_TRANSFORMATIONS.get(step.type)
+            if native is None or step.condition or "max_keys_in_memory" in step.parameters:
+                outcome = apply_transformation(df.to_dict("records"), step)
+                rows = outcome.dataset.to_rows()
+                df = pd.DataFrame(rows) if rows else df.iloc[0:0]
+                metrics, rejected = outcome.metrics, outcome.rejected
+            else:
+                df, metrics, rejected = native(df, step)
+            if on_step is not None:
+                on_step(len(outcomes), metrics, rejected)
+                rejected = []
+            outcomes.append((metrics, rejected))
+        return PandasDatasetHandle(df), outcomes
 
     def compute_profile(self, handle: DatasetHandle, spec: Mapping[str, Any]) -> Mapping[str, Any]:
         """
-        Compute profiling statistics using pandas-friendly logic.
+        Compute profiling statistics with column-wise pandas/NumPy operations.
 
-        TODO: delegate to dq_profiling profiling engine over the underlying
-        DataFrame. See docs/ARCHITECTURE.md#2.3 Profiling module structure.
+        Returns `{"record_count": int, "field_stats": {column: {...}}}` where
+        each field entry carries the same keys and semantics as
+        `dq_profiling.ProfilingFieldStats` produced by `ProfilingEngine` in
+        exact mode (nulls are None/NaN/empty strings; only int/float values
+        feed numeric stats). Supported spec keys: `sample_size`,
+        `top_frequencies`, `histogram_buckets`, `quantiles`,
+        `categorical_distinct_limit`, `categorical_top_k`, and `fields` /
+        `count_other_fields` to profile only a projection of the columns
+        (the rest get null counts with `count_only=True`, or are dropped).
         """
 
-        raise NotImplementedError("Profiling for PandasExecutionEngine not implemented yet.")
+        if not isinstance(handle, PandasDatasetHandle):
+            raise TypeError("PandasExecutionEngine.compute_profile expects a PandasDatasetHandle")
+
+        df = handle.df
+        sample_size = int(spec.get("sample_size", 5))
+        top_frequencies = int(spec.get("top_frequencies", 5))
+        histogram_buckets = int(spec.get("histogram_buckets", 5))
+        quantiles = tuple(spec.get("quantiles", (0.01, 0.5, 0.95, 0.99)))
+        categorical_distinct_limit = int(spec.get("categorical_distinct_limit", 1_000))
+        categorical_top_k = int(spec.get("categorical_top_k", 20))
+        fields = set(spec["fields"]) if spec.get("fields") is not None else None
+        count_other_fields = bool(spec.get("count_other_fields", True))
+
+        field_stats: Dict[str, Dict[str, Any]] = {}
+        for column in df.columns:
+            field_name = str(column)
+            if fields is None or field_name in fields:
+                field_stats[field_name] = _profile_column(
+                    field_name,
+                    df[column],
+                    sample_size=sample_size,
+                    top_frequencies=top_frequencies,
+                    histogram_buckets=histogram_buckets,
+                    quantiles=quantiles,
+                    categorical_distinct_limit=categorical_distinct_limit,
+                    categorical_top_k=categorical_top_k,
+                )
+            elif count_other_fields:
+                nulls = int(_null_mask(df[column]).sum())
+                field_stats[field_name] = {
+                    "field_name": field_name,
+                    "non_null": len(df) - nulls,
+                    "nulls": nulls,
+                    "count_only": True,
+                }
+        return {"record_count": len(df), "field_stats": field_stats}
 
     def evaluate_rules(self, handle: DatasetHandle, rules_bundle: Mapping[str, Any]) -> Mapping[str, Any]:
         """
@@ -75,3 +164,334 @@ class PandasExecutionEngine(ExecutionEngine):
         """
 
         raise NotImplementedError("Rule evaluation for PandasExecutionEngine not implemented yet.")
+
+
+def _percentage(count: int, total: int) -> float:
+    if total == 0:
+        return 0.0
+    return round((count / total) * 100, 4)
+
+
+def _frequencies(counts: pd.Series, total_rows: int) -> List[Dict[str, Any]]:
+    return [
+        {"value": value, "count": int(count), "percentage": _percentage(int(count), total_rows)}
+        for value, count in zip(counts.index.tolist(), counts.tolist())
+    ]
+
+
+def _numeric_values(values: pd.Series) -> np.ndarray:
+    """Return the int/float (non-bool) values of a non-null column as floats."""
+    if pd.api.types.is_bool_dtype(values.dtype):
+        return np.empty(0, dtype=float)
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        return values.to_numpy(dtype=float)
+    inferred = pd.api.types.infer_dtype(values, skipna=True)
+    if inferred in {"integer", "floating", "mixed-integer-float"}:
+        return values.to_numpy(dtype=float)
+    if inferred != "mixed" and inferred != "mixed-integer":
+        return np.empty(0, dtype=float)
+    numeric_mask = values.map(lambda value: isinstance(value, (int, float)) and not isinstance(value, bool))
+    return values[numeric_mask.astype(bool)].to_numpy(dtype=float)
+
+
+def _infer_types(values: pd.Series) -> Tuple[Dict[int, int], np.ndarray | None, Tuple[Any, Any] | None]:
+    """Type-inference masks of a non-null column, using the profiler's parsers.
+
+    Imported lazily: dq_profiling depends on this module, not the other way.
+    Returns the mask counts, the numbers parsed from strings when every value
+    is numeric and at least one was a string, and the (min, max) timestamps
+    when every value is temporal. Text columns are parsed once per distinct
+    value and weighted by its count.
+    """
+    from dq_profiling.engine.type_inference import (
+        BOOLEAN,
+        DATETIME,
+        FLOAT,
+        INTEGER,
+        infer_value,
+        parse_text,
+    )
+
+    size = int(values.size)
+    if not size:
+        return {}, None, None
+    if pd.api.types.is_bool_dtype(values.dtype):
+        return {BOOLEAN: size}, None, None
+    if pd.api.types.is_integer_dtype(values.dtype):
+        return {INTEGER | FLOAT: size}, None, None
+    if pd.api.types.is_float_dtype(values.dtype):
+        integral = int(np.count_nonzero(np.mod(values.to_numpy(dtype=float), 1) == 0))
+        masks = {FLOAT | INTEGER: integral, FLOAT: size - integral}
+        return {mask: count for mask, count in masks.items() if count}, None, None
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        moments = values if values.dt.tz is None else values.dt.tz_convert("UTC").dt.tz_localize(None)
+        return {DATETIME: size}, None, (moments.min(), moments.max())
+
+    codes, uniques = pd.factorize(values)
+    if pd.api.types.infer_dtype(uniques, skipna=False) == "string":
+        results = [parse_text(text) for text in uniques.tolist()]
+        value_masks = np.fromiter((result[0] for result in results), dtype=np.int64, count=len(results))
+        weights = np.bincount(value_masks, weights=np.bincount(codes, minlength=len(results)))
+        masks = {mask: int(count) for mask, count in enumerate(weights.tolist()) if count}
+        if all(mask & FLOAT for mask in masks):
+            parsed = np.fromiter((result[1] for result in results), dtype=float, count=len(results))
+            return masks, parsed[codes], None
+        if all(mask & DATETIME for mask in masks):
+            moments = [result[2] for result in results]
+            return masks, None, (min(moments), max(moments))
+        return masks, None, None
+
+    # Mixed object columns: 1, 1.0 and True hash alike, so infer per cell.
+    inferred = [infer_value(value) for value in values.tolist()]
+    masks = dict(Counter(result[0] for result in inferred))
+    if all(mask & FLOAT for mask in masks) and any(result[1] is not None for result in inferred):
+        numbers = [float(value) if result[1] is None else result[1] for value, result in zip(values.tolist(), inferred)]
+        return masks, np.array(numbers, dtype=float), None
+    if all(mask & DATETIME for mask in masks):
+        moments = [result[2] for result in inferred]
+        return masks, None, (min(moments), max(moments))
+    return masks, None, None
+
+
+def _interpolated_quantile(ordered: List[float], fraction: float) -> float:
+    """Linear interpolation identical to the row-based profiler's quantiles."""
+    position = fraction * (len(ordered) - 1)
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _numeric_buckets(
+    values: np.ndarray,
+    min_value: float,
+    max_value: float,
+    total_rows: int,
+    histogram_buckets: int,
+) -> List[Dict[str, Any]]:
+    """Equal-width buckets using the same edges as the row-based profiler."""
+    if min_value == max_value:
+        return [
+            {
+                "start": min_value,
+                "end": max_value,
+                "count": int(values.size),
+                "percentage": _percentage(int(values.size), total_rows),
+            }
+        ]
+
+    bucket_count = min(histogram_buckets, max(1, int(values.size)))
+    width = (max_value - min_value) / bucket_count or 1
+    indexes = ((values - min_value) / width).astype(np.int64)
+    indexes[values == max_value] = bucket_count - 1
+    counts = np.bincount(indexes, minlength=bucket_count)
+
+    buckets: List[Dict[str, Any]] = []
+    for index, count in enumerate(counts.tolist()):
+        if count == 0:
+            continue
+        start = min_value + index * width
+        end = max_value if index == bucket_count - 1 else min_value + (index + 1) * width
+        buckets.append(
+            {
+                "start": round(start, 6),
+                "end": round(end, 6),
+                "count": count,
+                "percentage": _percentage(count, total_rows),
+            }
+        )
+    return buckets
+
+
+def _null_mask(series: pd.Series) -> pd.Series:
+    """None/NaN plus empty strings, matching the row-based profiler."""
+    null_mask = series.isna()
+    if series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+        null_mask |= series.eq("").fillna(False).astype(bool)
+    return null_mask
+
+
+def _profile_column(
+    field_name: str,
+    series: pd.Series,
+    *,
+    sample_size: int,
+    top_frequencies: int,
+    histogram_buckets: int,
+    quantiles: Iterable[float],
+    categorical_distinct_limit: int,
+    categorical_top_k: int,
+) -> Dict[str, Any]:
+    null_mask = _null_mask(series)
+    values = series[~null_mask]
+
+    nulls = int(null_mask.sum())
+    non_null = int(values.size)
+    total_rows = non_null + nulls
+
+    # sort=False keeps first-seen order; a stable sort then mirrors
+    # Counter.most_common tie-breaking in the row-based profiler.
+    counts = values.value_counts(sort=False).sort_values(ascending=False, kind="stable")
+
+    stats: Dict[str, Any] = {
+        "field_name": field_name,
+        "non_null": non_null,
+        "nulls": nulls,
+        "distinct": int(counts.size),
+        "sample_values": values.head(sample_size).tolist(),
+        "min_value": None,
+        "max_value": None,
+        "mean": None,
+        "stddev": None,
+        "quantiles": {},
+        "frequent_values": _frequencies(counts.head(top_frequencies), total_rows),
+        "distribution": None,
+    }
+
+    from dq_profiling.engine.type_inference import (
+        NUMERIC_TYPES,
+        TEMPORAL_TYPES,
+        inferred_type,
+        parse_rates,
+    )
+
+    type_masks, parsed_numbers, moments = _infer_types(values)
+    type_name = inferred_type(type_masks, non_null)
+    stats.update(
+        inferred_type=type_name,
+        type_parse_rates=parse_rates(type_masks, non_null),
+        temporal_min=None,
+        temporal_max=None,
+    )
+    if type_name in TEMPORAL_TYPES and moments is not None:
+        stats.update(temporal_min=moments[0], temporal_max=moments[1])
+
+    # Numeric strings are promoted only when every value parses as a number.
+    numeric = parsed_numbers if type_name in NUMERIC_TYPES and parsed_numbers is not None else _numeric_values(values)
+    if numeric.size:
+        min_value = float(numeric.min())
+        max_value = float(numeric.max())
+        mean = math.fsum(numeric.tolist()) / numeric.size
+        variance = math.fsum(((numeric - mean) ** 2).tolist()) / numeric.size
+        ordered = np.sort(numeric).tolist()
+        stats.update(
+            min_value=min_value,
+            max_value=max_value,
+            mean=mean,
+            stddev=(variance if variance > 0 else 0) ** 0.5,
+            quantiles={
+                f"p{round(fraction * 100, 6):g}": _interpolated_quantile(ordered, fraction)
+                for fraction in quantiles
+            },
+            distribution={
+                "kind": "numeric",
+                "buckets": _numeric_buckets(numeric, min_value, max_value, total_rows, histogram_buckets),
+            },
+        )
+    elif counts.size > categorical_distinct_limit:
+        stats["distribution"] = {
+            "kind": "categorical",
+            "values": _frequencies(counts.head(categorical_top_k), total_rows),
+            "tail": _long_tail(counts, categorical_top_k, total_rows),
+        }
+    elif counts.size:
+        stats["distribution"] = {"kind": "categorical", "values": _frequencies(counts, total_rows)}
+    return stats
+
+
+def _long_tail(counts: pd.Series, top_k: int, total_rows: int) -> Dict[str, Any]:
+    """Summary of the values beyond the top-k, matching the row-based profiler."""
+    tail = counts.iloc[top_k:]
+    tail_count = int(tail.sum())
+    probabilities = counts.to_numpy(dtype=float) / float(counts.sum())
+    entropy = -math.fsum((probabilities * np.log2(probabilities)).tolist())
+    lengths = tail.index.astype(str).str.len().to_numpy()
+    return {
+        "distinct": int(tail.size),
+        "count": tail_count,
+        "percentage": _percentage(tail_count, total_rows),
+        "entropy": round(entropy, 6),
+        "min_length": int(lengths.min()) if lengths.size else None,
+        "max_length": int(lengths.max()) if lengths.size else None,
+        "mean_length": round(float(lengths.sum()) / lengths.size, 4) if lengths.size else None,
+    }
+
+
+def _string_mask(series: pd.Series) -> pd.Series:
+    if pd.api.types.is_string_dtype(series.dtype) and series.dtype != object:
+        return series.notna()
+    if series.dtype != object:
+        return pd.Series(False, index=series.index)
+    if pd.api.types.infer_dtype(series, skipna=True) == "string":
+        return series.notna()
+    return series.map(lambda value: isinstance(value, str)).astype(bool)
+
+
+def _standardize(df: pd.DataFrame, step: Any) -> Tuple[pd.DataFrame, Dict[str, Any], List[Dict[str, Any]]]:
+    format_hint = step.parameters.get("format", "").lower()
+    case = "upper" if format_hint in {"iso-4217", "upper"} else "lower" if format_hint == "lower" else None
+    columns = [field for field in step.target_fields if field in df.columns] if case else []
+    if columns:
+        df = df.copy(deep=False)
+        for field in columns:
+            series = df[field]
+            strings = _string_mask(series)
+            if strings.any():
+                converted = getattr(series[strings].str, case)()
+                df[field] = series.where(~strings, converted) if not strings.all() else converted
+    return df, {"standardized_fields": step.target_fields}, []
+
+
+def _fill_missing(df: pd.DataFrame, step: Any) -> Tuple[pd.DataFrame, Dict[str, Any], List[Dict[str, Any]]]:
+    default_value = step.parameters.get("default")
+    metrics: Dict[str, Any] = {"filled_fields": step.target_fields}
+    if default_value is not None:
+        df = df.copy(deep=False)
+        for field in step.target_fields:
+            if field not in df.columns:
+                df[field] = [default_value] * len(df)
+                continue
+            missing = _null_mask(df[field])
+            if missing.any():
+                filled = df[field].astype(object).mask(missing, default_value)
+                df[field] = filled.infer_objects() if df[field].dtype != object else filled
+        metrics["rejected"] = 0
+        return df, metrics, []
+
+    if step.severity != "hard":
+        metrics["rejected"] = 0
+        return df, metrics, []
+    failed = pd.Series(False, index=df.index)
+    for field in step.target_fields:
+        failed |= _null_mask(df[field]) if field in df.columns else True
+    reason = f"{step.type} failed for {step.target_fields}"
+    rejected = [{"row": row, "reason": reason} for row in df[failed].to_dict("records")]
+    metrics["rejected"] = len(rejected)
+    return (df[~failed] if rejected else df), metrics, rejected
+
+
+def _deduplicate(df: pd.DataFrame, step: Any) -> Tuple[pd.DataFrame, Dict[str, Any], List[Dict[str, Any]]]:
+    from dq_cleansing.engine.transformer import TransformationError, deduplicate_keys
+
+    keys = deduplicate_keys(step)
+    if not keys:
+        raise TransformationError("deduplicate step requires keys or target_fields")
+    # Absent key fields are None for every row, so they never tell rows apart.
+    present = [field for field in keys if field in df.columns]
+    if present:
+        # Key like `dedup_key`: None and NaN are one missing value, and 1 == 1.0.
+        subset = df[present].astype(object)
+        duplicated = subset.where(subset.notna(), None).duplicated(keep="first")
+    else:
+        duplicated = pd.Series([index > 0 for index in range(len(df))], index=df.index, dtype=bool)
+    reason = f"duplicate on {keys}"
+    rejected = [{"row": row, "reason": reason} for row in df[duplicated].to_dict("records")]
+    metrics = {"keys": keys, "deduplicated": len(rejected), "retained": len(df) - len(rejected)}
+    return (df[~duplicated] if rejected else df), metrics, rejected
+
+
+_NATIVE_TRANSFORMATIONS = {
+    "standardize": _standardize,
+    "standardise": _standardize,
+    "fill_missing": _fill_missing,
+    "deduplicate": _deduplicate,
+}
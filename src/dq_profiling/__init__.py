@@ -1,15 +1,33 @@
 """Public exports for the data profiling module."""
 
 from .engine.context_builder import ProfilingContextBuilder
+from .engine.drift import DriftDetector
+from .engine.history import MetricSeries, ProfilingHistoryStore, ToleranceCheck
 from .engine.profiler import ProfilingEngine
-from .models.profiling_job import ProfilingJob, ProfilingJobResult, ProfilingJobStatus
+from .engine.result_cache import ProfilingCacheStats, ProfilingResultCache
+from .models.profiling_job import (
+    ProfilingCrossColumn,
+    ProfilingJob,
+    ProfilingJobResult,
+    ProfilingJobStatus,
+    ProfilingSampling,
+    ProfilingSpec,
+)
 from .models.profiling_snapshot import (
+    CrossColumnProfile,
     DistributionBucket,
     DistributionSummary,
+    DistributionTail,
+    FieldDrift,
+    FunctionalDependency,
+    KeyCandidate,
     ProfilingFieldStats,
     ProfilingSnapshot,
+    SamplingSummary,
+    SnapshotDrift,
     ValueFrequency,
 )
+from .models.profiling_state import ProfilingState, ProfilingStateMismatchError
 from .report.profiling_report import (
     FieldSummary,
     ProfilingReport,
@@ -20,14 +38,32 @@ from .report.profiling_report import (
 __all__ = [
     "ProfilingEngine",
     "ProfilingContextBuilder",
+    "ProfilingResultCache",
+    "ProfilingCacheStats",
+    "ProfilingHistoryStore",
+    "DriftDetector",
+    "MetricSeries",
+    "ToleranceCheck",
     "ProfilingJob",
     "ProfilingJobResult",
     "ProfilingJobStatus",
+    "ProfilingSampling",
+    "ProfilingSpec",
+    "ProfilingCrossColumn",
     "ProfilingSnapshot",
     "ProfilingFieldStats",
     "DistributionSummary",
     "DistributionBucket",
+    "DistributionTail",
     "ValueFrequency",
+    "SamplingSummary",
+    "FieldDrift",
+    "SnapshotDrift",
+    "CrossColumnProfile",
+    "KeyCandidate",
+    "FunctionalDependency",
+    "ProfilingState",
+    "ProfilingStateMismatchError",
     "ProfilingReport",
     "FieldSummary",
     "profiling_report_from_result",
@@ -1,6 +1,19 @@
 """Profiling engine exports."""
 
 from .context_builder import ProfilingContext, ProfilingContextBuilder
+from .drift import DriftDetector
+from .history import MetricSeries, ProfilingHistoryStore, ToleranceCheck
 from .profiler import ProfilingEngine
+from .result_cache import ProfilingCacheStats, ProfilingResultCache
 
-__all__ = ["ProfilingEngine", "ProfilingContextBuilder", "ProfilingContext"]
+__all__ = [
+    "ProfilingEngine",
+    "ProfilingContextBuilder",
+    "ProfilingContext",
+    "ProfilingResultCache",
+    "ProfilingCacheStats",
+    "ProfilingHistoryStore",
+    "DriftDetector",
+    "MetricSeries",
+    "ToleranceCheck",
+]
@@ -0,0 +1,525 @@
+"""Per-field accumulators used by the row-based profiler.
+
+Accumulators are slotted classes with a single `add` entry point so the
+profiler's hot loop can bind `accumulator.add` once per schema and call it per
+cell without dict lookups. Exact accumulators retain values; sketch
+accumulators keep fixed-size sketches. Both serialise to the payload format
+stored in `ProfilingState.fields`.
+
+Every accumulator also runs type inference in the same pass: strings that
+parse as numbers are kept in a separate channel until a value fails to parse,
+and are promoted into numeric stats only when every value is numeric.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..models.profiling_job import ProfilingSpec
+from .sketches import HyperLogLog, KLLSketch, MisraGries, StreamingHistogram, _hashable
+from .type_inference import FLOAT, NUMERIC_TYPES, infer_value, inferred_type
+
+
+class FieldAccumulator:
+    """State shared by both accumulator kinds."""
+
+    __slots__ = ("sample_size", "non_null", "nulls", "sample_values", "type_masks", "temporal_min", "temporal_max")
+
+    def __init__(self, sample_size: int) -> None:
+        self.sample_size = sample_size
+        self.non_null = 0
+        self.nulls = 0
+        self.sample_values: List[Any] = []
+        # Count of values per type-inference bit mask; a handful of keys per field.
+        self.type_masks: Dict[int, int] = {}
+        self.temporal_min: datetime | None = None
+        self.temporal_max: datetime | None = None
+
+    @property
+    def total_rows(self) -> int:
+        return self.non_null + self.nulls
+
+    @property
+    def inferred_type(self) -> str | None:
+        return inferred_type(self.type_masks, self.non_null)
+
+    def _observe_moment(self, moment: datetime) -> None:
+        if self.temporal_min is None or moment < self.temporal_min:
+            self.temporal_min = moment
+        if self.temporal_max is None or moment > self.temporal_max:
+            self.temporal_max = moment
+
+    def _merge_common(self, other: "FieldAccumulator") -> None:
+        self.non_null += other.non_null
+        self.nulls += other.nulls
+        missing_samples = self.sample_size - len(self.sample_values)
+        if missing_samples > 0:
+            self.sample_values.extend(other.sample_values[:missing_samples])
+        for mask, count in other.type_masks.items():
+            self.type_masks[mask] = self.type_masks.get(mask, 0) + count
+        if other.temporal_min is not None:
+            self._observe_moment(other.temporal_min)
+            self._observe_moment(other.temporal_max)
+
+    def _common_payload(self) -> Dict[str, Any]:
+        return {
+            "non_null": self.non_null,
+            "nulls": self.nulls,
+            "sample_values": list(self.sample_values),
+            "numeric_count": self.numeric_count,
+            "numeric_min": self.numeric_min,
+            "numeric_max": self.numeric_max,
+            "type_masks": [[mask, count] for mask, count in self.type_masks.items()],
+            "temporal_min": self.temporal_min.isoformat() if self.temporal_min else None,
+            "temporal_max": self.temporal_max.isoformat() if self.temporal_max else None,
+        }
+
+    def _restore_common(self, payload: Dict[str, Any]) -> None:
+        self.non_null = payload["non_null"]
+        self.nulls = payload["nulls"]
+        self.sample_values = list(payload["sample_values"])
+        self.type_masks = {mask: count for mask, count in payload["type_masks"]}
+        if payload["temporal_min"] is not None:
+            self.temporal_min = datetime.fromisoformat(payload["temporal_min"])
+            self.temporal_max = datetime.fromisoformat(payload["temporal_max"])
+
+
+class ExactFieldAccumulator(FieldAccumulator):
+    """Keeps every value count and numeric value for exact statistics.
+
+    State therefore grows with the number of values; sketch mode keeps it
+    bounded. Min/max are tracked as values arrive, and the order of the value
+    lists is not significant (the profiler sorts them in place).
+    """
+
+    __slots__ = ("value_counts", "numeric_values", "parsed_numbers", "native_min", "native_max", "parsed_min", "parsed_max")
+
+    def __init__(self, sample_size: int) -> None:
+        super().__init__(sample_size)
+        self.value_counts: Counter = Counter()
+        self.numeric_values: List[float] = []
+        # Numbers parsed from strings; dropped once any value is non-numeric.
+        self.parsed_numbers: Optional[List[float]] = []
+        self.native_min: float | None = None
+        self.native_max: float | None = None
+        self.parsed_min: float | None = None
+        self.parsed_max: float | None = None
+
+    def add(self, value: Any) -> None:
+        if value is None or value == "":
+            self.nulls += 1
+            return
+        self.non_null += 1
+        self.value_counts[value] += 1
+        if len(self.sample_values) < self.sample_size:
+            self.sample_values.append(value)
+        mask, parsed, moment = infer_value(value)
+        self.type_masks[mask] = self.type_masks.get(mask, 0) + 1
+        if mask & FLOAT:
+            if parsed is None:
+                number = float(value)
+                self.numeric_values.append(number)
+                if self.native_min is None or number < self.native_min:
+                    self.native_min = number
+                if self.native_max is None or number > self.native_max:
+                    self.native_max = number
+            elif self.parsed_numbers is not None:
+                self.parsed_numbers.append(parsed)
+                if self.parsed_min is None or parsed < self.parsed_min:
+                    self.parsed_min = parsed
+                if self.parsed_max is None or parsed > self.parsed_max:
+                    self.parsed_max = parsed
+        else:
+            self.parsed_numbers = None
+        if moment is not None:
+            self._observe_moment(moment)
+
+    def merge(self, other: "ExactFieldAccumulator") -> None:
+        self._merge_common(other)
+        # Counter.update keeps first-seen key order, so ties in most_common
+        # resolve exactly as in a serial scan.
+        self.value_counts.update(other.value_counts)
+        self.numeric_values.extend(other.numeric_values)
+        self.native_min = _lower(self.native_min, other.native_min)
+        self.native_max = _upper(self.native_max, other.native_max)
+        if self.parsed_numbers is None or other.parsed_numbers is None:
+            self.parsed_numbers = None
+        else:
+            self.parsed_numbers.extend(other.parsed_numbers)
+            self.parsed_min = _lower(self.parsed_min, other.parsed_min)
+            self.parsed_max = _upper(self.parsed_max, other.parsed_max)
+
+    @property
+    def numeric_count(self) -> int:
+        return len(self.numeric_values)
+
+    def effective_numbers(self) -> List[float]:
+        """Native numbers, plus parsed strings when the whole field is numeric."""
+        if self._parsed_are_numeric():
+            return self.numeric_values + self.parsed_numbers
+        return self.numeric_values
+
+    def _parsed_are_numeric(self) -> bool:
+        return bool(self.parsed_numbers) and self.inferred_type in NUMERIC_TYPES
+
+    @property
+    def numeric_min(self) -> float | None:
+        return _lower(self.native_min, self.parsed_min) if self._parsed_are_numeric() else self.native_min
+
+    @property
+    def numeric_max(self) -> float | None:
+        return _upper(self.native_max, self.parsed_max) if self._parsed_are_numeric() else self.native_max
+
+    def moments(self, values: List[float]) -> Tuple[float | None, float | None]:
+        """Population mean/stddev; fsum keeps results independent of partitioning."""
+        count = len(values)
+        if not count:
+            return None, None
+        mean = math.fsum(values) / count
+        variance = math.fsum((value - mean) ** 2 for value in values) / count
+        return mean, (variance if variance > 0 else 0) ** 0.5
+
+    def to_dict(self) -> Dict[str, Any]:
+        payload = self._common_payload()
+        payload.update(
+            value_counts=[[value, count] for value, count in self.value_counts.items()],
+            numeric_values=list(self.numeric_values),
+            parsed_numbers=None if self.parsed_numbers is None else list(self.parsed_numbers),
+        )
+        return payload
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any], sample_size: int) -> "ExactFieldAccumulator":
+        accumulator = cls(sample_size)
+        accumulator._restore_common(payload)
+        accumulator.value_counts = Counter(
+            {_hashable(value): count for value, count in payload["value_counts"]}
+        )
+        accumulator.numeric_values = list(payload["numeric_values"])
+        parsed = payload["parsed_numbers"]
+        accumulator.parsed_numbers = None if parsed is None else list(parsed)
+        if accumulator.numeric_values:
+            accumulator.native_min = min(accumulator.numeric_values)
+            accumulator.native_max = max(accumulator.numeric_values)
+        if accumulator.parsed_numbers:
+            accumulator.parsed_min = min(accumulator.parsed_numbers)
+            accumulator.parsed_max = max(accumulator.parsed_numbers)
+        return accumulator
+
+
+class NumericSketch:
+    """Bounded-memory numeric summary: KLL quantiles, histogram, Welford moments."""
+
+    __slots__ = ("count", "min_value", "max_value", "mean", "m2", "quantile_sketch", "histogram_sketch")
+
+    def __init__(self, quantile_sketch_k: int, histogram_bins: int) -> None:
+        self.count = 0
+        self.min_value: float | None = None
+        self.max_value: float | None = None
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.quantile_sketch = KLLSketch(quantile_sketch_k)
+        self.histogram_sketch = StreamingHistogram(histogram_bins)
+
+    def add(self, number: float) -> None:
+        self.count += 1
+        self.quantile_sketch.add(number)
+        self.histogram_sketch.add(number)
+        # Welford update keeps the variance stable without retaining values;
+        # partitions merge via Chan et al.
+        delta = number - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (number - self.mean)
+        if self.min_value is None or number < self.min_value:
+            self.min_value = number
+        if self.max_value is None or number > self.max_value:
+            self.max_value = number
+
+    def merge(self, other: "NumericSketch") -> None:
+        if not other.count:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        if self.min_value is None or other.min_value < self.min_value:
+            self.min_value = other.min_value
+        if self.max_value is None or other.max_value > self.max_value:
+            self.max_value = other.max_value
+        self.quantile_sketch.merge(other.quantile_sketch)
+        self.histogram_sketch.merge(other.histogram_sketch)
+
+    def moments(self) -> Tuple[float | None, float | None]:
+        if not self.count:
+            return None, None
+        variance = self.m2 / self.count
+        return self.mean, (variance if variance > 0 else 0) ** 0.5
+
+    def copy(self) -> "NumericSketch":
+        return NumericSketch.from_dict(self.to_dict())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "numeric_count": self.count,
+            "numeric_min": self.min_value,
+            "numeric_max": self.max_value,
+            "numeric_mean": self.mean,
+            "numeric_m2": self.m2,
+            "quantile_sketch": self.quantile_sketch.to_dict(),
+            "histogram_sketch": self.histogram_sketch.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "NumericSketch":
+        quantile_sketch = KLLSketch.from_dict(payload["quantile_sketch"])
+        histogram_sketch = StreamingHistogram.from_dict(payload["histogram_sketch"])
+        sketch = cls(quantile_sketch.k, histogram_sketch.max_bins)
+        sketch.count = payload["numeric_count"]
+        sketch.min_value = payload["numeric_min"]
+        sketch.max_value = payload["numeric_max"]
+        sketch.mean = payload["numeric_mean"]
+        sketch.m2 = payload["numeric_m2"]
+        sketch.quantile_sketch = quantile_sketch
+        sketch.histogram_sketch = histogram_sketch
+        return sketch
+
+
+class SketchFieldAccumulator(FieldAccumulator):
+    """Fixed-size sketches plus Welford moments for bounded-memory profiling."""
+
+    __slots__ = ("distinct_sketch", "frequency_sketch", "numeric", "parsed_numeric")
+
+    def __init__(
+        self,
+        sample_size: int,
+        *,
+        hll_precision: int,
+        frequency_capacity: int,
+        quantile_sketch_k: int,
+        histogram_bins: int,
+    ) -> None:
+        super().__init__(sample_size)
+        self.distinct_sketch = HyperLogLog(hll_precision)
+        self.frequency_sketch = MisraGries(frequency_capacity)
+        self.numeric = NumericSketch(quantile_sketch_k, histogram_bins)
+        # Sketch of numbers parsed from strings; dropped once any value is non-numeric.
+        self.parsed_numeric: Optional[NumericSketch] = NumericSketch(quantile_sketch_k, histogram_bins)
+
+    def add(self, value: Any) -> None:
+        if value is None or value == "":
+            self.nulls += 1
+            return
+        self.non_null += 1
+        self.distinct_sketch.add(value)
+        self.frequency_sketch.add(value)
+        if len(self.sample_values) < self.sample_size:
+            self.sample_values.append(value)
+        mask, parsed, moment = infer_value(value)
+        self.type_masks[mask] = self.type_masks.get(mask, 0) + 1
+        if mask & FLOAT:
+            if parsed is None:
+                self.numeric.add(float(value))
+            elif self.parsed_numeric is not None:
+                self.parsed_numeric.add(parsed)
+        else:
+            self.parsed_numeric = None
+        if moment is not None:
+            self._observe_moment(moment)
+
+    def merge(self, other: "SketchFieldAccumulator") -> None:
+        self._merge_common(other)
+        self.distinct_sketch.merge(other.distinct_sketch)
+        self.frequency_sketch.merge(other.frequency_sketch)
+        self.numeric.merge(other.numeric)
+        if self.parsed_numeric is None or other.parsed_numeric is None:
+            self.parsed_numeric = None
+        else:
+            self.parsed_numeric.merge(other.parsed_numeric)
+
+    @property
+    def numeric_count(self) -> int:
+        return self.numeric.count
+
+    @property
+    def numeric_min(self) -> float | None:
+        return self.numeric.min_value
+
+    @property
+    def numeric_max(self) -> float | None:
+        return self.numeric.max_value
+
+    def effective_numeric(self) -> NumericSketch:
+        """Native numeric sketch, merged with parsed strings when the whole field is numeric."""
+        if self.parsed_numeric is not None and self.parsed_numeric.count and self.inferred_type in NUMERIC_TYPES:
+            merged = self.numeric.copy()
+            merged.merge(self.parsed_numeric)
+            return merged
+        return self.numeric
+
+    def to_dict(self) -> Dict[str, Any]:
+        payload = self._common_payload()
+        payload.update(self.numeric.to_dict())
+        payload.update(
+            distinct_sketch=self.distinct_sketch.to_dict(),
+            frequency_sketch=self.frequency_sketch.to_dict(),
+            parsed_numeric=None if self.parsed_numeric is None else self.parsed_numeric.to_dict(),
+        )
+        return payload
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any], sample_size: int) -> "SketchFieldAccumulator":
+        distinct_sketch = HyperLogLog.from_dict(payload["distinct_sketch"])
+        frequency_sketch = MisraGries.from_dict(payload["frequency_sketch"])
+        numeric = NumericSketch.from_dict(payload)
+        accumulator = cls(
+            sample_size,
+            hll_precision=distinct_sketch.precision,
+            frequency_capacity=frequency_sketch.capacity,
+            quantile_sketch_k=numeric.quantile_sketch.k,
+            histogram_bins=numeric.histogram_sketch.max_bins,
+        )
+        accumulator._restore_common(payload)
+        accumulator.distinct_sketch = distinct_sketch
+        accumulator.frequency_sketch = frequency_sketch
+        accumulator.numeric = numeric
+        parsed = payload["parsed_numeric"]
+        accumulator.parsed_numeric = None if parsed is None else NumericSketch.from_dict(parsed)
+        return accumulator
+
+
+class NullCountAccumulator(FieldAccumulator):
+    """Counts nulls only, for fields outside the profiling spec."""
+
+    __slots__ = ()
+
+    def add(self, value: Any) -> None:
+        if value is None or value == "":
+            self.nulls += 1
+        else:
+            self.non_null += 1
+
+    def merge(self, other: "NullCountAccumulator") -> None:
+        self.non_null += other.non_null
+        self.nulls += other.nulls
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"kind": "count", "non_null": self.non_null, "nulls": self.nulls}
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any], sample_size: int) -> "NullCountAccumulator":
+        accumulator = cls(sample_size)
+        accumulator.non_null = payload["non_null"]
+        accumulator.nulls = payload["nulls"]
+        return accumulator
+
+
+class AccumulatorConfig:
+    """Settings that shape field accumulators.
+
+    Small and picklable, so process-pool workers receive this instead of the
+    whole `ProfilingEngine` (with its cache, store and collaborators).
+    """
+
+    __slots__ = ("mode", "sample_size", "hll_precision", "frequency_capacity", "quantile_sketch_k", "histogram_bins")
+
+    def __init__(
+        self,
+        mode: str,
+        sample_size: int,
+        *,
+        hll_precision: int,
+        frequency_capacity: int,
+        quantile_sketch_k: int,
+        histogram_bins: int,
+    ) -> None:
+        self.mode = mode
+        self.sample_size = sample_size
+        self.hll_precision = hll_precision
+        self.frequency_capacity = frequency_capacity
+        self.quantile_sketch_k = quantile_sketch_k
+        self.histogram_bins = histogram_bins
+
+    def new(self) -> FieldAccumulator:
+        if self.mode == "sketch":
+            return SketchFieldAccumulator(
+                self.sample_size,
+                hll_precision=self.hll_precision,
+                frequency_capacity=self.frequency_capacity,
+                quantile_sketch_k=self.quantile_sketch_k,
+                histogram_bins=self.histogram_bins,
+            )
+        return ExactFieldAccumulator(self.sample_size)
+
+    def restore(self, payload: Dict[str, Any]) -> FieldAccumulator:
+        if payload.get("kind") == "count":
+            return NullCountAccumulator.from_dict(payload, self.sample_size)
+        if self.mode == "sketch":
+            return SketchFieldAccumulator.from_dict(payload, self.sample_size)
+        return ExactFieldAccumulator.from_dict(payload, self.sample_size)
+
+
+def accumulate_rows(
+    rows: Iterable[Dict[str, Any]],
+    config: AccumulatorConfig,
+    spec: ProfilingSpec | None = None,
+) -> Tuple[int, Dict[str, FieldAccumulator]]:
+    """Scan rows once and return the record count plus per-field accumulators.
+
+    Module level so it can also serve as the process-pool entry point.
+    """
+    record_count = 0
+    aggregates: Dict[str, FieldAccumulator] = {}
+    schema: Tuple[str, ...] | None = None
+    adders: List[Callable[[Any], None]] = []
+
+    for row in rows:
+        record_count += 1
+        # Rows from one source almost always share a schema, so bound
+        # `add` methods are resolved once per schema rather than per cell.
+        fields = tuple(row)
+        if fields != schema:
+            schema = fields
+            adders = [_adder_for(aggregates, field_name, config, spec) for field_name in fields]
+        for add, value in zip(adders, row.values()):
+            add(value)
+
+    return record_count, aggregates
+
+
+def _adder_for(
+    aggregates: Dict[str, FieldAccumulator],
+    field_name: str,
+    config: AccumulatorConfig,
+    spec: ProfilingSpec | None,
+) -> Callable[[Any], None]:
+    """Full accumulator for spec fields, a null counter or nothing for the rest."""
+    accumulator = aggregates.get(field_name)
+    if spec is None or field_name in spec.fields:
+        if accumulator is None:
+            accumulator = aggregates[field_name] = config.new()
+        return accumulator.add
+    if not spec.count_other_fields:
+        return _ignore
+    if accumulator is None:
+        accumulator = aggregates[field_name] = NullCountAccumulator(config.sample_size)
+    return accumulator.add
+
+
+def _ignore(value: Any) -> None:
+    """Adder for fields dropped by the profiling spec."""
+
+
+def _lower(left: float | None, right: float | None) -> float | None:
+    if left is None:
+        return right
+    return left if right is None or left <= right else right
+
+
+def _upper(left: float | None, right: float | None) -> float | None:
+    if left is None:
+        return right
+    return left if right is None or left >= right else right
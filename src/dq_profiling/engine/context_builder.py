@@ -39,7 +39,31 @@ class ProfilingContextBuilder:
         metadata = {
             "generated_from": effective_snapshot.generated_from,
             "overrides": effective_snapshot.overrides_applied,
+            # Lets cleansing/validation pick typed parsers without re-inferring.
+            "inferred_types": {
+                field_name: stats.inferred_type
+                for field_name, stats in effective_snapshot.field_stats.items()
+                if stats.inferred_type
+            },
         }
+        approximate_fields = {
+            field_name: stats.error_bounds
+            for field_name, stats in effective_snapshot.field_stats.items()
+            if stats.approximate
+        }
+        if approximate_fields:
+            metadata["approximate_fields"] = approximate_fields
+        if effective_snapshot.sampling is not None:
+            metadata["sampling"] = effective_snapshot.sampling.dict()
+            metadata["confidence_intervals"] = {
+                field_name: stats.confidence_intervals
+                for field_name, stats in effective_snapshot.field_stats.items()
+                if stats.confidence_intervals
+            }
+        if effective_snapshot.cross_column is not None:
+            metadata["cross_column"] = effective_snapshot.cross_column.dict()
+        if effective_snapshot.drift is not None:
+            metadata["drift"] = effective_snapshot.drift.dict()
         if job:
             metadata["profiling_job_id"] = job.job_id
             metadata["source_dataset_uri"] = job.source_dataset_uri
@@ -0,0 +1,241 @@
+"""Cross-column profiling: key candidates and functional dependencies.
+
+The scanner wraps a row iterable and observes every row in the same pass as
+the field profiler, with bounded cost:
+
+* each cell is hashed once; column pairs reuse those hashes, so combination
+  distinct counts are HyperLogLog updates rather than tuple hashing;
+* the first `warmup_rows` rows are checked exactly and prune the search
+  lattice: columns and pairs that already repeat cannot be keys and
+  dependencies already violated are dropped, so only the surviving pairs
+  are tracked for the rest of the scan. A column that is unique in the
+  warm-up rows may still repeat later, so its pairs stay tracked and
+  minimality is decided in `result` against the confirmed single keys;
+* a uniform reservoir sample confirms the final candidates.
+
+Only single columns and column pairs are considered.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from itertools import combinations
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from ..models.profiling_job import ProfilingCrossColumn
+from ..models.profiling_snapshot import (
+    CrossColumnProfile,
+    FunctionalDependency,
+    KeyCandidate,
+)
+from .sketches import HyperLogLog, stable_hash
+
+Row = Dict[str, Any]
+Pair = Tuple[int, int]
+
+_MASK = (1 << 64) - 1
+_NULL_HASH = stable_hash(None)
+# Estimates within this many HLL standard errors count as equal.
+_TOLERANCE_SIGMAS = 3
+
+
+def _combine(left: int, right: int) -> int:
+    """Order-sensitive 64-bit mix of two cell hashes (splitmix64 finaliser)."""
+    mixed = (left * 0x9E3779B97F4A7C15 + right) & _MASK
+    mixed = ((mixed ^ (mixed >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    mixed = ((mixed ^ (mixed >> 27)) * 0x94D049BB133111EB) & _MASK
+    return mixed ^ (mixed >> 31)
+
+
+def _cell_hash(value: Any) -> int:
+    """Hash a cell so row iterables and DataFrame records agree (NaN is null, 10.0 is 10)."""
+    if value is None or value == "":
+        return _NULL_HASH
+    if type(value) is float:
+        if math.isnan(value):
+            return _NULL_HASH
+        if value.is_integer():
+            value = int(value)
+    return stable_hash(value)
+
+
+class CrossColumnScanner:
+    """Observe rows while yielding them unchanged; call `result()` afterwards."""
+
+    def __init__(
+        self,
+        rows: Iterable[Row],
+        options: ProfilingCrossColumn,
+        fields: Optional[Iterable[str]] = None,
+    ) -> None:
+        self._rows = rows
+        self._options = options
+        self._fields = set(fields) if fields is not None else None
+        self._rng = random.Random(options.seed)
+        self.columns: List[str] = []
+        self.population = 0
+        self._nulls: List[int] = []
+        self._distinct: List[HyperLogLog] = []
+        self._prefix: List[Tuple[int, ...]] = []
+        self._sample: List[Tuple[int, ...]] = []
+        self._key_pairs: Set[Pair] = set()
+        self._dependencies: Set[Pair] = set()
+        self._warmup_unique: List[bool] = []
+        self._pair_distinct: Dict[Pair, HyperLogLog] = {}
+        self._pruned = False
+
+    def __iter__(self) -> Iterator[Row]:
+        for row in self._rows:
+            if not self.columns:
+                self._start(row)
+            self._observe(tuple(_cell_hash(row.get(name)) for name in self.columns))
+            yield row
+        if not self._pruned:
+            self._prune()
+
+    def scan_tuples(self, names: Sequence[str], rows: Iterable[Sequence[Any]]) -> None:
+        """Observe positional rows whose values follow `names`, without building row dicts.
+
+        Meant for `DataFrame.itertuples(index=False, name=None)`; the rows
+        passed to the constructor are ignored.
+        """
+        self._start(names)
+        positions = [list(names).index(name) for name in self.columns]
+        for values in rows:
+            self._observe(tuple(_cell_hash(values[position]) for position in positions))
+        if not self._pruned:
+            self._prune()
+
+    def _start(self, names: Iterable[str]) -> None:
+        names = [name for name in names if self._fields is None or name in self._fields]
+        self.columns = names[: self._options.max_columns]
+        self._nulls = [0] * len(self.columns)
+        self._distinct = [HyperLogLog(self._options.hll_precision) for _ in self.columns]
+
+    def _observe(self, hashes: Tuple[int, ...]) -> None:
+        self.population += 1
+        for index, hashed in enumerate(hashes):
+            if hashed == _NULL_HASH:
+                self._nulls[index] += 1
+            self._distinct[index].add_hash(hashed)
+
+        if not self._pruned:
+            self._prefix.append(hashes)
+            if len(self._prefix) >= self._options.warmup_rows:
+                self._prune()
+        else:
+            for (left, right), sketch in self._pair_distinct.items():
+                sketch.add_hash(_combine(hashes[left], hashes[right]))
+
+        # Reservoir sample (Algorithm R) of hashed rows.
+        if len(self._sample) < self._options.sample_size:
+            self._sample.append(hashes)
+        else:
+            slot = self._rng.randrange(self.population)
+            if slot < self._options.sample_size:
+                self._sample[slot] = hashes
+
+    def _prune(self) -> None:
+        """Check the warm-up rows exactly and keep only lattice nodes that can still qualify."""
+        self._pruned = True
+        prefix = self._prefix
+        width = len(self.columns)
+        unique = [len({row[index] for row in prefix}) == len(prefix) for index in range(width)]
+        self._warmup_unique = unique
+        nullable = [count > 0 for count in self._nulls]
+
+        for left, right in combinations(range(width), 2):
+            if nullable[left] or nullable[right]:
+                continue
+            if unique[left] or unique[right] or len({(row[left], row[right]) for row in prefix}) == len(prefix):
+                self._key_pairs.add((left, right))
+
+        for determinant in range(width):
+            for dependent in range(width):
+                if dependent != determinant and self._holds(prefix, determinant, dependent):
+                    self._dependencies.add((determinant, dependent))
+
+        for pair in self._key_pairs | self._dependencies:
+            sketch = self._pair_distinct[pair] = HyperLogLog(self._options.hll_precision)
+            for row in prefix:
+                sketch.add_hash(_combine(row[pair[0]], row[pair[1]]))
+        self._prefix = []
+
+    def _holds(self, rows: List[Tuple[int, ...]], determinant: int, dependent: int) -> bool:
+        seen: Dict[int, int] = {}
+        for row in rows:
+            if seen.setdefault(row[determinant], row[dependent]) != row[dependent]:
+                return False
+        return True
+
+    def result(self) -> CrossColumnProfile:
+        """Candidates confirmed by the HyperLogLog estimates and the uniform sample."""
+        rows = self.population
+        sample = self._sample
+        keys: List[KeyCandidate] = []
+        key_columns: Set[int] = set()
+
+        for index, name in enumerate(self.columns):
+            estimate = self._distinct[index].estimate()
+            if (
+                not self._nulls[index]
+                and self._warmup_unique[index]
+                and self._near(estimate, rows, self._distinct[index])
+                and len({row[index] for row in sample}) == len(sample)
+            ):
+                key_columns.add(index)
+                keys.append(self._candidate([name], estimate, rows))
+
+        for left, right in sorted(self._key_pairs):
+            # Minimality: a pair containing a confirmed key is never reported.
+            if left in key_columns or right in key_columns or self._nulls[left] or self._nulls[right]:
+                continue
+            sketch = self._pair_distinct[(left, right)]
+            estimate = sketch.estimate()
+            if self._near(estimate, rows, sketch) and (
+                len({(row[left], row[right]) for row in sample}) == len(sample)
+            ):
+                keys.append(self._candidate([self.columns[left], self.columns[right]], estimate, rows))
+
+        dependencies: List[FunctionalDependency] = []
+        for determinant, dependent in sorted(self._dependencies):
+            if determinant in key_columns or self._distinct[dependent].estimate() <= 1:
+                continue
+            determinant_distinct = self._distinct[determinant].estimate()
+            pair_distinct = self._pair_distinct[(determinant, dependent)].estimate()
+            if not self._near(determinant_distinct, pair_distinct, self._distinct[determinant]):
+                continue
+            if not self._holds(sample, determinant, dependent):
+                continue
+            sampled_values = len({row[determinant] for row in sample})
+            dependencies.append(
+                FunctionalDependency(
+                    determinant=self.columns[determinant],
+                    dependent=self.columns[dependent],
+                    determinant_distinct=determinant_distinct,
+                    sample_support=round(1 - sampled_values / len(sample), 6) if sample else 0.0,
+                )
+            )
+
+        primary = keys[0].columns if keys else []
+        return CrossColumnProfile(
+            columns=list(self.columns),
+            sample_rows=len(sample),
+            key_candidates=keys,
+            functional_dependencies=dependencies,
+            suggested_primary_keys=list(primary),
+            suggested_indexes=[
+                {"name": "ux_" + "_".join(candidate.columns), "fields": list(candidate.columns), "unique": True}
+                for candidate in keys[1:]
+            ],
+        )
+
+    def _candidate(self, columns: List[str], estimate: int, rows: int) -> KeyCandidate:
+        # Reported candidates passed every check, so they are unique; an
+        # estimate below the row count is HyperLogLog error, not repeats.
+        return KeyCandidate(columns=columns, estimated_distinct=estimate, uniqueness=1.0)
+
+    def _near(self, estimate: int, target: int, sketch: HyperLogLog) -> bool:
+        """Whether `estimate` reaches `target` within the sketch's error tolerance."""
+        return estimate >= target * (1 - _TOLERANCE_SIGMAS * sketch.relative_error)
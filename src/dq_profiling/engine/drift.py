@@ -0,0 +1,205 @@
+"""Distribution drift between two profiling snapshots.
+
+Drift is computed from what snapshots already store, so neither dataset is
+re-read. Numeric fields are compared on their histograms: both are re-binned
+onto the union of bucket edges (assuming values spread uniformly inside a
+bucket) before computing PSI and the largest CDF gap, a KS approximation.
+Categorical fields are compared on their top values. A value listed on only
+one side counts as zero on the other only when that side lists every value;
+otherwise its mass may sit in the other side's unlisted remainder, so it is
+pooled into a single "other" bin on both sides together with all unlisted
+mass.
+"""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..models.profiling_snapshot import (
+    DistributionBucket,
+    FieldDrift,
+    ProfilingFieldStats,
+    ProfilingSnapshot,
+    SnapshotDrift,
+)
+
+# Smoothing for empty bins so PSI stays finite.
+_EPSILON = 1e-4
+_OTHER = object()
+
+
+def population_stability_index(expected: List[float], actual: List[float]) -> float:
+    """PSI over aligned probability vectors."""
+    psi = 0.0
+    for baseline, current in zip(expected, actual):
+        baseline = max(baseline, _EPSILON)
+        current = max(current, _EPSILON)
+        psi += (current - baseline) * math.log(current / baseline)
+    return psi
+
+
+def jensen_shannon(expected: List[float], actual: List[float]) -> float:
+    """Jensen-Shannon divergence in bits over aligned probability vectors."""
+    divergence = 0.0
+    for baseline, current in zip(expected, actual):
+        midpoint = (baseline + current) / 2
+        if baseline > 0:
+            divergence += 0.5 * baseline * math.log2(baseline / midpoint)
+        if current > 0:
+            divergence += 0.5 * current * math.log2(current / midpoint)
+    return max(0.0, min(1.0, divergence))
+
+
+def _rebin(buckets: List[DistributionBucket], edges: List[float]) -> List[float]:
+    """Spread bucket counts over the intervals between `edges`; returns proportions."""
+    masses = [0.0] * (len(edges) - 1)
+    total = sum(bucket.count for bucket in buckets)
+    if not total or not masses:
+        return masses
+    for bucket in buckets:
+        width = bucket.end - bucket.start
+        if width <= 0:
+            index = min(max(bisect_right(edges, bucket.start) - 1, 0), len(masses) - 1)
+            masses[index] += bucket.count
+            continue
+        first = max(bisect_right(edges, bucket.start) - 1, 0)
+        for index in range(first, len(masses)):
+            low, high = edges[index], edges[index + 1]
+            if low >= bucket.end:
+                break
+            overlap = min(high, bucket.end) - max(low, bucket.start)
+            if overlap > 0:
+                masses[index] += bucket.count * overlap / width
+    return [mass / total for mass in masses]
+
+
+def _numeric_proportions(
+    baseline: List[DistributionBucket],
+    current: List[DistributionBucket],
+) -> Tuple[List[float], List[float]]:
+    edges = sorted({edge for bucket in baseline + current for edge in (bucket.start, bucket.end)})
+    if len(edges) == 1:
+        return [1.0], [1.0]
+    return _rebin(baseline, edges), _rebin(current, edges)
+
+
+def _categorical_counts(stats: ProfilingFieldStats) -> Dict[Any, float]:
+    frequencies = stats.distribution.values if stats.distribution else stats.frequent_values
+    if not stats.non_null:
+        return {}
+    proportions: Dict[Any, float] = {}
+    for frequency in frequencies:
+        key = frequency.value if frequency.value.__hash__ is not None else repr(frequency.value)
+        proportions[key] = proportions.get(key, 0.0) + frequency.count / stats.non_null
+    proportions[_OTHER] = max(0.0, 1.0 - sum(proportions.values()))
+    return proportions
+
+
+def _categorical_proportions(
+    baseline: ProfilingFieldStats,
+    current: ProfilingFieldStats,
+) -> Tuple[List[float], List[float]]:
+    expected = _categorical_counts(baseline)
+    actual = _categorical_counts(current)
+    # A side is complete when its listed values cover all of its non-null rows.
+    expected_complete = expected.get(_OTHER, 0.0) < 1e-9
+    actual_complete = actual.get(_OTHER, 0.0) < 1e-9
+    keys = [_OTHER]
+    for key in expected.keys() | actual.keys():
+        if key is _OTHER:
+            continue
+        if (key in expected or actual_complete) and (key in actual or expected_complete):
+            keys.append(key)
+        else:
+            # Listed on one side only, and the other side may hold it among its unlisted values.
+            expected[_OTHER] = expected.get(_OTHER, 0.0) + expected.pop(key, 0.0)
+            actual[_OTHER] = actual.get(_OTHER, 0.0) + actual.pop(key, 0.0)
+    return [expected.get(key, 0.0) for key in keys], [actual.get(key, 0.0) for key in keys]
+
+
+class DriftDetector:
+    """Compares snapshots field by field and flags distributions that moved.
+
+    A field is flagged when its PSI, KS gap or Jensen-Shannon divergence
+    reaches the corresponding threshold.
+    """
+
+    def __init__(
+        self,
+        *,
+        psi_threshold: float = 0.2,
+        ks_threshold: float = 0.1,
+        js_threshold: float = 0.1,
+    ) -> None:
+        self.psi_threshold = psi_threshold
+        self.ks_threshold = ks_threshold
+        self.js_threshold = js_threshold
+
+    def compare(self, baseline: ProfilingSnapshot, current: ProfilingSnapshot) -> SnapshotDrift:
+        """Drift for every field present in both snapshots."""
+        fields: Dict[str, FieldDrift] = {}
+        for field_name, stats in current.field_stats.items():
+            baseline_stats = baseline.field_stats.get(field_name)
+            if baseline_stats is None:
+                continue
+            drift = self.compare_field(baseline_stats, stats)
+            if drift is not None:
+                fields[field_name] = drift
+        return SnapshotDrift(baseline_snapshot_id=baseline.snapshot_id, fields=fields)
+
+    def compare_field(self, baseline: ProfilingFieldStats, current: ProfilingFieldStats) -> Optional[FieldDrift]:
+        """Drift of one field, or None when the stored summaries are not comparable."""
+        baseline_kind = baseline.distribution.kind if baseline.distribution else None
+        current_kind = current.distribution.kind if current.distribution else None
+        ks: Optional[float] = None
+        if baseline_kind == current_kind == "numeric":
+            kind = "numeric"
+            expected, actual = _numeric_proportions(baseline.distribution.buckets, current.distribution.buckets)
+            ks = self._ks(expected, actual)
+        elif "numeric" not in (baseline_kind, current_kind) and (
+            baseline.non_null and current.non_null
+        ):
+            kind = "categorical"
+            expected, actual = _categorical_proportions(baseline, current)
+        else:
+            return None
+
+        psi = population_stability_index(expected, actual)
+        js_divergence = jensen_shannon(expected, actual)
+        drifted = (
+            psi >= self.psi_threshold
+            or js_divergence >= self.js_threshold
+            or (ks is not None and ks >= self.ks_threshold)
+        )
+        return FieldDrift(
+            kind=kind,
+            psi=round(psi, 6),
+            ks=round(ks, 6) if ks is not None else None,
+            js_divergence=round(js_divergence, 6),
+            null_ratio_delta=round(current.null_ratio - baseline.null_ratio, 6),
+            drifted=drifted,
+        )
+
+    def warnings(self, drift: SnapshotDrift) -> List[str]:
+        """Operator-facing warnings for drifted fields."""
+        messages: List[str] = []
+        for field_name in drift.drifted_fields:
+            field_drift = drift.fields[field_name]
+            detail = f"PSI {field_drift.psi:.3f}, JS {field_drift.js_divergence:.3f}"
+            if field_drift.ks is not None:
+                detail += f", KS {field_drift.ks:.3f}"
+            messages.append(
+                f"Field '{field_name}' drifted from snapshot '{drift.baseline_snapshot_id}' ({detail})."
+            )
+        return messages
+
+    def _ks(self, expected: List[float], actual: List[float]) -> float:
+        gap = 0.0
+        baseline_cdf = current_cdf = 0.0
+        for baseline, current in zip(expected, actual):
+            baseline_cdf += baseline
+            current_cdf += current
+            gap = max(gap, abs(current_cdf - baseline_cdf))
+        return gap
@@ -0,0 +1,346 @@
+"""Rolling history of profiling metrics used to derive dynamic thresholds.
+
+Each (tenant, dataset_type, field, metric) key keeps incrementally maintained
+aggregates over the last N runs: an EWMA, a rolling mean/stddev (Welford with
+removal) and rolling min/max (monotonic queues). Recording a snapshot and
+deriving thresholds are O(1) per field metric, so no past snapshot needs to be
+re-read.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from ..models.profiling_snapshot import ProfilingSnapshot
+
+if TYPE_CHECKING:  # pragma: no cover - persistence and contracts are optional
+    from dq_contracts.models import ProfilingExpectation
+    from dq_stores.base import Store
+
+HistoryKey = Tuple[str, str, str, str]
+FieldKey = Tuple[str, str, str]
+
+# Store key suffix (in the metric position) for a field's expected metrics.
+_EXPECTED_METRICS = "__expected__"
+
+DEFAULT_HISTORY_METRICS = ("null_ratio", "distinct_ratio", "mean", "stddev", "min", "max", "p50", "p95")
+
+
+class MetricSeries:
+    """Rolling aggregates for one metric of one field."""
+
+    __slots__ = ("window", "alpha", "runs", "ewma", "last_value", "_values", "_mean", "_m2", "_index", "_min", "_max")
+
+    def __init__(self, window: int = 30, alpha: float = 0.3) -> None:
+        if window < 1:
+            raise ValueError("window must be positive")
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        self.window = window
+        self.alpha = alpha
+        self.runs = 0
+        self.ewma: float | None = None
+        self.last_value: float | None = None
+        self._values: Deque[float] = deque()
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._index = 0
+        # Monotonic queues of (run index, value) for rolling min/max.
+        self._min: Deque[Tuple[int, float]] = deque()
+        self._max: Deque[Tuple[int, float]] = deque()
+
+    def add(self, value: float) -> None:
+        self.runs += 1
+        self.last_value = value
+        self.ewma = value if self.ewma is None else self.alpha * value + (1 - self.alpha) * self.ewma
+
+        if len(self._values) == self.window:
+            self._remove(self._values.popleft())
+        self._values.append(value)
+        delta = value - self._mean
+        self._mean += delta / len(self._values)
+        self._m2 += delta * (value - self._mean)
+
+        index = self._index
+        self._index += 1
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((index, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((index, value))
+        oldest = self._index - len(self._values)
+        while self._min[0][0] < oldest:
+            self._min.popleft()
+        while self._max[0][0] < oldest:
+            self._max.popleft()
+
+    def _remove(self, value: float) -> None:
+        count = len(self._values)
+        if count == 0:
+            self._mean = self._m2 = 0.0
+            return
+        delta = value - self._mean
+        self._mean -= delta / count
+        self._m2 -= delta * (value - self._mean)
+
+    @property
+    def count(self) -> int:
+        return len(self._values)
+
+    @property
+    def mean(self) -> float | None:
+        return self._mean if self._values else None
+
+    @property
+    def stddev(self) -> float | None:
+        if not self._values:
+            return None
+        variance = self._m2 / len(self._values)
+        return math.sqrt(variance) if variance > 0 else 0.0
+
+    @property
+    def min_value(self) -> float | None:
+        return self._min[0][1] if self._min else None
+
+    @property
+    def max_value(self) -> float | None:
+        return self._max[0][1] if self._max else None
+
+    def thresholds(self, sigmas: float = 3.0) -> Dict[str, Any]:
+        """Bounds derived from the rolling window; constant time."""
+        mean = self.mean
+        stddev = self.stddev
+        if mean is None or stddev is None:
+            return {}
+        return {
+            "lower": mean - sigmas * stddev,
+            "upper": mean + sigmas * stddev,
+            "mean": mean,
+            "stddev": stddev,
+            "ewma": self.ewma,
+            "rolling_min": self.min_value,
+            "rolling_max": self.max_value,
+            "runs": self.count,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "window": self.window,
+            "alpha": self.alpha,
+            "runs": self.runs,
+            "ewma": self.ewma,
+            "values": list(self._values),
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "MetricSeries":
+        series = cls(payload["window"], payload["alpha"])
+        for value in payload["values"]:
+            series.add(value)
+        series.runs = payload["runs"]
+        series.ewma = payload["ewma"]
+        return series
+
+
+@dataclass
+class ToleranceCheck:
+    """Outcome of comparing a metric against the previous run.
+
+    `within_tolerance` is None when there is nothing to compare (no previous
+    value, or the metric is unavailable); such checks are skipped, not passed.
+    """
+
+    field_name: str
+    metric: str
+    previous: Optional[float]
+    current: Optional[float]
+    change_pct: Optional[float]
+    tolerance_pct: float
+    within_tolerance: Optional[bool]
+
+    @property
+    def skipped(self) -> bool:
+        return self.within_tolerance is None
+
+
+class ProfilingHistoryStore:
+    """Per-tenant metric history keyed by (tenant, dataset_type, field, metric).
+
+    When a `Store` is supplied, series are written through as JSON payloads
+    and loaded lazily, so history survives restarts and is shared by workers.
+    The metrics contract expectations compare are persisted the same way, so
+    a new process keeps recording them without being handed the expectations.
+    """
+
+    def __init__(
+        self,
+        *,
+        window: int = 30,
+        alpha: float = 0.3,
+        metrics: Iterable[str] = DEFAULT_HISTORY_METRICS,
+        store: "Optional[Store[str, Dict[str, Any]]]" = None,
+    ) -> None:
+        self._window = window
+        self._alpha = alpha
+        self._metrics = tuple(metrics)
+        self._store = store
+        self._series: Dict[HistoryKey, MetricSeries] = {}
+        # Metrics outside `metrics` that contract expectations compare, per
+        # (tenant, dataset_type, field); recorded alongside the defaults.
+        self._expected: Dict[FieldKey, Tuple[str, ...]] = {}
+
+    def get(self, tenant_id: str, dataset_type: str, field_name: str, metric: str) -> Optional[MetricSeries]:
+        key = (tenant_id, dataset_type, field_name, metric)
+        series = self._series.get(key)
+        if series is None and self._store is not None:
+            payload = self._store.get(self._store_key(key))
+            if payload is not None:
+                series = self._series[key] = MetricSeries.from_dict(payload)
+        return series
+
+    def record(
+        self,
+        snapshot: ProfilingSnapshot,
+        expectations: Optional[Mapping[str, Iterable["ProfilingExpectation"]]] = None,
+    ) -> None:
+        """Fold a snapshot's metrics into the rolling aggregates.
+
+        Besides the configured metrics, every metric named by `expectations`
+        (or by an earlier `check_change_tolerance` call, in this process or,
+        with a `Store`, any other) is recorded, so the next tolerance check
+        has a previous value to compare against.
+        """
+        if expectations is not None:
+            self._track_expectations(snapshot, expectations)
+        for field_name, stats in snapshot.field_stats.items():
+            extra = self._expected_metrics((snapshot.tenant_id, snapshot.dataset_type, field_name))
+            for metric in dict.fromkeys((*self._metrics, *extra)):
+                value = stats.get_metric(metric)
+                if value is None or not math.isfinite(value):
+                    continue
+                key = (snapshot.tenant_id, snapshot.dataset_type, field_name, metric)
+                series = self.get(*key)
+                if series is None:
+                    series = self._series[key] = MetricSeries(self._window, self._alpha)
+                series.add(float(value))
+                if self._store is not None:
+                    self._store.put(self._store_key(key), series.to_dict())
+
+    def derive_thresholds(self, snapshot: ProfilingSnapshot, sigmas: float = 3.0) -> Dict[str, Dict[str, Any]]:
+        """Thresholds per field and metric from history recorded before this snapshot."""
+        thresholds: Dict[str, Dict[str, Any]] = {}
+        for field_name in snapshot.field_stats:
+            field_thresholds = {}
+            for metric in self._metrics:
+                series = self.get(snapshot.tenant_id, snapshot.dataset_type, field_name, metric)
+                if series is not None and series.count:
+                    field_thresholds[metric] = series.thresholds(sigmas)
+            if field_thresholds:
+                thresholds[field_name] = field_thresholds
+        return thresholds
+
+    def apply_thresholds(self, snapshot: ProfilingSnapshot, sigmas: float = 3.0) -> ProfilingSnapshot:
+        """Return a copy of `snapshot` with derived thresholds on each field."""
+        derived = self.derive_thresholds(snapshot, sigmas)
+        if not derived:
+            return snapshot
+        field_stats = dict(snapshot.field_stats)
+        for field_name, metric_thresholds in derived.items():
+            stats = field_stats[field_name]
+            field_stats[field_name] = stats.copy(update={"thresholds": {**metric_thresholds, **stats.thresholds}})
+        return snapshot.copy(update={"field_stats": field_stats})
+
+    def check_change_tolerance(
+        self,
+        snapshot: ProfilingSnapshot,
+        expectations: Mapping[str, Iterable["ProfilingExpectation"]],
+    ) -> List[ToleranceCheck]:
+        """Compare metrics against the previous run for expectations with `change_tolerance_pct`.
+
+        `expectations` maps field names to `ColumnContract.profiling_expectations`.
+        Call before `record` so the previous run is still the latest value;
+        the metrics checked here are then recorded by `record`. Checks without
+        a previous or current value are reported as skipped.
+        """
+        self._track_expectations(snapshot, expectations)
+        checks: List[ToleranceCheck] = []
+        for field_name, field_expectations in expectations.items():
+            stats = snapshot.field_stats.get(field_name)
+            if stats is None:
+                continue
+            for expectation in field_expectations:
+                if expectation.change_tolerance_pct is None:
+                    continue
+                metric = _metric_name(expectation.metric)
+                series = self.get(snapshot.tenant_id, snapshot.dataset_type, field_name, metric)
+                previous = series.last_value if series is not None else None
+                current = stats.get_metric(metric)
+                change_pct = self._change_pct(previous, current)
+                checks.append(
+                    ToleranceCheck(
+                        field_name=field_name,
+                        metric=metric,
+                        previous=previous,
+                        current=current,
+                        change_pct=change_pct,
+                        tolerance_pct=expectation.change_tolerance_pct,
+                        within_tolerance=None if change_pct is None else change_pct <= expectation.change_tolerance_pct,
+                    )
+                )
+        return checks
+
+    def _track_expectations(
+        self,
+        snapshot: ProfilingSnapshot,
+        expectations: Mapping[str, Iterable["ProfilingExpectation"]],
+    ) -> None:
+        for field_name, field_expectations in expectations.items():
+            key = (snapshot.tenant_id, snapshot.dataset_type, field_name)
+            known = self._expected_metrics(key)
+            metrics = [_metric_name(expectation.metric) for expectation in field_expectations]
+            merged = tuple(dict.fromkeys((*known, *metrics)))
+            if merged == known:
+                continue
+            self._expected[key] = merged
+            if self._store is not None:
+                self._store.put(self._store_key((*key, _EXPECTED_METRICS)), {"metrics": list(merged)})
+
+    def _expected_metrics(self, key: FieldKey) -> Tuple[str, ...]:
+        metrics = self._expected.get(key)
+        if metrics is None:
+            metrics = ()
+            if self._store is not None:
+                payload = self._store.get(self._store_key((*key, _EXPECTED_METRICS)))
+                if payload is not None:
+                    metrics = tuple(payload["metrics"])
+            self._expected[key] = metrics
+        return metrics
+
+    def _change_pct(self, previous: float | None, current: float | None) -> float | None:
+        if previous is None or current is None:
+            return None
+        if previous == 0:
+            return 0.0 if current == 0 else math.inf
+        return abs(current - previous) / abs(previous) * 100
+
+    def _store_key(self, key: HistoryKey) -> str:
+        return "|".join(key)
+
+
+def _metric_name(metric: str) -> str:
+    """Normalise as `ProfilingFieldStats.get_metric` does, so series keys match."""
+    return metric.strip().lower()
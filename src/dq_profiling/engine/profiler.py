@@ -1,26 +1,69 @@
 from __future__ import annotations
 
-from collections import Counter
-from typing import Any, Dict, Iterable, List, MutableMapping
-
-from ..models.profiling_job import ProfilingJob, ProfilingJobResult, ProfilingJobStatus
+import hashlib
+import json
+import math
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from ..models.profiling_job import (
+    ProfilingJob,
+    ProfilingJobResult,
+    ProfilingJobStatus,
+    ProfilingSampling,
+    ProfilingSpec,
+)
 from ..models.profiling_snapshot import (
     DistributionBucket,
     DistributionSummary,
+    DistributionTail,
     ProfilingFieldStats,
     ProfilingSnapshot,
+    SamplingSummary,
     ValueFrequency,
 )
+from ..models.profiling_state import (
+    PROFILING_STATE_VERSION,
+    ProfilingState,
+    ProfilingStateMismatchError,
+)
+from .accumulators import (
+    AccumulatorConfig,
+    ExactFieldAccumulator,
+    FieldAccumulator,
+    NullCountAccumulator,
+    SketchFieldAccumulator,
+    accumulate_rows,
+)
+from .cross_column import CrossColumnScanner
+from .drift import DriftDetector
+from .result_cache import ProfilingResultCache
+from .sampling import (
+    BernoulliSampler,
+    ReservoirSampler,
+    estimate_distinct,
+    mean_interval,
+    wilson_interval,
+)
+from .sketches import HyperLogLog, KLLSketch, MisraGries, StreamingHistogram
+from .type_inference import TEMPORAL_TYPES, parse_rates
+
 try:
     from dq_engine.base import ExecutionEngine
-    from dq_engine.pandas_engine import PandasExecutionEngine
+    from dq_engine.pandas_engine import PandasDatasetHandle, PandasExecutionEngine
 except Exception:  # pragma: no cover - optional dependency
     ExecutionEngine = None  # type: ignore
+    PandasDatasetHandle = None  # type: ignore
     PandasExecutionEngine = None  # type: ignore
 
 DatasetRow = Dict[str, Any]
 Dataset = Iterable[DatasetRow]
 
+PROFILING_MODES = ("exact", "sketch")
+DEFAULT_QUANTILES = (0.01, 0.5, 0.95, 0.99)
+
 
 class ProfilingEngine:
     """Produces profiling snapshots that feed validation contexts."""
@@ -31,67 +74,210 @@ class ProfilingEngine:
         top_frequencies: int = 5,
         histogram_buckets: int = 5,
         execution_engine: "ExecutionEngine | None" = None,
+        *,
+        mode: str = "exact",
+        hll_precision: int = 12,
+        frequency_capacity: int = 64,
+        quantile_sketch_k: int = 200,
+        histogram_bins: int = 64,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+        workers: int = 1,
+        partition_rows: int = 50_000,
+        categorical_distinct_limit: int = 1_000,
+        categorical_top_k: int = 20,
+        result_cache: "ProfilingResultCache | None" = None,
+        drift_detector: DriftDetector | None = None,
     ) -> None:
+        if mode not in PROFILING_MODES:
+            raise ValueError(f"mode must be one of {PROFILING_MODES}")
         self._sample_size = sample_size
         self._top_frequencies = top_frequencies
         self._histogram_buckets = histogram_buckets
-        # TODO: delegate profiling to execution engine when dataset handles are
-        # available. Keep in-memory iterable-based implementation for now.
+        # Sketch mode swaps the unbounded value list/Counter for fixed-size
+        # sketches so per-field memory does not grow with the row count.
+        self._mode = mode
+        self._hll_precision = hll_precision
+        self._frequency_capacity = max(frequency_capacity, top_frequencies)
+        self._quantile_sketch_k = quantile_sketch_k
+        self._histogram_bins = histogram_bins
+        self._quantiles = tuple(quantiles)
+        self._accumulator_config = AccumulatorConfig(
+            mode,
+            sample_size,
+            hll_precision=hll_precision,
+            frequency_capacity=self._frequency_capacity,
+            quantile_sketch_k=quantile_sketch_k,
+            histogram_bins=histogram_bins,
+        )
+        # Categorical fields above the distinct limit (IDs, invoice numbers)
+        # keep only their top-k values plus a long-tail summary so snapshot
+        # size stays bounded.
+        self._categorical_distinct_limit = max(1, categorical_distinct_limit)
+        self._categorical_top_k = max(1, categorical_top_k)
+        # Partitions are profiled independently and their accumulators merged,
+        # so the merged snapshot matches a serial run in exact mode.
+        self._workers = max(1, workers)
+        self._partition_rows = max(1, partition_rows)
+        # DataFrame handles are profiled column-wise by the execution engine;
+        # plain iterables keep the in-memory row-based implementation.
         self.execution_engine = execution_engine or (PandasExecutionEngine() if PandasExecutionEngine else None)
+        # Jobs that carry a dataset checksum are served from the cache when the
+        # same bytes were already profiled under the same configuration.
+        self.result_cache = result_cache
+        self.drift_detector = drift_detector or DriftDetector()
+
+    @property
+    def config_fingerprint(self) -> str:
+        """Stable hash of the settings that shape accumulator state."""
+        config = {
+            "state_version": PROFILING_STATE_VERSION,
+            "mode": self._mode,
+            "sample_size": self._sample_size,
+            "top_frequencies": self._top_frequencies,
+            "histogram_buckets": self._histogram_buckets,
+        }
+        if self._mode == "sketch":
+            config.update(
+                hll_precision=self._hll_precision,
+                frequency_capacity=self._frequency_capacity,
+                quantile_sketch_k=self._quantile_sketch_k,
+                histogram_bins=self._histogram_bins,
+            )
+        return hashlib.sha256(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _result_fingerprint(self) -> str:
+        """Config fingerprint extended with settings that only shape the output."""
+        settings = {
+            "config": self.config_fingerprint,
+            "quantiles": self._quantiles,
+            "categorical_distinct_limit": self._categorical_distinct_limit,
+            "categorical_top_k": self._categorical_top_k,
+        }
+        return hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()
 
-    def profile(self, job: ProfilingJob, dataset: Dataset) -> ProfilingJobResult:
-        """Profile the dataset and return a structured result."""
-        record_count = 0
-        aggregates: Dict[str, MutableMapping[str, Any]] = {}
-
-        for row in dataset:
-            record_count += 1
-            for field_name, value in row.items():
-                accumulator = aggregates.setdefault(
-                    field_name,
-                    {
-                        "non_null": 0,
-                        "nulls": 0,
-                        "sample_values": [],
-                        "value_counts": Counter(),
-                        "numeric_values": [],
-                        "numeric_sum": 0.0,
-                        "numeric_sum_sq": 0.0,
-                        "numeric_min": None,
-                        "numeric_max": None,
-                    },
-                )
-                if self._is_null(value):
-                    accumulator["nulls"] += 1
-                    continue
-
-                accumulator["non_null"] += 1
-                accumulator["value_counts"][value] += 1
-
-                if len(accumulator["sample_values"]) < self._sample_size:
-                    accumulator["sample_values"].append(value)
-
-                if self._is_numeric(value):
-                    numeric_value = float(value)
-                    accumulator["numeric_values"].append(numeric_value)
-                    accumulator["numeric_sum"] += numeric_value
-                    accumulator["numeric_sum_sq"] += numeric_value ** 2
-                    accumulator["numeric_min"] = self._update_min(
-                        accumulator["numeric_min"],
-                        numeric_value,
-                    )
-                    accumulator["numeric_max"] = self._update_max(
-                        accumulator["numeric_max"],
-                        numeric_value,
-                    )
+    def is_state_compatible(self, state: ProfilingState) -> bool:
+        """Whether `state` can be resumed; callers re-profile everything when False."""
+        return (
+            state.state_version == PROFILING_STATE_VERSION
+            and state.config_fingerprint == self.config_fingerprint
+        )
 
-        field_stats = {
-            field_name: self._build_field_stats(
-                field_name=field_name,
-                accumulator=accumulator,
+    def profile(
+        self,
+        job: ProfilingJob,
+        dataset: "Dataset | PandasDatasetHandle",
+        previous_state: ProfilingState | None = None,
+        baseline: ProfilingSnapshot | None = None,
+    ) -> ProfilingJobResult:
+        """Profile the dataset and return a structured result.
+
+        When `previous_state` is supplied, `dataset` must contain only the rows
+        appended since that state was saved. When `job.sampling` is set, field
+        stats describe the sample and carry confidence intervals. When
+        `job.spec` is set, only its fields get full statistics. When
+        `job.cross_column` is set, key candidates and functional dependencies
+        are estimated over every row in the same scan. When
+        `baseline` is supplied, the snapshot records drift against it.
+        """
+        if previous_state is not None and not self.is_state_compatible(previous_state):
+            raise ProfilingStateMismatchError(
+                f"profiling state for snapshot '{previous_state.snapshot_id}' was produced with a "
+                "different engine configuration; re-profile the full dataset"
+            )
+        spec = job.spec
+        if previous_state is not None and previous_state.profiling_spec != (spec.dict() if spec else None):
+            raise ProfilingStateMismatchError(
+                f"profiling state for snapshot '{previous_state.snapshot_id}' was produced with a "
+                "different profiling spec; re-profile the full dataset"
             )
-            for field_name, accumulator in aggregates.items()
-        }
+
+        sampling = job.sampling
+        if sampling is not None and (job.incremental or previous_state is not None):
+            raise ValueError("sampled profiling cannot be combined with incremental state")
+        if job.cross_column is not None and (job.incremental or previous_state is not None):
+            raise ValueError("cross-column profiling needs every row and cannot be combined with incremental state")
+
+        cache_key: str | None = None
+        if self.result_cache is not None and not job.incremental and previous_state is None:
+            cache_key = self.result_cache.key_for(job, self._result_fingerprint())
+            cached = self.result_cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                return self._with_drift(cached.copy(update={"job_id": job.job_id}), baseline)
+
+        state: ProfilingState | None = None
+        sampling_summary: SamplingSummary | None = None
+        singletons: Dict[str, int] = {}
+        scanner: CrossColumnScanner | None = None
+        if PandasDatasetHandle is not None and isinstance(dataset, PandasDatasetHandle):
+            if job.incremental or previous_state is not None:
+                raise ValueError("incremental profiling requires row iterables, not DataFrame handles")
+            if job.cross_column is not None:
+                scanner = CrossColumnScanner((), job.cross_column, spec.fields if spec else None)
+                scanner.scan_tuples(list(dataset.df.columns), dataset.df.itertuples(index=False, name=None))
+            if sampling is not None:
+                population = len(dataset.df)
+                dataset = self._sample_dataframe(dataset, sampling)
+                sampling_summary = self._sampling_summary(sampling, len(dataset.df), population)
+                singletons = self._dataframe_singletons(dataset, spec)
+            record_count, field_stats = self._profile_dataframe(dataset, spec)
+        else:
+            if job.cross_column is not None:
+                # Wraps the full dataset so keys are judged on every row, not the sample.
+                scanner = CrossColumnScanner(dataset, job.cross_column, spec.fields if spec else None)
+                dataset = scanner
+            sampler: BernoulliSampler | ReservoirSampler | None = None
+            if sampling is not None:
+                sampler = (
+                    BernoulliSampler(dataset, sampling.rate, sampling.seed)
+                    if sampling.method == "bernoulli"
+                    else ReservoirSampler(dataset, sampling.size, sampling.seed)
+                )
+                dataset = sampler
+            if self._workers > 1:
+                record_count, aggregates = self._accumulate_parallel(dataset, spec)
+            else:
+                record_count, aggregates = self._accumulate(dataset, spec)
+            if previous_state is not None:
+                resumed = {
+                    field_name: self._restore_accumulator(payload)
+                    for field_name, payload in previous_state.fields.items()
+                }
+                self._merge_aggregates(resumed, aggregates)
+                aggregates = resumed
+                record_count += previous_state.record_count
+            if job.incremental or previous_state is not None:
+                state = ProfilingState(
+                    config_fingerprint=self.config_fingerprint,
+                    snapshot_id=f"profile-{job.job_id}",
+                    record_count=record_count,
+                    profiling_spec=spec.dict() if spec else None,
+                    fields={
+                        field_name: accumulator.to_dict()
+                        for field_name, accumulator in aggregates.items()
+                    },
+                )
+            field_stats = {
+                field_name: self._build_field_stats(
+                    field_name=field_name,
+                    accumulator=accumulator,
+                )
+                for field_name, accumulator in aggregates.items()
+            }
+            if sampler is not None:
+                sampling_summary = self._sampling_summary(sampling, sampler.sampled, sampler.population)
+                if self._mode == "exact":
+                    singletons = {
+                        field_name: sum(1 for count in accumulator.value_counts.values() if count == 1)
+                        for field_name, accumulator in aggregates.items()
+                        if isinstance(accumulator, ExactFieldAccumulator)
+                    }
+
+        if sampling_summary is not None:
+            record_count = sampling_summary.population_rows
+            field_stats = {
+                field_name: self._with_confidence_intervals(stats, sampling_summary, singletons.get(field_name))
+                for field_name, stats in field_stats.items()
+            }
 
         snapshot = ProfilingSnapshot(
             snapshot_id=f"profile-{job.job_id}",
@@ -100,59 +286,344 @@ class ProfilingEngine:
             record_count=record_count,
             generated_from="cleansed" if job.metadata.get("input") == "cleansed" else "raw",
             field_stats=field_stats,
+            sampling=sampling_summary,
+            cross_column=scanner.result() if scanner is not None else None,
         )
 
-        return ProfilingJobResult(
+        result = ProfilingJobResult(
             job_id=job.job_id,
             status=ProfilingJobStatus.SUCCEEDED,
             profiling_context_id=snapshot.snapshot_id,
             snapshot=snapshot,
             warnings=self._build_warnings(snapshot),
+            state=state,
+        )
+        if cache_key:
+            self.result_cache.put(cache_key, result)
+        return self._with_drift(result, baseline)
+
+    def _with_drift(self, result: ProfilingJobResult, baseline: ProfilingSnapshot | None) -> ProfilingJobResult:
+        """Attach drift against `baseline`; cached results stay baseline-free."""
+        if baseline is None:
+            return result
+        drift = self.drift_detector.compare(baseline, result.snapshot)
+        return result.copy(
+            update={
+                "snapshot": result.snapshot.copy(update={"drift": drift}),
+                "warnings": [*result.warnings, *self.drift_detector.warnings(drift)],
+            }
         )
 
+    def _profile_dataframe(
+        self,
+        handle: "PandasDatasetHandle",
+        spec: ProfilingSpec | None,
+    ) -> Tuple[int, Dict[str, ProfilingFieldStats]]:
+        """Delegate to the pandas engine's vectorised, exact column profiler."""
+        engine = (
+            self.execution_engine
+            if isinstance(self.execution_engine, PandasExecutionEngine)
+            else PandasExecutionEngine()
+        )
+        profile = engine.compute_profile(
+            handle,
+            {
+                "sample_size": self._sample_size,
+                "top_frequencies": self._top_frequencies,
+                "histogram_buckets": self._histogram_buckets,
+                "quantiles": self._quantiles,
+                "categorical_distinct_limit": self._categorical_distinct_limit,
+                "categorical_top_k": self._categorical_top_k,
+                "fields": spec.fields if spec else None,
+                "count_other_fields": spec.count_other_fields if spec else True,
+            },
+        )
+        field_stats = {
+            field_name: ProfilingFieldStats(**stats)
+            for field_name, stats in profile["field_stats"].items()
+        }
+        return profile["record_count"], field_stats
+
+    def _sample_dataframe(self, handle: "PandasDatasetHandle", sampling: ProfilingSampling) -> "PandasDatasetHandle":
+        """Sample DataFrame rows with the same semantics as the row samplers, keeping row order."""
+        import numpy as np
+
+        df = handle.df
+        rng = np.random.default_rng(sampling.seed)
+        if sampling.method == "bernoulli":
+            positions = np.flatnonzero(rng.random(len(df)) < sampling.rate)
+        else:
+            size = min(sampling.size, len(df))
+            positions = np.sort(rng.choice(len(df), size=size, replace=False))
+        return PandasDatasetHandle(df.iloc[positions])
+
+    def _dataframe_singletons(self, handle: "PandasDatasetHandle", spec: ProfilingSpec | None) -> Dict[str, int]:
+        """Count values seen exactly once per profiled column, ignoring nulls and empty strings."""
+        singletons: Dict[str, int] = {}
+        fields = set(spec.fields) if spec else None
+        for column in handle.df.columns:
+            if fields is not None and str(column) not in fields:
+                continue
+            series = handle.df[column]
+            present = series[series.notna() & (series != "")]
+            singletons[str(column)] = int((present.value_counts() == 1).sum())
+        return singletons
+
+    def _sampling_summary(self, sampling: ProfilingSampling, sampled: int, population: int) -> SamplingSummary:
+        return SamplingSummary(
+            method=sampling.method,
+            rate=round(sampled / population, 6) if population else 1.0,
+            sampled_rows=sampled,
+            population_rows=population,
+            confidence=sampling.confidence,
+            seed=sampling.seed,
+        )
+
+    def _with_confidence_intervals(
+        self,
+        stats: ProfilingFieldStats,
+        sampling: SamplingSummary,
+        singletons: int | None,
+    ) -> ProfilingFieldStats:
+        """Attach intervals to sample-based metrics and scale the distinct count to the population.
+
+        The distinct estimate needs exact per-value counts, so sketch-mode
+        snapshots keep the sample's distinct count without an interval.
+        """
+        fraction = sampling.sampled_rows / sampling.population_rows if sampling.population_rows else 1.0
+        intervals: Dict[str, Tuple[float, float]] = {
+            "null_ratio": wilson_interval(stats.nulls, stats.non_null + stats.nulls, sampling.confidence),
+        }
+        if stats.mean is not None and stats.stddev is not None:
+            # Numeric buckets cover every numeric value, so they give the count
+            # the moments were computed over.
+            numeric_count = stats.non_null
+            if stats.distribution is not None and stats.distribution.kind == "numeric":
+                numeric_count = sum(bucket.count for bucket in stats.distribution.buckets)
+            intervals["mean"] = mean_interval(stats.mean, stats.stddev, numeric_count, sampling.confidence, fraction)
+        distinct = stats.distinct
+        if singletons is not None:
+            distinct, intervals["distinct"] = estimate_distinct(stats.distinct, singletons, fraction)
+        return stats.copy(update={"distinct": distinct, "confidence_intervals": intervals})
+
+    def _accumulate(
+        self,
+        dataset: Dataset,
+        spec: ProfilingSpec | None = None,
+    ) -> Tuple[int, Dict[str, FieldAccumulator]]:
+        """Scan rows once and return the record count plus per-field accumulators."""
+        return accumulate_rows(dataset, self._accumulator_config, spec)
+
+    def _accumulate_parallel(
+        self,
+        dataset: Dataset,
+        spec: ProfilingSpec | None = None,
+    ) -> Tuple[int, Dict[str, FieldAccumulator]]:
+        """Profile fixed-size partitions on a process pool and merge them in order."""
+        record_count = 0
+        aggregates: Dict[str, FieldAccumulator] = {}
+        in_flight: Deque[Future] = deque()
+        max_in_flight = self._workers * 2
+
+        def collect(future: Future) -> None:
+            nonlocal record_count
+            partition_count, partition_aggregates = future.result()
+            record_count += partition_count
+            self._merge_aggregates(aggregates, partition_aggregates)
+
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+            for partition in self._partitions(dataset):
+                in_flight.append(executor.submit(accumulate_rows, partition, self._accumulator_config, spec))
+                # Bound the number of queued partitions so large inputs are
+                # never fully materialised in the parent process.
+                if len(in_flight) >= max_in_flight:
+                    collect(in_flight.popleft())
+            while in_flight:
+                collect(in_flight.popleft())
+
+        return record_count, aggregates
+
+    def _partitions(self, dataset: Dataset) -> Iterator[List[DatasetRow]]:
+        iterator = iter(dataset)
+        while True:
+            partition = list(islice(iterator, self._partition_rows))
+            if not partition:
+                return
+            yield partition
+
+    def _merge_aggregates(
+        self,
+        target: Dict[str, FieldAccumulator],
+        source: Dict[str, FieldAccumulator],
+    ) -> None:
+        """Fold a later partition's accumulators into `target`, preserving row order."""
+        for field_name, accumulator in source.items():
+            existing = target.get(field_name)
+            if existing is None:
+                target[field_name] = accumulator
+            else:
+                existing.merge(accumulator)
+
+    def _restore_accumulator(self, payload: Dict[str, Any]) -> FieldAccumulator:
+        return self._accumulator_config.restore(payload)
+
     def _build_field_stats(
         self,
         *,
         field_name: str,
-        accumulator: MutableMapping[str, Any],
+        accumulator: FieldAccumulator,
     ) -> ProfilingFieldStats:
-        non_null = accumulator["non_null"]
-        nulls = accumulator["nulls"]
+        if isinstance(accumulator, NullCountAccumulator):
+            return ProfilingFieldStats(
+                field_name=field_name,
+                non_null=accumulator.non_null,
+                nulls=accumulator.nulls,
+                count_only=True,
+            )
+        if self._mode == "sketch":
+            return self._build_sketch_field_stats(field_name=field_name, accumulator=accumulator)
+
+        non_null = accumulator.non_null
+        nulls = accumulator.nulls
         total_rows = non_null + nulls
-        distinct = len(accumulator["value_counts"])
+        distinct = len(accumulator.value_counts)
+        numeric_values = accumulator.effective_numbers()
+        min_value = accumulator.numeric_min
+        max_value = accumulator.numeric_max
 
         frequent_values = self._build_value_frequencies(
-            accumulator["value_counts"],
+            accumulator.value_counts,
             total_rows,
             limit=self._top_frequencies,
         )
         distribution = self._build_distribution(
-            accumulator["value_counts"],
-            accumulator["numeric_values"],
+            accumulator.value_counts,
+            numeric_values,
             total_rows,
+            min_value,
+            max_value,
         )
 
-        mean = None
-        stddev = None
-        if accumulator["numeric_values"] and non_null:
-            mean = accumulator["numeric_sum"] / non_null
-            variance = (accumulator["numeric_sum_sq"] / non_null) - (mean ** 2)
-            stddev = (variance if variance > 0 else 0) ** 0.5
+        mean, stddev = accumulator.moments(numeric_values)
+        quantiles: Dict[str, float] = {}
+        if numeric_values:
+            # No statistic depends on value order, so sort in place rather than copy.
+            numeric_values.sort()
+            quantiles = {
+                quantile_key(fraction): interpolated_quantile(numeric_values, fraction)
+                for fraction in self._quantiles
+            }
 
         return ProfilingFieldStats(
             field_name=field_name,
             non_null=non_null,
             nulls=nulls,
             distinct=distinct,
-            sample_values=list(accumulator["sample_values"]),
-            min_value=accumulator["numeric_min"],
-            max_value=accumulator["numeric_max"],
+            sample_values=list(accumulator.sample_values),
+            min_value=min_value,
+            max_value=max_value,
             mean=mean,
             stddev=stddev,
+            quantiles=quantiles,
             frequent_values=frequent_values,
             distribution=distribution,
+            **self._type_stats(accumulator),
         )
 
+    def _build_sketch_field_stats(
+        self,
+        *,
+        field_name: str,
+        accumulator: SketchFieldAccumulator,
+    ) -> ProfilingFieldStats:
+        non_null = accumulator.non_null
+        nulls = accumulator.nulls
+        total_rows = non_null + nulls
+        distinct_sketch: HyperLogLog = accumulator.distinct_sketch
+        frequency_sketch: MisraGries = accumulator.frequency_sketch
+        numeric = accumulator.effective_numeric()
+        quantile_sketch: KLLSketch = numeric.quantile_sketch
+        histogram_sketch: StreamingHistogram = numeric.histogram_sketch
+
+        top_values = frequency_sketch.most_common()
+        frequent_values = self._frequencies_from_pairs(top_values[: self._top_frequencies], total_rows)
+        # Estimated distinct counts can never be below the number of values the
+        # heavy-hitter summary still tracks exactly.
+        distinct = max(distinct_sketch.estimate(), len(frequency_sketch)) if non_null else 0
+
+        error_bounds: Dict[str, float] = {}
+        if non_null:
+            error_bounds["distinct"] = round(distinct_sketch.relative_error, 6)
+            error_bounds["frequent_values"] = round(frequency_sketch.max_error / total_rows, 6)
+
+        distribution: DistributionSummary | None = None
+        quantiles: Dict[str, float] = {}
+        if quantile_sketch.count:
+            distribution = DistributionSummary(
+                kind="numeric",
+                buckets=self._buckets_from_sketch(
+                    histogram_sketch,
+                    numeric.min_value,
+                    numeric.max_value,
+                    total_rows,
+                ),
+            )
+            error_bounds["distribution"] = round(histogram_sketch.max_bin_fraction, 6)
+            quantiles = {
+                quantile_key(fraction): quantile_sketch.quantile(fraction)
+                for fraction in self._quantiles
+            }
+            error_bounds["quantiles"] = round(quantile_sketch.rank_error, 6)
+        elif top_values:
+            listed = top_values
+            tail: DistributionTail | None = None
+            if distinct > self._categorical_distinct_limit:
+                listed = top_values[: self._categorical_top_k]
+                # Tracked counts are underestimates, so the tail row count is
+                # an upper bound; entropy and lengths need every value.
+                tail_count = max(0, non_null - sum(count for _, count in listed))
+                tail = DistributionTail(
+                    distinct=max(0, distinct - len(listed)),
+                    count=tail_count,
+                    percentage=self._percentage(tail_count, total_rows),
+                )
+            distribution = DistributionSummary(
+                kind="categorical",
+                values=self._frequencies_from_pairs(listed, total_rows),
+                tail=tail,
+            )
+
+        mean, stddev = numeric.moments()
+
+        return ProfilingFieldStats(
+            field_name=field_name,
+            non_null=non_null,
+            nulls=nulls,
+            distinct=distinct,
+            sample_values=list(accumulator.sample_values),
+            min_value=numeric.min_value,
+            max_value=numeric.max_value,
+            mean=mean,
+            stddev=stddev,
+            quantiles=quantiles,
+            frequent_values=frequent_values,
+            distribution=distribution,
+            **self._type_stats(accumulator),
+            approximate=bool(error_bounds),
+            error_bounds=error_bounds,
+        )
+
+    def _type_stats(self, accumulator: FieldAccumulator) -> Dict[str, Any]:
+        """Inferred type, per-type parse rates and temporal range for a field."""
+        type_name = accumulator.inferred_type
+        stats: Dict[str, Any] = {
+            "inferred_type": type_name,
+            "type_parse_rates": parse_rates(accumulator.type_masks, accumulator.non_null),
+        }
+        if type_name in TEMPORAL_TYPES:
+            stats.update(temporal_min=accumulator.temporal_min, temporal_max=accumulator.temporal_max)
+        return stats
+
     def _build_value_frequencies(
         self,
         counts: Counter,
@@ -160,14 +631,20 @@ class ProfilingEngine:
         *,
         limit: int | None = None,
     ) -> List[ValueFrequency]:
-        most_common = counts.most_common(limit)
+        return self._frequencies_from_pairs(counts.most_common(limit), total_rows)
+
+    def _frequencies_from_pairs(
+        self,
+        pairs: List[Tuple[Any, int]],
+        total_rows: int,
+    ) -> List[ValueFrequency]:
         return [
             ValueFrequency(
                 value=value,
                 count=count,
                 percentage=self._percentage(count, total_rows),
             )
-            for value, count in most_common
+            for value, count in pairs
         ]
 
     def _build_distribution(
@@ -175,25 +652,59 @@ class ProfilingEngine:
         counts: Counter,
         numeric_values: List[float],
         total_rows: int,
+        min_value: float | None,
+        max_value: float | None,
     ) -> DistributionSummary | None:
-        if numeric_values:
-            buckets = self._build_numeric_buckets(numeric_values, total_rows)
+        if numeric_values and min_value is not None and max_value is not None:
+            buckets = self._build_numeric_buckets(numeric_values, total_rows, min_value, max_value)
             return DistributionSummary(kind="numeric", buckets=buckets)
+        if counts and len(counts) > self._categorical_distinct_limit:
+            top = counts.most_common(self._categorical_top_k)
+            return DistributionSummary(
+                kind="categorical",
+                values=self._frequencies_from_pairs(top, total_rows),
+                tail=self._build_tail(counts, top, total_rows),
+            )
         if counts:
             values = self._build_value_frequencies(counts, total_rows, limit=None)
             return DistributionSummary(kind="categorical", values=values)
         return None
 
+    def _build_tail(
+        self,
+        counts: Counter,
+        top: List[Tuple[Any, int]],
+        total_rows: int,
+    ) -> DistributionTail:
+        """Summarise the values left out of a top-k categorical distribution."""
+        non_null = sum(counts.values())
+        listed = {value for value, _ in top}
+        lengths = [len(str(value)) for value in counts if value not in listed]
+        tail_count = non_null - sum(count for _, count in top)
+        entropy = -math.fsum(
+            count / non_null * math.log2(count / non_null) for count in counts.values()
+        )
+        return DistributionTail(
+            distinct=len(lengths),
+            count=tail_count,
+            percentage=self._percentage(tail_count, total_rows),
+            entropy=round(entropy, 6),
+            min_length=min(lengths) if lengths else None,
+            max_length=max(lengths) if lengths else None,
+            mean_length=round(sum(lengths) / len(lengths), 4) if lengths else None,
+        )
+
     def _build_numeric_buckets(
         self,
         values: List[float],
         total_rows: int,
+        min_value: float,
+        max_value: float,
     ) -> List[DistributionBucket]:
+        """Fill equal-width buckets in a single pass using the tracked min/max."""
         if not values:
             return []
 
-        min_value = min(values)
-        max_value = max(values)
         if min_value == max_value:
             return [
                 DistributionBucket(
@@ -234,27 +745,53 @@ class ProfilingEngine:
             if bucket["count"] > 0
         ]
 
+    def _buckets_from_sketch(
+        self,
+        sketch: StreamingHistogram,
+        min_value: float | None,
+        max_value: float | None,
+        total_rows: int,
+    ) -> List[DistributionBucket]:
+        """Equal-width buckets from the sketch's estimated rank at each bucket edge."""
+        if min_value is None or max_value is None:
+            return []
+        if min_value == max_value:
+            return [
+                DistributionBucket(
+                    start=min_value,
+                    end=max_value,
+                    count=sketch.count,
+                    percentage=self._percentage(sketch.count, total_rows),
+                )
+            ]
+
+        bucket_count = min(self._histogram_buckets, sketch.count)
+        width = (max_value - min_value) / bucket_count
+        edges = [min_value + index * width for index in range(bucket_count)] + [max_value]
+        ranks = [0] + [
+            min(sketch.count, int(round(sketch.rank(edge)))) for edge in edges[1:-1]
+        ] + [sketch.count]
+
+        buckets: List[DistributionBucket] = []
+        for index in range(bucket_count):
+            count = max(0, ranks[index + 1] - ranks[index])
+            if count == 0:
+                continue
+            buckets.append(
+                DistributionBucket(
+                    start=round(edges[index], 6),
+                    end=round(edges[index + 1], 6),
+                    count=count,
+                    percentage=self._percentage(count, total_rows),
+                )
+            )
+        return buckets
+
     def _percentage(self, count: int, total: int) -> float:
         if total == 0:
             return 0.0
         return round((count / total) * 100, 4)
 
-    def _is_null(self, value: Any) -> bool:
-        return value is None or value == ""
-
-    def _is_numeric(self, value: Any) -> bool:
-        return isinstance(value, (int, float)) and not isinstance(value, bool)
-
-    def _update_min(self, current: float | None, value: float) -> float:
-        if current is None or value < current:
-            return value
-        return current
-
-    def _update_max(self, current: float | None, value: float) -> float:
-        if current is None or value > current:
-            return value
-        return current
-
     def _build_warnings(self, snapshot: ProfilingSnapshot) -> List[str]:
         """Emit basic warnings to help operators inspect anomalies."""
         warnings: List[str] = []
@@ -263,4 +800,22 @@ class ProfilingEngine:
         for field_name, stats in snapshot.field_stats.items():
             if stats.nulls and stats.non_null == 0:
                 warnings.append(f"Field '{field_name}' is entirely null values.")
+        if snapshot.sampling is not None:
+            warnings.append(
+                f"Field stats describe a {snapshot.sampling.method} sample of "
+                f"{snapshot.sampling.sampled_rows} of {snapshot.sampling.population_rows} rows."
+            )
         return warnings
+
+
+def quantile_key(fraction: float) -> str:
+    """Metric key for a quantile fraction, e.g. 0.95 -> "p95", 0.999 -> "p99.9"."""
+    return f"p{round(fraction * 100, 6):g}"
+
+
+def interpolated_quantile(ordered: Sequence[float], fraction: float) -> float:
+    """Linear-interpolation quantile over already sorted values."""
+    position = fraction * (len(ordered) - 1)
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
@@ -0,0 +1,117 @@
+"""Checksum-keyed cache for profiling results.
+
+Re-submitted files and replayed job definitions often profile byte-identical
+batches. Results are cached under the dataset checksum (see
+`ValidationJobMetadata.checksum`), the engine configuration fingerprint and
+the contract version, so a hit can skip profiling entirely.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from ..models.profiling_job import ProfilingJob, ProfilingJobResult
+
+if TYPE_CHECKING:  # pragma: no cover - persistence is optional
+    from dq_stores.base import Store
+
+
+@dataclass
+class ProfilingCacheStats:
+    """Counters exposed for monitoring cache effectiveness."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    store_hits: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "hit_ratio": round(self.hit_ratio, 4)}
+
+
+class ProfilingResultCache:
+    """Size-bounded LRU cache of `ProfilingJobResult` objects.
+
+    When a `Store` is supplied, entries are written through as JSON payloads
+    and read back on in-memory misses, so the cache survives restarts and can
+    be shared between workers.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        store: "Optional[Store[str, Dict[str, Any]]]" = None,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self._max_entries = max_entries
+        self._store = store
+        self._entries: "OrderedDict[str, ProfilingJobResult]" = OrderedDict()
+        self.stats = ProfilingCacheStats()
+
+    @staticmethod
+    def key_for(job: ProfilingJob, config_fingerprint: str) -> Optional[str]:
+        """Cache key for a job, or None when the job carries no dataset checksum."""
+        if not job.dataset_checksum:
+            return None
+        components = {
+            "tenant_id": job.tenant_id,
+            "dataset_type": job.dataset_type,
+            "checksum": job.dataset_checksum,
+            "config_fingerprint": config_fingerprint,
+            "contract_version": job.contract_version,
+            "sampling": job.sampling.dict() if job.sampling else None,
+            "spec": job.spec.dict() if job.spec else None,
+            "cross_column": job.cross_column.dict() if job.cross_column else None,
+            "input": job.metadata.get("input"),
+        }
+        return hashlib.sha256(json.dumps(components, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[ProfilingJobResult]:
+        result = self._entries.get(key)
+        if result is not None:
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return result
+        if self._store is not None:
+            payload = self._store.get(key)
+            if payload is not None:
+                result = ProfilingJobResult.parse_obj(payload)
+                self._remember(key, result)
+                self.stats.hits += 1
+                self.stats.store_hits += 1
+                return result
+        self.stats.misses += 1
+        return None
+
+    def put(self, key: str, result: ProfilingJobResult) -> None:
+        self._remember(key, result)
+        if self._store is not None:
+            self._store.put(key, json.loads(result.json()))
+
+    def invalidate(self, key: str) -> None:
+        self._entries.pop(key, None)
+        if self._store is not None:
+            self._store.delete(key)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def _remember(self, key: str, result: ProfilingJobResult) -> None:
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
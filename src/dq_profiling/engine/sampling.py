@@ -0,0 +1,145 @@
+"""Row samplers and confidence-interval estimators for sampled profiling.
+
+Samplers wrap a row iterable, yield the sampled rows, and count the full
+population as a side effect so snapshots can report the effective rate.
+Both samplers skip rows in bulk (geometric skips for Bernoulli sampling,
+Algorithm L for reservoirs) so unsampled rows cost almost nothing.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from collections import deque
+from itertools import islice
+from statistics import NormalDist
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+Row = Dict[str, Any]
+
+
+class BernoulliSampler:
+    """Keep each row independently with probability `rate`."""
+
+    def __init__(self, rows: Iterable[Row], rate: float, seed: Optional[int] = None) -> None:
+        if not 0 < rate <= 1:
+            raise ValueError("rate must be in (0, 1]")
+        self._rows = rows
+        self._rate = rate
+        self._rng = random.Random(seed)
+        self.population = 0
+        self.sampled = 0
+
+    def __iter__(self) -> Iterator[Row]:
+        enumerated = enumerate(self._rows)
+        if self._rate == 1:
+            for index, row in enumerated:
+                self.population = index + 1
+                self.sampled += 1
+                yield row
+            return
+
+        log_keep = math.log(1 - self._rate)
+        while True:
+            # Number of rejected rows before the next accepted one is geometric.
+            skip = int(math.log(1 - self._rng.random()) / log_keep)
+            if skip:
+                skipped = deque(islice(enumerated, skip), maxlen=1)
+                if skipped:
+                    self.population = skipped[0][0] + 1
+            item = next(enumerated, None)
+            if item is None:
+                return
+            self.population = item[0] + 1
+            self.sampled += 1
+            yield item[1]
+
+
+class ReservoirSampler:
+    """Uniform fixed-size sample without replacement (Li's Algorithm L)."""
+
+    def __init__(self, rows: Iterable[Row], size: int, seed: Optional[int] = None) -> None:
+        if size < 1:
+            raise ValueError("size must be positive")
+        self._rows = rows
+        self._size = size
+        self._rng = random.Random(seed)
+        self.population = 0
+        self.sampled = 0
+
+    def __iter__(self) -> Iterator[Row]:
+        reservoir = self._fill()
+        self.sampled = len(reservoir)
+        return iter(reservoir)
+
+    def _fill(self) -> List[Row]:
+        enumerated = enumerate(self._rows)
+        reservoir = [row for _, row in islice(enumerated, self._size)]
+        self.population = len(reservoir)
+        if len(reservoir) < self._size:
+            return reservoir
+
+        rng = self._rng
+        weight = math.exp(math.log(rng.random() or 1e-300) / self._size)
+        while True:
+            skip = int(math.log(rng.random() or 1e-300) / math.log(1 - weight))
+            if skip:
+                skipped = deque(islice(enumerated, skip), maxlen=1)
+                if skipped:
+                    self.population = skipped[0][0] + 1
+            item = next(enumerated, None)
+            if item is None:
+                return reservoir
+            self.population = item[0] + 1
+            reservoir[rng.randrange(self._size)] = item[1]
+            weight *= math.exp(math.log(rng.random() or 1e-300) / self._size)
+
+
+def z_score(confidence: float) -> float:
+    return NormalDist().inv_cdf((1 + confidence) / 2)
+
+
+def wilson_interval(successes: int, trials: int, confidence: float) -> Tuple[float, float]:
+    """Wilson score interval for a binomial proportion such as a null ratio."""
+    if trials == 0:
+        return (0.0, 1.0)
+    z = z_score(confidence)
+    ratio = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (ratio + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(ratio * (1 - ratio) / trials + z * z / (4 * trials * trials)) / denominator
+    return (max(0.0, centre - margin), min(1.0, centre + margin))
+
+
+def mean_interval(
+    mean: float,
+    stddev: float,
+    count: int,
+    confidence: float,
+    sampling_fraction: float,
+) -> Tuple[float, float]:
+    """Normal-approximation interval with a finite population correction."""
+    if count < 2:
+        return (mean, mean)
+    standard_error = stddev / math.sqrt(count - 1) * math.sqrt(max(0.0, 1 - sampling_fraction))
+    margin = z_score(confidence) * standard_error
+    return (mean - margin, mean + margin)
+
+
+def estimate_distinct(
+    observed: int,
+    singletons: int,
+    sampling_fraction: float,
+) -> Tuple[int, Tuple[float, float]]:
+    """Guaranteed-Error Estimator (Charikar et al.) for population distinct counts.
+
+    Values seen once in the sample are scaled by sqrt(1/f); values seen more
+    often are assumed fully observed. The interval spans the observed count
+    (lower) to scaling every singleton by 1/f (upper).
+    """
+    if sampling_fraction >= 1 or observed == 0:
+        return observed, (float(observed), float(observed))
+    repeated = observed - singletons
+    estimate = repeated + singletons * math.sqrt(1 / sampling_fraction)
+    upper = repeated + singletons / sampling_fraction
+    return int(round(estimate)), (float(observed), float(upper))
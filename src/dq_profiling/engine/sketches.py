@@ -0,0 +1,368 @@
+"""Bounded-memory sketches used by the profiling engine in sketch mode.
+
+Each sketch keeps a fixed amount of state regardless of how many values are
+observed, so wide or very long datasets can be profiled within worker memory
+limits. Sketches expose the error bounds they guarantee so snapshots can flag
+approximate metrics for downstream consumers.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import math
+import random
+from typing import Any, Dict, Hashable, List, Tuple
+
+
+def stable_hash(value: Any) -> int:
+    """Return a 64-bit hash that is stable across processes and runs."""
+    digest = hashlib.blake2b(repr(value).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def _hashable(value: Any) -> Hashable:
+    """JSON round-trips turn tuples into lists; restore them as dict keys."""
+    if isinstance(value, list):
+        return tuple(_hashable(item) for item in value)
+    return value
+
+
+class HyperLogLog:
+    """HyperLogLog cardinality estimator with linear-counting correction."""
+
+    def __init__(self, precision: int = 12) -> None:
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.num_registers = 1 << precision
+        self.registers = bytearray(self.num_registers)
+        self._suffix_bits = 64 - precision
+        self._suffix_mask = (1 << self._suffix_bits) - 1
+
+    def add(self, value: Any) -> None:
+        self.add_hash(stable_hash(value))
+
+    def add_hash(self, hashed: int) -> None:
+        """Add a value that was already hashed with `stable_hash` (or a 64-bit mix of such hashes)."""
+        index = hashed >> self._suffix_bits
+        suffix = hashed & self._suffix_mask
+        rank = self._suffix_bits - suffix.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ValueError("cannot merge HyperLogLog sketches with different precision")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+    def estimate(self) -> int:
+        m = self.num_registers
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            raw = m * math.log(m / zeros)
+        return int(round(raw))
+
+    @property
+    def relative_error(self) -> float:
+        """Standard error of the estimate relative to the true cardinality."""
+        return 1.04 / math.sqrt(self.num_registers)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"precision": self.precision, "registers": self.registers.hex()}
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "HyperLogLog":
+        sketch = cls(payload["precision"])
+        sketch.registers = bytearray.fromhex(payload["registers"])
+        return sketch
+
+
+class MisraGries:
+    """Misra-Gries heavy-hitter summary with at most `capacity` counters.
+
+    Counts are underestimates; every count is within `max_error` of the true
+    frequency, where `max_error` never exceeds n / (capacity + 1).
+    """
+
+    def __init__(self, capacity: int = 64) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.counters: Dict[Hashable, int] = {}
+        self.total = 0
+        self.max_error = 0
+
+    def add(self, value: Hashable, count: int = 1) -> None:
+        self.total += count
+        counters = self.counters
+        if value in counters:
+            counters[value] += count
+            return
+        if len(counters) < self.capacity:
+            counters[value] = count
+            return
+        if count == 1:
+            # Classic decrement step: amortised O(1) because every decrement
+            # is paid for by an earlier increment.
+            self.max_error += 1
+            self.counters = {key: current - 1 for key, current in counters.items() if current > 1}
+            return
+        counters[value] = count
+        self._reduce()
+
+    def merge(self, other: "MisraGries") -> None:
+        for value, count in other.counters.items():
+            self.counters[value] = self.counters.get(value, 0) + count
+        self.total += other.total
+        self.max_error += other.max_error
+        self._reduce()
+
+    def most_common(self, limit: int | None = None) -> List[Tuple[Hashable, int]]:
+        ordered = sorted(self.counters.items(), key=lambda item: item[1], reverse=True)
+        return ordered if limit is None else ordered[:limit]
+
+    def _reduce(self) -> None:
+        """Subtract the (capacity+1)-th largest count so at most `capacity` survive."""
+        if len(self.counters) <= self.capacity:
+            return
+        cutoff = sorted(self.counters.values(), reverse=True)[self.capacity]
+        self.max_error += cutoff
+        self.counters = {
+            value: count - cutoff
+            for value, count in self.counters.items()
+            if count > cutoff
+        }
+
+    def __len__(self) -> int:
+        return len(self.counters)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "counters": [[value, count] for value, count in self.counters.items()],
+            "total": self.total,
+            "max_error": self.max_error,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "MisraGries":
+        summary = cls(payload["capacity"])
+        summary.counters = {_hashable(value): count for value, count in payload["counters"]}
+        summary.total = payload["total"]
+        summary.max_error = payload["max_error"]
+        return summary
+
+
+class KLLSketch:
+    """KLL quantile sketch over floats with exact min/max tracking."""
+
+    def __init__(self, k: int = 200, *, seed: int = 0) -> None:
+        if k < 8:
+            raise ValueError("k must be at least 8")
+        self.k = k
+        self.count = 0
+        self.min_value: float | None = None
+        self.max_value: float | None = None
+        self._compactors: List[List[float]] = [[]]
+        self._size = 0
+        self._max_size = self._capacity(0)
+        self._rng = random.Random(seed)
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if self.min_value is None or value < self.min_value:
+            self.min_value = value
+        if self.max_value is None or value > self.max_value:
+            self.max_value = value
+        self._compactors[0].append(value)
+        self._size += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def merge(self, other: "KLLSketch") -> None:
+        if other.count == 0:
+            return
+        while len(self._compactors) < len(other._compactors):
+            self._grow()
+        for height, items in enumerate(other._compactors):
+            self._compactors[height].extend(items)
+        self.count += other.count
+        self._size = sum(len(items) for items in self._compactors)
+        if self.min_value is None or (other.min_value is not None and other.min_value < self.min_value):
+            self.min_value = other.min_value
+        if self.max_value is None or (other.max_value is not None and other.max_value > self.max_value):
+            self.max_value = other.max_value
+        while self._size >= self._max_size:
+            self._compress()
+
+    def rank(self, value: float) -> float:
+        """Estimated number of observed items strictly below `value`."""
+        return float(
+            sum(
+                sum(1 for item in items if item < value) << height
+                for height, items in enumerate(self._compactors)
+            )
+        )
+
+    def quantile(self, fraction: float) -> float | None:
+        if self.count == 0:
+            return None
+        if fraction <= 0:
+            return self.min_value
+        if fraction >= 1:
+            return self.max_value
+        weighted = sorted(
+            (item, 1 << height)
+            for height, items in enumerate(self._compactors)
+            for item in items
+        )
+        total = sum(weight for _, weight in weighted)
+        target = fraction * total
+        cumulative = 0
+        for item, weight in weighted:
+            cumulative += weight
+            if cumulative >= target:
+                return item
+        return self.max_value
+
+    @property
+    def rank_error(self) -> float:
+        """Normalised rank error for this `k` (reference KLL analysis)."""
+        return 2.296 / self.k ** 0.9723
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "k": self.k,
+            "count": self.count,
+            "min_value": self.min_value,
+            "max_value": self.max_value,
+            "compactors": [list(items) for items in self._compactors],
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "KLLSketch":
+        sketch = cls(payload["k"], seed=payload["count"])
+        for _ in range(len(payload["compactors"]) - 1):
+            sketch._grow()
+        sketch._compactors = [list(items) for items in payload["compactors"]]
+        sketch._size = sum(len(items) for items in sketch._compactors)
+        sketch.count = payload["count"]
+        sketch.min_value = payload["min_value"]
+        sketch.max_value = payload["max_value"]
+        return sketch
+
+    def _capacity(self, height: int) -> int:
+        depth = len(self._compactors) - height - 1
+        return int(math.ceil(self.k * (2 / 3) ** depth)) + 1
+
+    def _grow(self) -> None:
+        self._compactors.append([])
+        self._max_size = sum(self._capacity(height) for height in range(len(self._compactors)))
+
+    def _compress(self) -> None:
+        for height in range(len(self._compactors)):
+            items = self._compactors[height]
+            if len(items) < self._capacity(height):
+                continue
+            if height + 1 >= len(self._compactors):
+                self._grow()
+            items.sort()
+            leftover = [items.pop()] if len(items) % 2 else []
+            offset = self._rng.getrandbits(1)
+            self._compactors[height + 1].extend(items[offset::2])
+            self._compactors[height] = leftover
+            self._size = sum(len(level) for level in self._compactors)
+            return
+
+
+class StreamingHistogram:
+    """Adaptive-bin streaming histogram (Ben-Haim & Tom-Tov).
+
+    Keeps at most `max_bins` (centroid, count) pairs, merging the two closest
+    centroids when a new value would exceed the budget. Needs a single pass
+    and no stored values; until the first merge every bin is an exact value.
+    """
+
+    def __init__(self, max_bins: int = 64) -> None:
+        if max_bins < 2:
+            raise ValueError("max_bins must be at least 2")
+        self.max_bins = max_bins
+        self.count = 0
+        self._centroids: List[float] = []
+        self._counts: List[int] = []
+        self.exact = True
+
+    def add(self, value: float, count: int = 1) -> None:
+        self.count += count
+        index = bisect.bisect_left(self._centroids, value)
+        if index < len(self._centroids) and self._centroids[index] == value:
+            self._counts[index] += count
+            return
+        self._centroids.insert(index, value)
+        self._counts.insert(index, count)
+        if len(self._centroids) > self.max_bins:
+            self._merge_closest()
+
+    def merge(self, other: "StreamingHistogram") -> None:
+        self.exact = self.exact and other.exact
+        for centroid, count in zip(other._centroids, other._counts):
+            self.add(centroid, count)
+
+    def rank(self, value: float) -> float:
+        """Estimated number of observed values strictly below `value`."""
+        centroids = self._centroids
+        counts = self._counts
+        if self.exact:
+            return float(sum(counts[: bisect.bisect_left(centroids, value)]))
+        if not centroids or value <= centroids[0]:
+            return 0.0
+        if value > centroids[-1]:
+            return float(self.count)
+        index = bisect.bisect_left(centroids, value) - 1
+        left, right = centroids[index], centroids[index + 1]
+        left_count, right_count = counts[index], counts[index + 1]
+        fraction = (value - left) / (right - left)
+        interpolated = left_count + (right_count - left_count) * fraction
+        below = sum(counts[:index])
+        return below + left_count / 2 + (left_count + interpolated) / 2 * fraction
+
+    @property
+    def max_bin_fraction(self) -> float:
+        """Largest merged bin as a fraction of all values; bounds edge placement error."""
+        if self.exact or not self.count:
+            return 0.0
+        return max(self._counts) / self.count
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "max_bins": self.max_bins,
+            "count": self.count,
+            "exact": self.exact,
+            "bins": [[centroid, count] for centroid, count in zip(self._centroids, self._counts)],
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "StreamingHistogram":
+        histogram = cls(payload["max_bins"])
+        histogram.count = payload["count"]
+        histogram.exact = payload["exact"]
+        histogram._centroids = [centroid for centroid, _ in payload["bins"]]
+        histogram._counts = [count for _, count in payload["bins"]]
+        return histogram
+
+    def _merge_closest(self) -> None:
+        self.exact = False
+        centroids = self._centroids
+        counts = self._counts
+        gaps = [centroids[index + 1] - centroids[index] for index in range(len(centroids) - 1)]
+        index = gaps.index(min(gaps))
+        merged_count = counts[index] + counts[index + 1]
+        centroids[index] = (
+            centroids[index] * counts[index] + centroids[index + 1] * counts[index + 1]
+        ) / merged_count
+        counts[index] = merged_count
+        del centroids[index + 1]
+        del counts[index + 1]
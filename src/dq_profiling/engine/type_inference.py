@@ -0,0 +1,122 @@
+"""Single-pass type inference for profiled values.
+
+Each value is classified against every candidate type at once and the result
+is returned as a bit mask, so the profiler only needs one counter update per
+cell. String parsing uses precompiled patterns and is memoised per distinct
+string, which keeps repeated values (statuses, dates, amounts) cheap.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+BOOLEAN = 1
+INTEGER = 2
+FLOAT = 4
+DATE = 8
+DATETIME = 16
+
+# Most specific first: the inferred type is the first candidate every value parses as.
+CANDIDATE_TYPES: Tuple[Tuple[str, int], ...] = (
+    ("boolean", BOOLEAN),
+    ("integer", INTEGER),
+    ("float", FLOAT),
+    ("date", DATE),
+    ("datetime", DATETIME),
+)
+NUMERIC_TYPES = ("integer", "float")
+TEMPORAL_TYPES = ("date", "datetime")
+
+_INTEGER_PATTERN = re.compile(r"[+-]?\d+")
+_FLOAT_PATTERN = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+_DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+_DATETIME_PATTERN = re.compile(
+    r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?(?:Z|[+-]\d{2}:?\d{2})?"
+)
+_BOOLEAN_LITERALS = {"true", "false", "yes", "no"}
+# Numbers and ISO dates start with one of these; anything else can only be a boolean.
+_PARSEABLE_START = frozenset("+-.0123456789")
+
+Inference = Tuple[int, Optional[float], Optional[datetime]]
+
+_NOT_PARSED: Inference = (0, None, None)
+
+
+def _normalise(moment: datetime) -> datetime:
+    """Compare aware and naive timestamps on one axis: naive UTC."""
+    if moment.tzinfo is not None:
+        return moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+@lru_cache(maxsize=65_536)
+def parse_text(text: str) -> Inference:
+    """Classify a string; returns (type mask, numeric value, temporal value)."""
+    stripped = text.strip()
+    if not stripped:
+        return _NOT_PARSED
+    if stripped[0] not in _PARSEABLE_START:
+        return (BOOLEAN, None, None) if stripped.lower() in _BOOLEAN_LITERALS else _NOT_PARSED
+    if _FLOAT_PATTERN.fullmatch(stripped):
+        mask = FLOAT | (INTEGER if _INTEGER_PATTERN.fullmatch(stripped) else 0)
+        return (mask, float(stripped), None)
+    if _DATE_PATTERN.fullmatch(stripped):
+        try:
+            parsed = datetime.fromisoformat(stripped)
+        except ValueError:
+            return _NOT_PARSED
+        return (DATE | DATETIME, None, parsed)
+    if _DATETIME_PATTERN.fullmatch(stripped):
+        try:
+            parsed = datetime.fromisoformat(stripped)
+        except ValueError:
+            return _NOT_PARSED
+        return (DATETIME, None, _normalise(parsed))
+    return _NOT_PARSED
+
+
+def infer_value(value: Any) -> Inference:
+    """Classify any non-null value; native types count as their own type."""
+    value_type = type(value)
+    if value_type is str:
+        return parse_text(value)
+    if value_type is bool:
+        return (BOOLEAN, None, None)
+    if value_type is int:
+        return (INTEGER | FLOAT, None, None)
+    if value_type is float:
+        # Integral floats count as integers: DataFrames upcast int columns with
+        # missing values to float, and both engines must infer the same type.
+        return (FLOAT | INTEGER if value.is_integer() else FLOAT, None, None)
+    if isinstance(value, datetime):
+        return (DATETIME, None, _normalise(value))
+    if isinstance(value, date):
+        return (DATE | DATETIME, None, datetime(value.year, value.month, value.day))
+    if isinstance(value, int):
+        return (INTEGER | FLOAT, None, None)
+    if isinstance(value, float):
+        return (FLOAT | INTEGER if float(value).is_integer() else FLOAT, None, None)
+    return _NOT_PARSED
+
+
+def parse_rates(mask_counts: Dict[int, int], total: int) -> Dict[str, float]:
+    """Fraction of values that parse as each candidate type."""
+    if not total:
+        return {}
+    return {
+        name: round(sum(count for mask, count in mask_counts.items() if mask & bit) / total, 6)
+        for name, bit in CANDIDATE_TYPES
+    }
+
+
+def inferred_type(mask_counts: Dict[int, int], total: int) -> Optional[str]:
+    """Most specific candidate type shared by every value, else "string"."""
+    if not total:
+        return None
+    for name, bit in CANDIDATE_TYPES:
+        if all(mask & bit for mask in mask_counts):
+            return name
+    return "string"
@@ -1,21 +1,48 @@
 """Profiling-related Pydantic models."""
 
-from .profiling_job import ProfilingJob, ProfilingJobResult, ProfilingJobStatus
+from .profiling_job import (
+    ProfilingCrossColumn,
+    ProfilingJob,
+    ProfilingJobResult,
+    ProfilingJobStatus,
+    ProfilingSampling,
+    ProfilingSpec,
+)
 from .profiling_snapshot import (
+    CrossColumnProfile,
     DistributionBucket,
     DistributionSummary,
+    DistributionTail,
+    FieldDrift,
+    FunctionalDependency,
+    KeyCandidate,
     ProfilingFieldStats,
     ProfilingSnapshot,
+    SamplingSummary,
+    SnapshotDrift,
     ValueFrequency,
 )
+from .profiling_state import ProfilingState, ProfilingStateMismatchError
 
 __all__ = [
     "ProfilingJob",
     "ProfilingJobResult",
     "ProfilingJobStatus",
+    "ProfilingSampling",
+    "ProfilingSpec",
+    "ProfilingCrossColumn",
     "ProfilingSnapshot",
     "ProfilingFieldStats",
     "DistributionSummary",
     "DistributionBucket",
+    "DistributionTail",
     "ValueFrequency",
+    "SamplingSummary",
+    "FieldDrift",
+    "SnapshotDrift",
+    "CrossColumnProfile",
+    "KeyCandidate",
+    "FunctionalDependency",
+    "ProfilingState",
+    "ProfilingStateMismatchError",
 ]
@@ -2,11 +2,15 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Literal, Mapping, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from .profiling_snapshot import ProfilingSnapshot
+from .profiling_state import ProfilingState
+
+if TYPE_CHECKING:  # pragma: no cover - contracts and rules are optional inputs
+    from dq_contracts.models import DatasetContract, RuleBinding
 
 
 class ProfilingJobStatus(str, Enum):
@@ -19,6 +23,111 @@ class ProfilingJobStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+class ProfilingSampling(BaseModel):
+    """Profile a random sample of rows instead of the full dataset."""
+
+    method: Literal["bernoulli", "reservoir"] = "bernoulli"
+    rate: Optional[float] = Field(
+        default=None,
+        gt=0,
+        le=1,
+        description="Inclusion probability per row for Bernoulli sampling.",
+    )
+    size: Optional[int] = Field(default=None, ge=1, description="Reservoir size in rows.")
+    seed: Optional[int] = Field(default=None, description="Random seed for reproducible samples.")
+    confidence: float = Field(
+        default=0.95,
+        gt=0,
+        lt=1,
+        description="Confidence level for the intervals attached to sampled metrics.",
+    )
+
+    @model_validator(mode="after")
+    def _check_parameters(self) -> "ProfilingSampling":
+        if self.method == "bernoulli" and self.rate is None:
+            raise ValueError("bernoulli sampling requires 'rate'")
+        if self.method == "reservoir" and self.size is None:
+            raise ValueError("reservoir sampling requires 'size'")
+        return self
+
+
+class ProfilingCrossColumn(BaseModel):
+    """Options for key-candidate and functional-dependency discovery."""
+
+    max_columns: int = Field(
+        default=16,
+        ge=2,
+        description="Columns considered, in first-seen order (spec fields only when a spec is set).",
+    )
+    warmup_rows: int = Field(
+        default=1_000,
+        ge=1,
+        description="Leading rows checked exactly to prune column pairs before the rest of the scan.",
+    )
+    sample_size: int = Field(default=10_000, ge=1, description="Uniform row sample used to confirm candidates.")
+    hll_precision: int = Field(default=14, ge=4, le=18, description="HyperLogLog precision for distinct estimates.")
+    seed: Optional[int] = Field(default=None, description="Random seed for the confirmation sample.")
+
+
+class ProfilingSpec(BaseModel):
+    """Projection of the fields that need full profiling statistics."""
+
+    fields: List[str] = Field(
+        default_factory=list,
+        description="Field names that get full statistics (column IDs, display names and aliases).",
+    )
+    count_other_fields: bool = Field(
+        default=True,
+        description="Give fields outside `fields` null/non-null counts only; when False they are dropped.",
+    )
+
+    @classmethod
+    def from_contract(
+        cls,
+        contract: "DatasetContract",
+        rules: Iterable[Any] = (),
+        bindings: Iterable["RuleBinding"] = (),
+        *,
+        count_other_fields: bool = True,
+    ) -> "ProfilingSpec":
+        """Derive the spec from contract columns, their expectations and bound profiling rules.
+
+        `rules` are profiling rule templates (anything with `dataset_type` and
+        `field`); rules without a field do not widen the projection.
+        """
+        names: Dict[str, List[str]] = {
+            column.column_id: [
+                column.column_id,
+                *([column.display_name] if column.display_name else []),
+                *column.aliases,
+            ]
+            for column in contract.columns
+        }
+        fields: List[str] = [name for column_names in names.values() for name in column_names]
+        for rule in rules:
+            field = getattr(rule, "field", None)
+            if field and getattr(rule, "dataset_type", contract.dataset_type) == contract.dataset_type:
+                fields.append(field)
+        for binding in bindings:
+            if (
+                binding.enabled
+                and binding.rule_type.value == "profiling"
+                and binding.target_scope.value == "column"
+            ):
+                fields.extend(names.get(binding.target_id, [binding.target_id]))
+        return cls(fields=list(dict.fromkeys(fields)), count_other_fields=count_other_fields)
+
+    def project_source_ref(self, source_ref: Mapping[str, Any]) -> Dict[str, Any]:
+        """Add the column projection to an `ExecutionEngine.load_dataset` source reference.
+
+        Loaders can only skip columns entirely when other fields are not counted.
+        """
+        projected = dict(source_ref)
+        if not self.count_other_fields:
+            projected["columns"] = list(self.fields)
+        return projected
+
+
 class ProfilingJob(BaseModel):
     """Request envelope for profiling a dataset before validation."""
 
@@ -35,6 +144,30 @@ class ProfilingJob(BaseModel):
         description="Per-field overrides (e.g., tighter thresholds) supplied by callers.",
     )
     priority: int = Field(default=0, ge=0)
+    incremental: bool = Field(
+        default=False,
+        description="Emit accumulator state with the snapshot so later runs can profile only appended rows.",
+    )
+    dataset_checksum: Optional[str] = Field(
+        default=None,
+        description="Checksum of the dataset bytes (see ValidationJobMetadata.checksum); enables result caching.",
+    )
+    contract_version: Optional[str] = Field(
+        default=None,
+        description="Version of the dataset contract the profile was requested under.",
+    )
+    sampling: Optional[ProfilingSampling] = Field(
+        default=None,
+        description="Profile a sample and attach confidence intervals instead of scanning every row.",
+    )
+    cross_column: Optional[ProfilingCrossColumn] = Field(
+        default=None,
+        description="Suggest primary keys, unique indexes and functional dependencies on the snapshot.",
+    )
+    spec: Optional[ProfilingSpec] = Field(
+        default=None,
+        description="Limit full statistics to these fields; profile every field when unset.",
+    )
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
@@ -47,6 +180,10 @@ class ProfilingJobResult(BaseModel):
     profiled_at: datetime = Field(default_factory=datetime.utcnow)
     snapshot: ProfilingSnapshot
     warnings: List[str] = Field(default_factory=list)
+    state: Optional[ProfilingState] = Field(
+        default=None,
+        description="Accumulator state to store next to the snapshot for incremental runs.",
+    )
 
     def summary(self) -> Dict[str, Any]:
         """Compact structure for API responses and metadata events."""
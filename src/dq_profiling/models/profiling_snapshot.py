@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List, Optional, Literal
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Literal, Tuple
 
 from pydantic import BaseModel, Field
 
@@ -22,12 +23,34 @@ class DistributionBucket(BaseModel):
     percentage: float
 
 
+class DistributionTail(BaseModel):
+    """Roll-up of categorical values left out of a high-cardinality distribution."""
+
+    distinct: int = Field(..., description="Distinct values not listed in `values`.")
+    count: int = Field(..., description="Rows holding one of those values.")
+    percentage: float
+    entropy: Optional[float] = Field(
+        default=None,
+        description="Shannon entropy (bits) of the field's full value distribution.",
+    )
+    min_length: Optional[int] = None
+    max_length: Optional[int] = None
+    mean_length: Optional[float] = Field(
+        default=None,
+        description="Mean string length across the distinct tail values.",
+    )
+
+
 class DistributionSummary(BaseModel):
     """Generic distribution descriptor."""
 
     kind: Literal["numeric", "categorical"]
     buckets: List[DistributionBucket] = Field(default_factory=list)
     values: List[ValueFrequency] = Field(default_factory=list)
+    tail: Optional[DistributionTail] = Field(
+        default=None,
+        description="Set when a categorical field exceeded the cardinality limit and only top values are listed.",
+    )
 
 
 class ProfilingFieldStats(BaseModel):
@@ -42,13 +65,154 @@ class ProfilingFieldStats(BaseModel):
     max_value: Optional[float] = None
     mean: Optional[float] = None
     stddev: Optional[float] = None
+    quantiles: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Numeric quantiles keyed by metric code (p1, p50, p95, p99).",
+    )
     frequent_values: List[ValueFrequency] = Field(default_factory=list)
     distribution: Optional[DistributionSummary] = None
+    inferred_type: Optional[str] = Field(
+        default=None,
+        description="Most specific type every non-null value parses as (boolean, integer, float, date, datetime), else string.",
+    )
+    type_parse_rates: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Fraction of non-null values that parse as each candidate type.",
+    )
+    temporal_min: Optional[datetime] = Field(default=None, description="Earliest value of a date/datetime field.")
+    temporal_max: Optional[datetime] = Field(default=None, description="Latest value of a date/datetime field.")
+    count_only: bool = Field(
+        default=False,
+        description="Only null/non-null counts were collected because the field is outside the profiling spec.",
+    )
+    approximate: bool = Field(
+        default=False,
+        description="Whether any metric was estimated from a bounded-memory sketch.",
+    )
+    error_bounds: Dict[str, float] = Field(
+        default_factory=dict,
+        description=(
+            "Error bound per approximate metric: relative standard error for `distinct`, "
+            "maximum error as a fraction of rows for `frequent_values` and `distribution`."
+        ),
+    )
+    confidence_intervals: Dict[str, Tuple[float, float]] = Field(
+        default_factory=dict,
+        description="(lower, upper) bounds for `null_ratio`, `mean` and `distinct` on sampled snapshots.",
+    )
     thresholds: Dict[str, Any] = Field(
         default_factory=dict,
         description="Dynamic thresholds derived from historical profiling runs.",
     )
 
+    @property
+    def null_ratio(self) -> float:
+        total = self.non_null + self.nulls
+        return self.nulls / total if total else 0.0
+
+    def get_metric(self, metric: str) -> Optional[float]:
+        """Resolve a profiling rule `profile_metric` code against these stats.
+
+        Supports counts (`nulls`, `non_null`, `distinct_count`), ratios
+        (`null_ratio`, `distinct_ratio`), numeric moments (`min`, `max`,
+        `mean`, `stddev`) and any stored quantile key such as `p95`.
+        """
+        metric = metric.strip().lower()
+        if metric in self.quantiles:
+            return self.quantiles[metric]
+        if metric == "null_ratio":
+            return self.null_ratio
+        if metric in {"distinct", "distinct_count"}:
+            return float(self.distinct)
+        if metric == "distinct_ratio":
+            return self.distinct / self.non_null if self.non_null else 0.0
+        if metric in {"nulls", "non_null"}:
+            return float(getattr(self, metric))
+        if metric in {"min", "max"}:
+            return getattr(self, f"{metric}_value")
+        if metric in {"mean", "stddev"}:
+            return getattr(self, metric)
+        return None
+
+
+class SamplingSummary(BaseModel):
+    """How a sampled snapshot was produced."""
+
+    method: Literal["bernoulli", "reservoir"]
+    rate: float = Field(..., description="Sampled rows divided by population rows.")
+    sampled_rows: int
+    population_rows: int
+    confidence: float
+    seed: Optional[int] = None
+
+
+class FieldDrift(BaseModel):
+    """Distribution drift of one field against a baseline snapshot."""
+
+    kind: Literal["numeric", "categorical"]
+    psi: float = Field(..., description="Population stability index over the shared bins.")
+    ks: Optional[float] = Field(
+        default=None,
+        description="Largest CDF gap at the histogram edges (numeric fields only).",
+    )
+    js_divergence: float = Field(..., description="Jensen-Shannon divergence in bits, between 0 and 1.")
+    null_ratio_delta: float = Field(..., description="Current null ratio minus the baseline null ratio.")
+    drifted: bool
+
+
+class SnapshotDrift(BaseModel):
+    """Per-field drift computed from stored histograms and frequency summaries."""
+
+    baseline_snapshot_id: str
+    fields: Dict[str, FieldDrift] = Field(default_factory=dict)
+
+    @property
+    def drifted_fields(self) -> List[str]:
+        return [field_name for field_name, drift in self.fields.items() if drift.drifted]
+
+
+class KeyCandidate(BaseModel):
+    """Column combination whose values appear to be unique and non-null."""
+
+    columns: List[str]
+    estimated_distinct: int = Field(..., description="HyperLogLog estimate of distinct combinations.")
+    uniqueness: float = Field(
+        ...,
+        description=(
+            "1.0: candidates are only reported when no repeat was seen in the warm-up rows or the sample "
+            "and the distinct estimate matches the row count within HyperLogLog error."
+        ),
+    )
+
+
+class FunctionalDependency(BaseModel):
+    """`determinant` appears to fix the value of `dependent` (e.g. CustomerId -> Region)."""
+
+    determinant: str
+    dependent: str
+    determinant_distinct: int = Field(..., description="HyperLogLog estimate of distinct determinant values.")
+    sample_support: float = Field(
+        ...,
+        description="Fraction of sampled rows whose determinant value repeats, i.e. rows that exercised the dependency.",
+    )
+
+
+class CrossColumnProfile(BaseModel):
+    """Key and dependency suggestions for contract authors to review; all results are estimates."""
+
+    columns: List[str] = Field(default_factory=list, description="Columns considered, in first-seen order.")
+    sample_rows: int = Field(0, description="Rows in the uniform sample used to confirm candidates.")
+    key_candidates: List[KeyCandidate] = Field(default_factory=list)
+    functional_dependencies: List[FunctionalDependency] = Field(default_factory=list)
+    suggested_primary_keys: List[str] = Field(
+        default_factory=list,
+        description="Smallest key candidate, shaped like `DatasetContract.primary_keys`.",
+    )
+    suggested_indexes: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="Remaining key candidates as unique `IndexDefinition` payloads.",
+    )
+
 
 class ProfilingSnapshot(BaseModel):
     """Collection of profiling metrics used to build validation contexts."""
@@ -62,25 +226,48 @@ class ProfilingSnapshot(BaseModel):
         description="Whether the snapshot used raw or cleansed data as input.",
     )
     field_stats: Dict[str, ProfilingFieldStats] = Field(default_factory=dict)
+    sampling: Optional[SamplingSummary] = Field(
+        default=None,
+        description="Set when field stats describe a sample; `record_count` stays the full row count.",
+    )
+    cross_column: Optional[CrossColumnProfile] = Field(
+        default=None,
+        description="Key candidates and functional dependencies, when the job requested cross-column profiling.",
+    )
+    drift: Optional[SnapshotDrift] = Field(
+        default=None,
+        description="Set when the snapshot was compared against a baseline snapshot.",
+    )
     overrides_applied: Dict[str, Any] = Field(default_factory=dict)
 
     def merge_overrides(self, overrides: Optional[Dict[str, Any]]) -> "ProfilingSnapshot":
-        """Return a copy with overrides folded into `overrides_applied`."""
+        """Return a copy with overrides folded into `overrides_applied`.
+
+        Copy-on-write: only overridden fields get new stats objects; all other
+        field stats are shared with this snapshot and must be treated as
+        read-only.
+        """
         if not overrides:
             return self
 
-        merged = self.copy(deep=True)
-        merged.overrides_applied.update(overrides)
-
+        field_stats = dict(self.field_stats)
         for field_name, field_override in overrides.items():
-            stats = merged.field_stats.setdefault(
-                field_name,
-                ProfilingFieldStats(field_name=field_name),
-            )
             thresholds = field_override.get("thresholds") if isinstance(field_override, dict) else None
-            if thresholds:
-                stats.thresholds.update(thresholds)
-        return merged
+            stats = field_stats.get(field_name)
+            if stats is None:
+                field_stats[field_name] = ProfilingFieldStats(
+                    field_name=field_name,
+                    thresholds=dict(thresholds or {}),
+                )
+            elif thresholds:
+                field_stats[field_name] = stats.copy(update={"thresholds": {**stats.thresholds, **thresholds}})
+
+        return self.copy(
+            update={
+                "field_stats": field_stats,
+                "overrides_applied": {**self.overrides_applied, **overrides},
+            }
+        )
 
     def iter_fields(self) -> Iterable[ProfilingFieldStats]:
         """Convenience iterator for callers that need to scan stats."""
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, Field
+
+PROFILING_STATE_VERSION = 2
+
+
+class ProfilingStateMismatchError(ValueError):
+    """Raised when saved profiling state cannot be resumed by an engine."""
+
+
+class ProfilingState(BaseModel):
+    """Serialized per-field accumulators saved next to a profiling snapshot.
+
+    Append-only datasets can resume from this state and profile only the new
+    rows. The state is only valid for an engine with the same configuration,
+    captured by `config_fingerprint`; any change forces a full recompute.
+    """
+
+    state_version: int = Field(default=PROFILING_STATE_VERSION, description="Serialization format version.")
+    config_fingerprint: str = Field(..., description="Hash of the engine configuration that produced the state.")
+    snapshot_id: str = Field(..., description="Snapshot generated together with this state.")
+    record_count: int = Field(..., ge=0, description="Rows folded into the accumulators so far.")
+    fields: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description="Per-field accumulator payloads keyed by field name.",
+    )
+    profiling_spec: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="`ProfilingJob.spec` the accumulators were built under; resuming requires the same spec.",
+    )
+    saved_at: datetime = Field(default_factory=datetime.utcnow)
@@ -32,9 +32,14 @@ class FieldSummary:
     max_value: Optional[float]
     mean: Optional[float]
     stddev: Optional[float]
+    quantiles: Dict[str, float]
+    inferred_type: Optional[str]
+    type_parse_rates: Dict[str, float]
     frequent_values: List[Dict[str, Any]]
     distribution: Optional[Dict[str, Any]]
     thresholds: Dict[str, Any]
+    error_bounds: Dict[str, float]
+    confidence_intervals: Dict[str, Any]
 
     @classmethod
     def from_stats(cls, stats: ProfilingFieldStats) -> "FieldSummary":
@@ -56,9 +61,14 @@ class FieldSummary:
             max_value=stats.max_value,
             mean=stats.mean,
             stddev=stats.stddev,
+            quantiles=stats.quantiles,
+            inferred_type=stats.inferred_type,
+            type_parse_rates=stats.type_parse_rates,
             frequent_values=[freq.dict() for freq in stats.frequent_values],
             distribution=distribution,
             thresholds=stats.thresholds,
+            error_bounds=stats.error_bounds,
+            confidence_intervals={key: list(bounds) for key, bounds in stats.confidence_intervals.items()},
         )
 
     def to_dict(self) -> Dict[str, Any]:
@@ -72,9 +82,14 @@ class FieldSummary:
             "max_value": self.max_value,
             "mean": self.mean,
             "stddev": self.stddev,
+            "quantiles": self.quantiles,
+            "inferred_type": self.inferred_type,
+            "type_parse_rates": self.type_parse_rates,
             "frequent_values": self.frequent_values,
             "distribution": self.distribution,
             "thresholds": self.thresholds,
+            "error_bounds": self.error_bounds,
+            "confidence_intervals": self.confidence_intervals,
         }
 
 
@@ -90,6 +105,8 @@ class ProfilingReport:
     generated_from: str
     field_summaries: List[FieldSummary]
     warnings: List[str]
+    sampling: Optional[Dict[str, Any]] = None
+    drift: Optional[Dict[str, Any]] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Return a JSON-serializable dictionary for API responses."""
@@ -100,6 +117,8 @@ class ProfilingReport:
             "profiled_at": self.profiled_at.isoformat(),
             "record_count": self.record_count,
             "generated_from": self.generated_from,
+            "sampling": self.sampling,
+            "drift": self.drift,
             "warnings": self.warnings,
             "fields": [field.to_dict() for field in self.field_summaries],
         }
@@ -153,6 +172,8 @@ def profiling_report_from_result(result: ProfilingJobResult) -> ProfilingReport:
         generated_from=snapshot.generated_from,
         field_summaries=field_summaries,
         warnings=result.warnings,
+        sampling=snapshot.sampling.dict() if snapshot.sampling else None,
+        drift=snapshot.drift.dict() if snapshot.drift else None,
     )
 
 
@@ -15,6 +15,7 @@ from dq_cleansing import (  # noqa: E402
     CleansingRuleLibrary,
     TransformationStep,
 )
+from dq_cleansing.engine.transformer import TransformationError  # noqa: E402
 from dq_cleansing.models.cleansing_job import CleansingJobResult  # noqa: E402
 
 
@@ -120,3 +121,442 @@ def test_engine_raises_for_unknown_transformation() -> None:
 
     with pytest.raises(RuntimeError):
         engine.run(job, rule, sample_dataset())
+
+
+def test_columnar_steps_share_untouched_columns() -> None:
+    """Steps replace only their target columns; other column lists are shared, not copied."""
+
+    from dq_cleansing.engine.batch import ColumnarBatch
+    from dq_cleansing.engine.transformer import apply_transformation
+
+    batch = ColumnarBatch.from_rows(sample_dataset())
+    step = TransformationStep(type="standardize", target_fields=["Currency"], parameters={"format": "upper"})
+
+    outcome = apply_transformation(batch, step)
+
+    assert outcome.dataset.column("Currency") == ["USD", "EUR", "EUR"]
+    assert batch.column("Currency") == ["usd", "eur", "eur"]
+    assert outcome.dataset.column("InvoiceNumber") is batch.column("InvoiceNumber")
+    assert outcome.dataset.column("CustomerId") is batch.column("CustomerId")
+
+
+def test_engine_preserves_sparse_rows_and_rejects_hard_failures() -> None:
+    """Fields absent from a row stay absent unless filled; hard fill failures are rejected."""
+
+    engine = CleansingEngine()
+    job = CleansingJob(job_id="cln-job-3", tenant_id="tenant-1", dataset_type="billing", rule_id="sparse")
+    rule = CleansingRule(
+        rule_id="sparse",
+        name="Sparse rows",
+        dataset_type="billing",
+        version="2024.06.01",
+        transformations=[
+            TransformationStep(type="fill_missing", target_fields=["Currency"], parameters={"default": "EUR"}),
+            TransformationStep(type="fill_missing", target_fields=["InvoiceNumber"], severity="hard"),
+        ],
+    )
+    rows = [
+        {"InvoiceNumber": "INV-001", "Currency": "usd"},
+        {"InvoiceNumber": "INV-002", "Note": "late"},
+        {"Currency": ""},
+    ]
+
+    result, cleansed, _ = engine.run(job, rule, iter(rows))
+
+    assert cleansed == [
+        {"InvoiceNumber": "INV-001", "Currency": "usd"},
+        {"InvoiceNumber": "INV-002", "Currency": "EUR", "Note": "late"},
+    ]
+    assert result.before_counts["rows"] == 3
+    assert result.rejected_sample["row"] == {"Currency": "EUR"}
+
+
+def test_fused_plan_matches_step_by_step_execution() -> None:
+    """Fusing row-local steps keeps per-step metrics, rejections and output identical."""
+
+    from dq_cleansing.engine.batch import ColumnarBatch
+    from dq_cleansing.engine.planner import compile_plan
+    from dq_cleansing.engine.transformer import apply_transformation
+
+    steps = [
+        TransformationStep(type="standardize", target_fields=["Currency", "Region"], parameters={"format": "upper"}),
+        TransformationStep(type="fill_missing", target_fields=["Region"], parameters={"default": "n/a"}),
+        TransformationStep(type="fill_missing", target_fields=["Currency", "CustomerId"], severity="hard"),
+        TransformationStep(type="standardise", target_fields=["Region"], parameters={"format": "lower"}),
+        TransformationStep(type="deduplicate", target_fields=["InvoiceNumber"]),
+        TransformationStep(type="fill_missing", target_fields=["Note"], parameters={"default": "-"}),
+    ]
+    rows = [
+        {"InvoiceNumber": "INV-001", "Currency": "usd", "CustomerId": "C1", "Region": "north"},
+        {"InvoiceNumber": "INV-002", "Currency": None, "CustomerId": "C2", "Region": None},
+        {"InvoiceNumber": "INV-003", "Currency": "eur", "CustomerId": "", "Region": "South"},
+        {"InvoiceNumber": "INV-001", "Currency": "usd", "CustomerId": "C1"},
+    ]
+
+    plan = compile_plan(steps)
+    assert plan.describe() == [
+        ["standardize", "fill_missing", "fill_missing", "standardise"],
+        ["deduplicate"],
+        ["fill_missing"],
+    ]
+    fused_batch, fused = plan.run(ColumnarBatch.from_rows(rows))
+
+    batch = ColumnarBatch.from_rows(rows)
+    for step, outcome in zip(steps, fused):
+        expected = apply_transformation(batch, step)
+        batch = expected.dataset
+        assert outcome.metrics == expected.metrics
+        assert outcome.rejected == expected.rejected
+
+    assert fused_batch.to_rows() == batch.to_rows()
+    assert [entry["row"]["Currency"] for entry in fused[2].rejected] == [None, "EUR"]
+    assert fused[2].rejected[1]["row"]["Region"] == "SOUTH"
+
+
+def test_streamed_chunks_match_single_run_and_feed_profiling() -> None:
+    """Chunked execution dedups across chunk boundaries and pipes rows into profiling."""
+
+    from dq_profiling import ProfilingEngine, ProfilingJob
+
+    rows = [
+        {"InvoiceNumber": f"INV-{index % 5:03d}", "Currency": "usd", "CustomerId": None if index % 3 else "C1"}
+        for index in range(12)
+    ]
+    job = CleansingJob(
+        job_id="cln-job-3",
+        tenant_id="tenant-1",
+        dataset_type="billing",
+        rule_id="billing-standardise",
+    )
+    engine = CleansingEngine()
+    expected_result, expected_rows, _ = engine.run(job, build_rule(), rows)
+
+    stream = engine.run_stream(job, build_rule(), iter(rows), chunk_size=4)
+    assert stream.result is None
+    chunks = list(stream)
+
+    assert [len(chunk) for chunk in chunks] == [4, 1]
+    assert [row for chunk in chunks for row in chunk] == expected_rows
+    assert stream.result.dict() == expected_result.dict()
+    assert stream.result.metrics["deduplicate"]["deduplicated"] == 7
+
+    stream = engine.run_stream(job, build_rule(), iter(rows), chunk_size=4)
+    profile = ProfilingEngine().profile(
+        ProfilingJob(job_id="profile-job", tenant_id="tenant-1", dataset_type="billing"),
+        stream.rows(),
+    )
+    assert profile.snapshot.record_count == 5
+    assert stream.result.after_counts["rows"] == 5
+
+
+def test_spilling_deduplicate_matches_in_memory_mode(tmp_path: Path) -> None:
+    """Spilled dedup keeps first-seen rows, reports spill metrics and removes its files."""
+
+    from dq_cleansing.engine.transformer import apply_transformation
+
+    rows = [{"InvoiceNumber": f"INV-{(index * 7) % 40:03d}", "Position": index} for index in range(120)]
+    in_memory = apply_transformation(rows, TransformationStep(type="deduplicate", target_fields=["InvoiceNumber"]))
+    spilled = apply_transformation(
+        rows,
+        TransformationStep(
+            type="deduplicate",
+            target_fields=["InvoiceNumber"],
+            parameters={"max_keys_in_memory": 8, "spill_partitions": 4, "spill_dir": str(tmp_path)},
+        ),
+    )
+
+    assert spilled.dataset.to_rows() == in_memory.dataset.to_rows()
+    assert spilled.rejected == in_memory.rejected
+    assert spilled.metrics["deduplicated"] == 80
+    assert spilled.metrics["spilled_keys"] == 8
+    assert spilled.metrics["spilled_rows"] == 112
+    assert spilled.metrics["spill_partition_reads"] > 0
+    assert list(tmp_path.iterdir()) == []
+
+    # Keys that compare equal (1, 1.0, True) are duplicates in both modes.
+    mixed = [{"Key": index} for index in range(50)] + [{"Key": float(index)} for index in range(50)]
+    mixed += [{"Key": True}, {"Key": False}]
+    step = TransformationStep(type="deduplicate", target_fields=["Key"], parameters={"max_keys_in_memory": 8})
+    spilled = apply_transformation(mixed, step)
+    in_memory = apply_transformation(mixed, TransformationStep(type="deduplicate", target_fields=["Key"]))
+    assert spilled.dataset.to_rows() == in_memory.dataset.to_rows() == mixed[:50]
+
+
+def test_spilled_deduplicate_reads_each_partition_once(tmp_path: Path) -> None:
+    """Held chunks are resolved at the end of input, not re-read per chunk."""
+
+    rows = [
+        {"InvoiceNumber": f"INV-{(index * 7) % 100:03d}", "Currency": "usd", "CustomerId": "C1", "Note": None}
+        for index in range(2_000)
+    ]
+    job = CleansingJob(
+        job_id="cln-job-spill",
+        tenant_id="tenant-1",
+        dataset_type="billing",
+        rule_id="billing-standardise",
+    )
+    engine = CleansingEngine()
+    expected_result, expected_rows, _ = engine.run(job, build_rule(), rows)
+
+    rule = build_rule()
+    rule.transformations[2].parameters.update(
+        {"max_keys_in_memory": 50, "spill_partitions": 4, "spill_dir": str(tmp_path)}
+    )
+    # A row-local step after the deduplicate runs on the flushed rows too.
+    rule.transformations.append(
+        TransformationStep(type="fill_missing", target_fields=["Note"], parameters={"default": "n/a"})
+    )
+    stream = engine.run_stream(job, rule, iter(rows), chunk_size=10)
+    streamed = list(stream.rows())
+
+    assert streamed == [dict(row, Note="n/a") for row in expected_rows]
+    metrics = stream.result.metrics["deduplicate"]
+    assert metrics["deduplicated"] == expected_result.metrics["deduplicate"]["deduplicated"] == 1_900
+    assert metrics["spilled_keys"] == 50
+    assert metrics["spilled_rows"] == 1_950
+    # 195 held chunks, yet every partition is read exactly once.
+    assert metrics["spill_partition_reads"] == 4
+    assert stream.result.after_counts == expected_result.after_counts
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_parallel_run_matches_serial_run() -> None:
+    """Key-partitioned parallel execution keeps row order, metrics and rejections."""
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    rule = build_rule()
+    rule.transformations.insert(
+        0, TransformationStep(type="fill_missing", target_fields=["Currency"], severity="hard")
+    )
+    rule.transformations.append(
+        TransformationStep(type="deduplicate", target_fields=["CustomerId", "Currency"])
+    )
+    rows = [
+        {
+            "InvoiceNumber": f"INV-{index % 17:03d}",
+            "Currency": None if index % 11 == 0 else ("usd", "eur", "gbp")[index % 3],
+            "CustomerId": f"C{index % 7}" if index % 4 else None,
+        }
+        for index in range(60)
+    ]
+    job = CleansingJob(
+        job_id="cln-job-4",
+        tenant_id="tenant-1",
+        dataset_type="billing",
+        rule_id="billing-standardise",
+    )
+    engine = CleansingEngine()
+
+    expected = engine.run(job, rule, rows)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        actual = engine.run_parallel(job, rule, rows, workers=3, executor=executor)
+    assert actual[0].dict() == expected[0].dict()
+    assert actual[1] == expected[1]
+
+    result, cleansed, _ = engine.run_parallel(job, rule, rows[:20], workers=2)
+    assert cleansed == engine.run(job, rule, rows[:20])[1]
+    assert result.metrics["deduplicate"] == engine.run(job, rule, rows[:20])[0].metrics["deduplicate"]
+
+    # A leading deduplicate is routed by the workers; empty input still reports metrics.
+    dedup_first = rule.copy(update={"transformations": [rule.transformations[-1], *rule.transformations[:-1]]})
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        for dataset in (rows, []):
+            actual = engine.run_parallel(job, dedup_first, dataset, workers=3, executor=executor)
+            expected = engine.run(job, dedup_first, dataset)
+            assert actual[0].dict() == expected[0].dict()
+            assert actual[1] == expected[1]
+
+    # Keys that compare equal land in the same partition: (1,) and (1.0,) are duplicates.
+    mixed = [{"InvoiceNumber": f"M{index}", "CustomerId": index % 25, "Currency": "usd"} for index in range(50)]
+    mixed += [{"InvoiceNumber": f"F{index}", "CustomerId": float(index), "Currency": "usd"} for index in range(50)]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        actual = engine.run_parallel(job, rule, mixed, workers=4, executor=executor)
+    expected = engine.run(job, rule, mixed)
+    assert actual[1] == expected[1]
+    assert len(expected[1]) == 50
+
+
+def test_conditional_steps_apply_only_to_matching_rows() -> None:
+    """Conditions are compiled once, mask rows per batch and report matched rows."""
+
+    from dq_cleansing.engine.batch import ColumnarBatch
+    from dq_cleansing.engine.planner import compile_plan
+    from dq_cleansing.engine.transformer import (
+        TransformationError,
+        apply_transformation,
+    )
+
+    steps = [
+        TransformationStep(
+            type="standardize",
+            target_fields=["Currency", "Country"],
+            parameters={"format": "upper"},
+            condition="Country == 'gr' and Amount >= 10",
+        ),
+        TransformationStep(
+            type="fill_missing",
+            target_fields=["CustomerId"],
+            severity="hard",
+            condition="Country in ('GR', 'CY')",
+        ),
+        TransformationStep(type="deduplicate", target_fields=["Currency"], condition="not Country == 'de'"),
+        TransformationStep(type="deduplicate", target_fields=["Country"], condition="Amount is None"),
+    ]
+    rows = [
+        {"Country": "gr", "Currency": "eur", "Amount": 12, "CustomerId": "C1"},
+        {"Country": "gr", "Currency": "eur", "Amount": 5, "CustomerId": None},
+        {"Country": "de", "Currency": "eur", "CustomerId": None},
+        {"Country": "gr", "Currency": "eur", "Amount": 30},
+        {"Country": "de", "Currency": "eur", "Amount": "n/a", "CustomerId": "C4"},
+    ]
+
+    plan = compile_plan(steps)
+    assert plan.describe() == [["standardize"], ["fill_missing"], ["deduplicate"], ["deduplicate"]]
+    output, outcomes = plan.run(ColumnarBatch.from_rows(rows))
+
+    batch = ColumnarBatch.from_rows(rows)
+    for step, outcome in zip(steps, outcomes):
+        expected = apply_transformation(batch, step)
+        batch = expected.dataset
+        assert outcome.metrics == expected.metrics
+        assert outcome.rejected == expected.rejected
+
+    assert [outcome.metrics["matched_rows"] for outcome in outcomes] == [2, 2, 2, 1]
+    assert [entry["row"]["Amount"] for entry in outcomes[1].rejected] == [30]
+    assert output.to_rows() == [
+        {"Country": "GR", "Currency": "EUR", "Amount": 12, "CustomerId": "C1"},
+        {"Country": "gr", "Currency": "eur", "Amount": 5, "CustomerId": None},
+        {"Country": "de", "Currency": "eur", "CustomerId": None},
+        {"Country": "de", "Currency": "eur", "Amount": "n/a", "CustomerId": "C4"},
+    ]
+
+    with pytest.raises(TransformationError):
+        compile_plan([TransformationStep(type="standardize", target_fields=["A"], condition="__import__('os')")])
+
+
+def test_rejected_rows_are_counted_sampled_and_spilled(tmp_path: Path) -> None:
+    """Rejections keep per-reason counts and a bounded sample; the full set is spilled."""
+
+    from dq_cleansing.engine.rejections import read_rejections
+
+    rows = [
+        {"InvoiceNumber": f"INV-{index % 10:03d}", "Currency": "usd", "CustomerId": None if index % 4 else "C1"}
+        for index in range(50)
+    ]
+    rule = build_rule()
+    rule.transformations[1] = TransformationStep(type="fill_missing", target_fields=["CustomerId"], severity="hard")
+    job = CleansingJob(
+        job_id="cln-job-5",
+        tenant_id="tenant-1",
+        dataset_type="billing",
+        rule_id="billing-standardise",
+        options={"rejected_sample_size": 5},
+    )
+    engine = CleansingEngine(rejected_spill_dir=str(tmp_path))
+
+    result, cleansed, _ = engine.run(job, rule, rows)
+
+    assert result.after_counts == {"rows": 5, "rejected": 45}
+    assert result.rejected_counts == {
+        "fill_missing failed for ['CustomerId']": 37,
+        "duplicate on ['InvoiceNumber']": 8,
+    }
+    assert len(result.rejected_samples) == 5
+    assert result.rejected_ref == str(tmp_path / "cln-job-5.rejected.ndjson.gz")
+    spilled = list(read_rejections(result.rejected_ref))
+    assert len(spilled) == 45
+    assert spilled[0] == result.rejected_sample
+    assert all(sample in spilled for sample in result.rejected_samples)
+
+    clean_result, _, _ = engine.run(job.copy(update={"job_id": "cln-job-6"}), build_rule(), rows[:1])
+    assert clean_result.rejected_ref is None
+    assert not (tmp_path / "cln-job-6.rejected.ndjson.gz").exists()
+
+    # `rejected_sample` is the first rejection of the earliest rejecting step, even when a
+    # later step rejects in an earlier chunk; every execution path agrees.
+    rows = [{"InvoiceNumber": "INV-1", "CustomerId": "C1"}] * 2 + [{"InvoiceNumber": "INV-2", "CustomerId": None}]
+    streamed = engine.run_stream(job.copy(update={"job_id": "cln-job-14"}), rule, rows, chunk_size=2)
+    list(streamed)
+    assert streamed.result.rejected_sample["reason"] == "fill_missing failed for ['CustomerId']"
+    parallel, _, _ = engine.run_parallel(job.copy(update={"job_id": "cln-job-15"}), rule, rows, workers=2)
+    assert parallel.rejected_sample == streamed.result.rejected_sample
+    assert parallel.rejected_counts == streamed.result.rejected_counts
+
+
+def test_cross_batch_deduplicate_uses_persistent_key_index(tmp_path: Path) -> None:
+    """Keys from earlier deliveries are rejected per tenant until they expire."""
+
+    from dq_cleansing.engine.key_index import PersistentKeyIndex
+
+    rule = CleansingRule(
+        rule_id="billing-cross-batch",
+        name="Billing cross-batch dedup",
+        dataset_type="billing",
+        version="2024.06.01",
+        transformations=[
+            TransformationStep(type="deduplicate", parameters={"keys": ["InvoiceNumber"], "cross_batch": True})
+        ],
+    )
+    index = PersistentKeyIndex(str(tmp_path / "keys.sqlite"), ttl_seconds=3600)
+    engine = CleansingEngine(key_index=index)
+
+    def job(job_id: str, tenant_id: str = "tenant-1") -> CleansingJob:
+        return CleansingJob(job_id=job_id, tenant_id=tenant_id, dataset_type="billing", rule_id=rule.rule_id)
+
+    first_rows = [{"InvoiceNumber": "INV-1"}, {"InvoiceNumber": "INV-2"}, {"InvoiceNumber": "INV-1"}]
+    first, cleansed, _ = engine.run(job("cln-job-7"), rule, first_rows)
+    assert [row["InvoiceNumber"] for row in cleansed] == ["INV-1", "INV-2"]
+    assert first.metrics["deduplicate"]["previously_seen"] == 0
+
+    second, cleansed, _ = engine.run(job("cln-job-8"), rule, [{"InvoiceNumber": "INV-2"}, {"InvoiceNumber": "INV-3"}])
+    assert [row["InvoiceNumber"] for row in cleansed] == ["INV-3"]
+    assert second.metrics["deduplicate"]["previously_seen"] == 1
+    assert second.rejected_counts == {"duplicate on ['InvoiceNumber'] from an earlier delivery": 1}
+
+    _, cleansed, _ = engine.run(job("cln-job-9", tenant_id="tenant-2"), rule, [{"InvoiceNumber": "INV-2"}])
+    assert [row["InvoiceNumber"] for row in cleansed] == ["INV-2"]
+
+    # A run that fails mid-stream publishes none of its keys, so the retry keeps every row.
+    retry_rows = [{"InvoiceNumber": f"INV-R{index}"} for index in range(6)]
+
+    def failing_chunks():
+        yield retry_rows[:3]
+        raise RuntimeError("source connection lost")
+
+    with pytest.raises(RuntimeError, match="connection lost"):
+        list(engine.run_chunks(job("cln-job-11"), rule, failing_chunks()))
+    retried, cleansed, _ = engine.run(job("cln-job-11"), rule, retry_rows)
+    assert cleansed == retry_rows
+    assert retried.metrics["deduplicate"]["previously_seen"] == 0
+
+    # Parallel runs commit their staged keys once every worker is done.
+    from concurrent.futures import ThreadPoolExecutor
+
+    parallel_rows = [{"InvoiceNumber": "INV-R0"}, {"InvoiceNumber": "INV-P1"}]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        result, cleansed, _ = engine.run_parallel(job("cln-job-12"), rule, parallel_rows, workers=2, executor=executor)
+    assert cleansed == [{"InvoiceNumber": "INV-P1"}]
+    assert result.metrics["deduplicate"]["previously_seen"] == 1
+    _, cleansed, _ = engine.run(job("cln-job-13"), rule, parallel_rows)
+    assert cleansed == []
+
+    scope = "scope"
+    assert index.check_and_add(scope, [("K",)], now=0) == [False]
+    assert index.check_and_add(scope, [("K",)], now=10) == [True]
+    assert index.evict(scope, now=10_000) == 1
+    assert index.check_and_add(scope, [("K",)], now=10_000) == [False]
+    assert index.check_and_add(scope, [(1, "A")], now=10_000) == [False]
+    assert index.check_and_add(scope, [(1.0, "A"), (True, "A")], now=10_000) == [True, True]
+
+    # Keys staged by a run that never committed or rolled back are evicted after the staging timeout.
+    staged_at, timeout = 10_000, index.staging_timeout
+    assert index.stage("abandoned-run", "staged", [("S",)], now=staged_at) == [False]
+    assert index.evict("staged", now=staged_at + timeout - 1) == 0
+    assert index.evict("staged", now=staged_at + timeout + 1) == 1
+    index.commit("abandoned-run")
+    assert index.check_and_add("staged", [("S",)], now=staged_at + timeout + 1) == [False]
+    index.close()
+
+    with pytest.raises(TransformationError, match="key index"):
+        CleansingEngine().run(job("cln-job-10"), rule, first_rows)
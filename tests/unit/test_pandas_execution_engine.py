@@ -7,7 +7,8 @@ import pytest
 
 sys.path.append(str(Path(__file__).resolve().parents[2] / "src"))
 
-from dq_engine.pandas_engine import PandasExecutionEngine
+from dq_engine.pandas_engine import PandasDatasetHandle, PandasExecutionEngine
+from dq_profiling import ProfilingEngine, ProfilingJob, ProfilingSpec
 
 
 def test_pandas_execution_engine_instantiation() -> None:
@@ -19,7 +20,7 @@ def test_pandas_execution_engine_instantiation() -> None:
 
 @pytest.mark.parametrize(
     "method_name",
-    ["load_dataset", "persist_dataset", "apply_transformations", "compute_profile", "evaluate_rules"],
+    ["load_dataset", "persist_dataset", "evaluate_rules"],
 )
 def test_pandas_execution_engine_methods_raise(method_name: str) -> None:
     """Stubbed methods should raise NotImplementedError with clear messages."""
@@ -30,7 +31,128 @@ def test_pandas_execution_engine_methods_raise(method_name: str) -> None:
         # Pass minimal dummy args per method signature
         if method_name in ("load_dataset",):
             method({"uri": "x"})
-        elif method_name in ("persist_dataset", "apply_transformations"):
-            method(object(), {"uri": "y"} if method_name == "persist_dataset" else [])
+        elif method_name == "persist_dataset":
+            method(object(), {"uri": "y"})
         else:
             method(object(), {})
+
+
+def test_pandas_compute_profile_matches_row_based_profiler() -> None:
+    """Vectorised profiling should reproduce the row-based snapshot exactly."""
+
+    import pandas as pd
+
+    rows = [
+        {"Amount": 10, "Status": "PAID", "Note": "", "Invoice": "INV-1"},
+        {"Amount": 20.5, "Status": "FAILED", "Note": "late", "Invoice": "INV-22"},
+        {"Amount": None, "Status": "PAID", "Note": None, "Invoice": "INV-1"},
+        {"Amount": 30, "Status": "PAID", "Note": "late", "Invoice": "INV-333"},
+        {"Amount": 30, "Status": "OPEN", "Note": "ok", "Invoice": "INV-4444"},
+    ]
+    job = ProfilingJob(job_id="profile-job-1", tenant_id="tenant-1", dataset_type="billing")
+    engine = ProfilingEngine(sample_size=2, categorical_distinct_limit=3, categorical_top_k=2)
+
+    expected = engine.profile(job, rows)
+    actual = engine.profile(job, PandasDatasetHandle(pd.DataFrame(rows)))
+
+    assert actual.snapshot.dict() == expected.snapshot.dict()
+    assert expected.snapshot.field_stats["Invoice"].distribution.tail is not None
+
+    projected = job.copy(update={"spec": ProfilingSpec(fields=["Amount", "Status"])})
+    expected = engine.profile(projected, rows)
+    actual = engine.profile(projected, PandasDatasetHandle(pd.DataFrame(rows)))
+    assert actual.snapshot.dict() == expected.snapshot.dict()
+    assert expected.snapshot.field_stats["Note"].count_only
+
+
+def test_pandas_compute_profile_requires_pandas_handle() -> None:
+    """Non-pandas handles are rejected explicitly."""
+
+    with pytest.raises(TypeError):
+        PandasExecutionEngine().compute_profile(object(), {})
+
+
+def test_pandas_compute_profile_matches_type_inference_on_string_columns() -> None:
+    """String columns read from CSV infer the same types and stats in both engines."""
+
+    from datetime import datetime
+
+    import pandas as pd
+
+    rows = [
+        {"Amount": "10", "DueDate": "2024-01-31T10:00:00Z", "Code": "7", "Mixed": 7, "PaidAt": datetime(2024, 2, 1)},
+        {"Amount": "20.5", "DueDate": "2024-01-30", "Code": "X", "Mixed": "8", "PaidAt": None},
+        {"Amount": None, "DueDate": None, "Code": "7", "Mixed": None, "PaidAt": datetime(2024, 1, 5, 9)},
+        {"Amount": "10", "DueDate": "2024-01-30", "Code": "7", "Mixed": 7.5, "PaidAt": datetime(2024, 1, 5, 9)},
+    ]
+    job = ProfilingJob(job_id="profile-job-1", tenant_id="tenant-1", dataset_type="billing")
+    engine = ProfilingEngine()
+
+    expected = engine.profile(job, rows)
+    actual = engine.profile(job, PandasDatasetHandle(pd.DataFrame(rows)))
+
+    assert actual.snapshot.dict() == expected.snapshot.dict()
+    assert expected.snapshot.field_stats["Amount"].max_value == 20.5
+    assert expected.snapshot.field_stats["DueDate"].inferred_type == "datetime"
+    assert expected.snapshot.field_stats["Mixed"].inferred_type == "float"
+    assert expected.snapshot.field_stats["PaidAt"].temporal_min == datetime(2024, 1, 5, 9)
+
+
+def test_pandas_apply_transformations_matches_row_handlers() -> None:
+    """Native pandas cleansing reproduces the row-based handlers step by step."""
+
+    import pandas as pd
+
+    from dq_cleansing import (
+        CleansingEngine,
+        CleansingJob,
+        CleansingRule,
+        TransformationStep,
+    )
+    from dq_cleansing.engine.transformer import apply_transformation
+
+    steps = [
+        TransformationStep(type="standardize", target_fields=["Currency", "Missing"], parameters={"format": "ISO-4217"}),
+        TransformationStep(type="fill_missing", target_fields=["Region", "Note"], parameters={"default": "n/a"}),
+        TransformationStep(type="fill_missing", target_fields=["CustomerId"], severity="hard"),
+        TransformationStep(type="deduplicate", target_fields=["Invoice", "Currency"]),
+        TransformationStep(type="standardize", target_fields=["Region"], parameters={"format": "lower"}),
+    ]
+    rows = [
+        {"Invoice": "INV-1", "Currency": "usd", "Region": "North", "CustomerId": "C1", "Amount": 10},
+        {"Invoice": "INV-1", "Currency": "USD", "Region": None, "CustomerId": "C2", "Amount": 11},
+        {"Invoice": "INV-2", "Currency": 978, "Region": "", "CustomerId": "", "Amount": 12},
+        {"Invoice": "INV-3", "Currency": None, "Region": "South", "CustomerId": None, "Amount": 13},
+        {"Invoice": "INV-4", "Currency": "eur", "Region": "East", "CustomerId": "C5", "Amount": 14},
+        {"Invoice": "INV-4", "Currency": "eur", "Region": "West", "CustomerId": "C6", "Amount": 15},
+    ]
+
+    handle, outcomes = PandasExecutionEngine().run_transformations(PandasDatasetHandle(pd.DataFrame(rows)), steps)
+
+    dataset = pd.DataFrame(rows).to_dict("records")
+    for step, (metrics, rejected) in zip(steps, outcomes):
+        expected = apply_transformation(dataset, step)
+        dataset = expected.dataset.to_rows()
+        assert metrics == expected.metrics
+        assert rejected == expected.rejected
+    assert handle.df.to_dict("records") == dataset
+    assert [row["Invoice"] for row in dataset] == ["INV-1", "INV-4"]
+
+    rule = CleansingRule(rule_id="r", name="r", dataset_type="billing", version="1", transformations=steps)
+    job = CleansingJob(job_id="cln-job-1", tenant_id="tenant-1", dataset_type="billing", rule_id="r")
+    engine = CleansingEngine()
+    result, cleansed, _ = engine.run(job, rule, PandasDatasetHandle(pd.DataFrame(rows)))
+    expected_result, expected_rows, _ = engine.run(job, rule, pd.DataFrame(rows).to_dict("records"))
+    assert isinstance(cleansed, PandasDatasetHandle)
+    assert cleansed.df.to_dict("records") == expected_rows
+    assert result.dict() == expected_result.dict()
+
+    # None and NaN are the same missing key, as are equal int and float keys.
+    frame = pd.DataFrame({"Key": [None, float("nan"), "a", "a", 1, 1.0], "Amount": range(6)})
+    step = TransformationStep(type="deduplicate", target_fields=["Key", "Missing"])
+    handle, [(metrics, rejected)] = PandasExecutionEngine().run_transformations(PandasDatasetHandle(frame), [step])
+    expected = apply_transformation(frame.to_dict("records"), step)
+    assert metrics == expected.metrics
+    assert metrics["deduplicated"] == 3
+    assert [entry["row"]["Amount"] for entry in rejected] == [1, 3, 5]
+    assert handle.df["Amount"].tolist() == [row["Amount"] for row in expected.dataset.to_rows()]
@@ -1,5 +1,6 @@
 """Unit tests covering profiling engine metrics and reporting."""
 
+import pickle
 import sys
 from pathlib import Path
 
@@ -7,8 +8,15 @@ import pytest
 
 sys.path.append(str(Path(__file__).resolve().parents[2] / "src"))
 
+from dq_profiling.engine.accumulators import AccumulatorConfig, accumulate_rows
+from dq_profiling.engine.context_builder import ProfilingContextBuilder
 from dq_profiling.engine.profiler import ProfilingEngine
-from dq_profiling.models.profiling_job import ProfilingJob
+from dq_profiling.engine.result_cache import ProfilingResultCache
+from dq_profiling.models.profiling_job import ProfilingJob, ProfilingSampling
+from dq_profiling.models.profiling_state import (
+    ProfilingState,
+    ProfilingStateMismatchError,
+)
 from dq_profiling.report.profiling_report import profiling_report_from_result
 
 
@@ -74,3 +82,401 @@ def test_profiling_report_surfaces_extended_metrics() -> None:
     assert "frequent_values" in amount_summary.to_dict()
     rows = list(report.to_rows())
     assert rows[0][:4] == ["field_name", "non_null", "nulls", "distinct"]
+
+
+def test_sketch_mode_bounds_memory_and_flags_approximate_fields() -> None:
+    """Sketch mode should estimate distinct counts and surface error bounds."""
+
+    dataset = [
+        {"InvoiceNumber": f"INV-{index}", "Amount": float(index % 100), "Status": "PAID" if index % 4 else "FAILED"}
+        for index in range(5000)
+    ]
+    engine = ProfilingEngine(mode="sketch", frequency_capacity=16)
+
+    result = engine.profile(build_job(), dataset)
+
+    invoice_stats = result.snapshot.field_stats["InvoiceNumber"]
+    status_stats = result.snapshot.field_stats["Status"]
+    amount_stats = result.snapshot.field_stats["Amount"]
+
+    assert invoice_stats.approximate is True
+    assert invoice_stats.distinct == pytest.approx(5000, rel=4 * invoice_stats.error_bounds["distinct"])
+    assert status_stats.frequent_values[0].value == "PAID"
+    assert status_stats.frequent_values[0].count == 3750
+    assert amount_stats.distribution is not None
+    assert sum(bucket.count for bucket in amount_stats.distribution.buckets) == 5000
+    assert "distribution" in amount_stats.error_bounds
+    assert amount_stats.min_value == 0.0 and amount_stats.max_value == 99.0
+
+    context = ProfilingContextBuilder().build(result.snapshot)
+    assert "InvoiceNumber" in context.metadata["approximate_fields"]
+
+
+def test_profiling_engine_rejects_unknown_mode() -> None:
+    """Only exact and sketch profiling modes are supported."""
+
+    with pytest.raises(ValueError):
+        ProfilingEngine(mode="fast")
+
+
+def test_parallel_profiling_matches_serial_run_in_exact_mode() -> None:
+    """Merged partition accumulators must reproduce the serial snapshot."""
+
+    dataset = [
+        {"Amount": (index * 7) % 113 / 3 if index % 5 else None, "Status": ["PAID", "OPEN", "FAILED"][index % 3]}
+        for index in range(1000)
+    ]
+
+    serial = ProfilingEngine().profile(build_job(), dataset)
+    engine = ProfilingEngine(workers=2, partition_rows=128)
+    parallel = engine.profile(build_job(), dataset)
+
+    assert parallel.snapshot.dict() == serial.snapshot.dict()
+
+    # Workers receive only the accumulator config, which survives pickling unchanged.
+    config = engine._accumulator_config
+    shipped = pickle.loads(pickle.dumps(config))
+    assert {name: getattr(shipped, name) for name in AccumulatorConfig.__slots__} == {
+        name: getattr(config, name) for name in AccumulatorConfig.__slots__
+    }
+    count, aggregates = accumulate_rows(dataset, shipped)
+    expected_count, expected = accumulate_rows(dataset, config)
+    assert count == expected_count == len(dataset)
+    assert {name: acc.to_dict() for name, acc in aggregates.items()} == {
+        name: acc.to_dict() for name, acc in expected.items()
+    }
+
+
+def test_incremental_profiling_resumes_from_saved_state() -> None:
+    """Profiling only appended rows on top of saved state equals a full run."""
+
+    dataset = [{"Amount": index * 1.5 if index % 4 else None, "Status": ["PAID", "OPEN"][index % 2]} for index in range(200)]
+    engine = ProfilingEngine()
+
+    full = engine.profile(build_job(), dataset)
+    first = engine.profile(build_job().copy(update={"incremental": True}), dataset[:120])
+    assert first.state is not None
+    saved_state = ProfilingState.parse_raw(first.state.json())
+
+    resumed = engine.profile(build_job(), dataset[120:], previous_state=saved_state)
+
+    assert resumed.snapshot.dict() == full.snapshot.dict()
+    assert resumed.state is not None and resumed.state.record_count == 200
+
+
+def test_incremental_profiling_rejects_state_from_other_configuration() -> None:
+    """A configuration change must force a full recompute."""
+
+    first = ProfilingEngine().profile(build_job().copy(update={"incremental": True}), sample_dataset())
+    engine = ProfilingEngine(histogram_buckets=10)
+
+    assert first.state is not None
+    assert not engine.is_state_compatible(first.state)
+    with pytest.raises(ProfilingStateMismatchError):
+        engine.profile(build_job(), sample_dataset(), previous_state=first.state)
+
+
+def test_profiling_reports_quantiles_in_exact_and_sketch_modes() -> None:
+    """Quantiles are exact from retained values and approximate from sketches."""
+
+    dataset = [{"Amount": float(index)} for index in range(1, 1001)]
+
+    exact = ProfilingEngine().profile(build_job(), dataset).snapshot.field_stats["Amount"]
+    sketch = ProfilingEngine(mode="sketch", histogram_bins=16).profile(build_job(), dataset).snapshot.field_stats["Amount"]
+
+    assert exact.quantiles["p50"] == pytest.approx(500.5)
+    assert exact.quantiles["p99"] == pytest.approx(990.01)
+    assert set(sketch.quantiles) == {"p1", "p50", "p95", "p99"}
+    assert sketch.quantiles["p95"] == pytest.approx(950, abs=1000 * sketch.error_bounds["quantiles"] * 2)
+    assert sketch.distribution is not None
+    assert sum(bucket.count for bucket in sketch.distribution.buckets) == 1000
+
+
+@pytest.mark.parametrize(
+    "sampling",
+    [
+        {"method": "bernoulli", "rate": 0.1, "seed": 7},
+        {"method": "reservoir", "size": 1000, "seed": 7},
+    ],
+)
+def test_sampled_profiling_reports_rate_and_confidence_intervals(sampling: dict) -> None:
+    """Sampled snapshots keep the full row count and bound sample-based metrics."""
+
+    dataset = [
+        {"Amount": None if index % 5 == 0 else float(index % 100), "Customer": f"C{index}"}
+        for index in range(10_000)
+    ]
+    job = build_job().copy(update={"sampling": ProfilingSampling(**sampling)})
+
+    result = ProfilingEngine().profile(job, dataset)
+    snapshot = result.snapshot
+    amount = snapshot.field_stats["Amount"]
+    customer = snapshot.field_stats["Customer"]
+
+    assert snapshot.record_count == 10_000
+    assert snapshot.sampling is not None
+    assert snapshot.sampling.population_rows == 10_000
+    assert snapshot.sampling.rate == snapshot.sampling.sampled_rows / 10_000
+    low, high = amount.confidence_intervals["null_ratio"]
+    assert low <= 0.2 <= high
+    low, high = amount.confidence_intervals["mean"]
+    assert low <= 49.5 <= high
+    low, high = customer.confidence_intervals["distinct"]
+    assert low <= customer.distinct <= high
+    assert any("sample" in warning for warning in result.warnings)
+
+    context = ProfilingContextBuilder().build(snapshot, job)
+    assert context.metadata["sampling"]["method"] == sampling["method"]
+    assert profiling_report_from_result(result).to_dict()["sampling"]["sampled_rows"] > 0
+
+
+def test_result_cache_serves_repeated_checksums_and_evicts_lru() -> None:
+    """Identical checksums hit the cache; other configs and old entries miss."""
+
+    from dq_stores.memory import InMemoryStore
+
+    store = InMemoryStore()
+    cache = ProfilingResultCache(max_entries=1, store=store)
+    engine = ProfilingEngine(result_cache=cache)
+    job = build_job().copy(update={"dataset_checksum": "sha256:abc", "contract_version": "1.0.0"})
+
+    first = engine.profile(job, sample_dataset())
+    replay = engine.profile(job.copy(update={"job_id": "profile-job-2"}), [])
+
+    assert replay.job_id == "profile-job-2"
+    assert replay.snapshot == first.snapshot
+    assert cache.stats.hits == 1 and cache.stats.misses == 1
+
+    ProfilingEngine(top_frequencies=1, result_cache=cache).profile(job, sample_dataset())
+    assert cache.stats.misses == 2
+    assert cache.stats.evictions == 1
+
+    # The evicted entry is still persisted and is restored from the store.
+    restored = ProfilingEngine(result_cache=cache).profile(job, [])
+    assert restored.snapshot == first.snapshot
+    assert cache.stats.store_hits == 1
+
+
+def test_context_overrides_copy_only_overridden_fields() -> None:
+    """Applying overrides leaves the snapshot untouched and shares other fields."""
+
+    snapshot = ProfilingEngine().profile(build_job(), sample_dataset()).snapshot
+    job = build_job().copy(update={"overrides": {"Amount": {"thresholds": {"max": 25}}, "Region": {}}})
+
+    merged = snapshot.merge_overrides(job.overrides)
+    context = ProfilingContextBuilder().build(snapshot, job)
+
+    assert merged.field_stats["Status"] is snapshot.field_stats["Status"]
+    assert merged.field_stats["Amount"].thresholds == {"max": 25}
+    assert snapshot.field_stats["Amount"].thresholds == {}
+    assert "Region" not in snapshot.field_stats and snapshot.overrides_applied == {}
+    assert context.field_thresholds["Amount"] == {"max": 25}
+    context.field_thresholds["Status"]["min"] = 1
+    assert snapshot.field_stats["Status"].thresholds == {}
+
+
+def test_high_cardinality_fields_keep_top_values_and_tail_summary() -> None:
+    """ID-like fields list only the top-k values and roll the rest into a tail."""
+
+    dataset = [{"Invoice": "INV-1"}] * 5 + [{"Invoice": f"INV-{index:04d}"} for index in range(100)]
+    engine = ProfilingEngine(categorical_distinct_limit=10, categorical_top_k=3)
+
+    distribution = engine.profile(build_job(), dataset).snapshot.field_stats["Invoice"].distribution
+
+    assert distribution is not None
+    assert [freq.value for freq in distribution.values][0] == "INV-1"
+    assert len(distribution.values) == 3
+    assert distribution.tail.distinct == 98
+    assert distribution.tail.count == 98
+    assert distribution.tail.min_length == distribution.tail.max_length == 8
+    assert distribution.tail.entropy > 6
+
+    sketch = ProfilingEngine(mode="sketch", categorical_distinct_limit=10, categorical_top_k=3)
+    sketch_distribution = sketch.profile(build_job(), dataset).snapshot.field_stats["Invoice"].distribution
+    assert len(sketch_distribution.values) == 3
+    assert sketch_distribution.tail is not None
+
+
+def test_type_inference_promotes_parseable_string_columns() -> None:
+    """CSV-style strings are typed in the same scan and feed numeric/temporal stats."""
+
+    dataset = [
+        {"Amount": "10", "Paid": "true", "DueDate": "2024-01-31", "Ref": "A1"},
+        {"Amount": "20.5", "Paid": "false", "DueDate": "2024-03-01", "Ref": "17"},
+        {"Amount": "", "Paid": "yes", "DueDate": "2023-12-01", "Ref": "B2"},
+    ]
+
+    for mode in ("exact", "sketch"):
+        stats = ProfilingEngine(mode=mode).profile(build_job(), dataset).snapshot.field_stats
+
+        assert stats["Amount"].inferred_type == "float"
+        assert stats["Amount"].type_parse_rates["integer"] == 0.5
+        assert stats["Amount"].mean == pytest.approx(15.25)
+        assert (stats["Amount"].min_value, stats["Amount"].max_value) == (10.0, 20.5)
+        assert stats["Amount"].distribution.kind == "numeric"
+        assert stats["Paid"].inferred_type == "boolean"
+        assert stats["DueDate"].inferred_type == "date"
+        assert stats["DueDate"].temporal_min.isoformat() == "2023-12-01T00:00:00"
+        assert stats["DueDate"].temporal_max.isoformat() == "2024-03-01T00:00:00"
+        assert stats["Ref"].inferred_type == "string"
+        assert stats["Ref"].type_parse_rates["integer"] == pytest.approx(1 / 3, abs=1e-6)
+        assert stats["Ref"].mean is None
+        assert stats["Ref"].min_value is None and stats["Ref"].max_value is None
+
+
+def test_drift_against_baseline_uses_stored_summaries_only() -> None:
+    """Shifted distributions are flagged from histograms and top values alone."""
+
+    engine = ProfilingEngine(histogram_buckets=10)
+    baseline_rows = [{"Amount": float(value), "Status": "PAID"} for value in range(100)]
+    shifted_rows = [
+        {"Amount": float(value + 50), "Status": "PAID" if value % 2 else "FAILED"} for value in range(100)
+    ]
+    baseline = engine.profile(build_job(), baseline_rows).snapshot
+
+    stable = engine.profile(build_job(), baseline_rows, baseline=baseline)
+    assert not stable.snapshot.drift.drifted_fields
+    assert stable.snapshot.drift.fields["Amount"].psi == pytest.approx(0.0)
+
+    result = engine.profile(build_job(), shifted_rows, baseline=baseline)
+    drift = result.snapshot.drift
+    assert drift.baseline_snapshot_id == baseline.snapshot_id
+    assert drift.fields["Amount"].kind == "numeric"
+    assert drift.fields["Amount"].ks == pytest.approx(0.5, abs=0.01)
+    assert drift.fields["Status"].js_divergence == pytest.approx(0.311, abs=1e-3)
+    assert set(drift.drifted_fields) == {"Amount", "Status"}
+    assert any("'Amount' drifted" in warning for warning in result.warnings)
+
+    context = ProfilingContextBuilder().build(result.snapshot)
+    assert context.metadata["drift"]["fields"]["Status"]["drifted"] is True
+
+
+def test_categorical_drift_ignores_swaps_at_the_top_values_edge() -> None:
+    """A value listed on one side only is pooled with the other side's unlisted mass."""
+
+    def rows(d: int, e: int) -> list:
+        counts = {"a": 300, "b": 200, "c": 150, "d": d, "e": e}
+        listed = [{"Status": value} for value, count in counts.items() for _ in range(count)]
+        return listed + [{"Status": f"x{index}"} for index in range(1_000 - len(listed))]
+
+    engine = ProfilingEngine(categorical_distinct_limit=4, categorical_top_k=4)
+    baseline = engine.profile(build_job(), rows(60, 55)).snapshot
+    swapped = engine.profile(build_job(), rows(55, 60), baseline=baseline).snapshot.drift.fields["Status"]
+    assert swapped.psi == pytest.approx(0.0)
+    assert not swapped.drifted
+
+
+def test_profiling_spec_from_contract_limits_full_statistics() -> None:
+    """Only contract and rule fields get full stats; the rest are null-counted or dropped."""
+
+    from dq_contracts.models import ColumnContract, DatasetContract, RuleBinding
+    from dq_profiling.models.profiling_job import ProfilingSpec
+
+    contract = DatasetContract(
+        dataset_contract_id="billing-contract",
+        dataset_type="billing",
+        tenant_id="tenant-1",
+        environment="prod",
+        version="1.0.0",
+        columns=[ColumnContract(column_id="amount", display_name="Amount", data_type="decimal")],
+    )
+    binding = RuleBinding(
+        binding_id="binding-1",
+        tenant_id="tenant-1",
+        environment="prod",
+        rule_template_id="status-null-threshold",
+        rule_type="profiling",
+        target_scope="column",
+        target_id="Status",
+    )
+    spec = ProfilingSpec.from_contract(contract, bindings=[binding])
+    assert spec.fields == ["amount", "Amount", "Status"]
+
+    rows = [dict(row, Extra="x" if index else None) for index, row in enumerate(sample_dataset())]
+    job = build_job().copy(update={"spec": spec, "incremental": True})
+    result = ProfilingEngine().profile(job, rows)
+
+    extra = result.snapshot.field_stats["Extra"]
+    assert extra.count_only and (extra.non_null, extra.nulls) == (3, 1)
+    assert extra.frequent_values == [] and extra.inferred_type is None
+    assert result.snapshot.field_stats["Amount"].mean == pytest.approx(20.0)
+    assert result.state.fields["Extra"] == {"kind": "count", "non_null": 3, "nulls": 1}
+
+    with pytest.raises(ProfilingStateMismatchError):
+        ProfilingEngine().profile(build_job(), rows, previous_state=result.state)
+
+    dropped = ProfilingSpec(fields=["Amount"], count_other_fields=False)
+    result = ProfilingEngine().profile(build_job().copy(update={"spec": dropped}), rows)
+    assert list(result.snapshot.field_stats) == ["Amount"]
+    assert dropped.project_source_ref({"uri": "blob://billing.csv"}) == {
+        "uri": "blob://billing.csv",
+        "columns": ["Amount"],
+    }
+
+
+def test_cross_column_profiling_suggests_keys_and_dependencies() -> None:
+    """Unique columns, unique pairs and CustomerId -> Region are found in one scan."""
+
+    import pandas as pd
+
+    from dq_engine.pandas_engine import PandasDatasetHandle
+    from dq_profiling.models.profiling_job import ProfilingCrossColumn, ProfilingSpec
+
+    rows = [
+        {
+            "InvoiceId": f"INV-{index}",
+            "CustomerId": index // 4,
+            "LineNo": index % 4,
+            "Region": ("north", "south", "east")[(index // 4) % 3],
+            "Amount": float(index % 7) if index % 9 else None,
+        }
+        for index in range(2_000)
+    ]
+    options = ProfilingCrossColumn(warmup_rows=200, sample_size=500, seed=7)
+    job = build_job().copy(update={"cross_column": options})
+
+    result = ProfilingEngine().profile(job, rows)
+    cross_column = result.snapshot.cross_column
+
+    assert [candidate.columns for candidate in cross_column.key_candidates] == [
+        ["InvoiceId"],
+        ["CustomerId", "LineNo"],
+    ]
+    assert cross_column.suggested_primary_keys == ["InvoiceId"]
+    assert cross_column.suggested_indexes[0]["fields"] == ["CustomerId", "LineNo"]
+    assert [(fd.determinant, fd.dependent) for fd in cross_column.functional_dependencies] == [
+        ("CustomerId", "Region")
+    ]
+
+    frame_result = ProfilingEngine().profile(job, PandasDatasetHandle(pd.DataFrame(rows)))
+    assert frame_result.snapshot.cross_column == cross_column
+
+    projected = job.copy(update={"spec": ProfilingSpec(fields=["Region", "LineNo", "CustomerId"])})
+    frame_projected = ProfilingEngine().profile(projected, PandasDatasetHandle(pd.DataFrame(rows)))
+    assert frame_projected.snapshot.cross_column == ProfilingEngine().profile(projected, rows).snapshot.cross_column
+    assert frame_projected.snapshot.cross_column.columns == ["CustomerId", "LineNo", "Region"]
+
+    with pytest.raises(ValueError):
+        ProfilingEngine().profile(job.copy(update={"incremental": True}), rows)
+
+
+def test_cross_column_keys_are_decided_after_the_warmup() -> None:
+    """Warm-up uniqueness neither hides composite keys nor excuses early repeats."""
+
+    from dq_profiling.engine.cross_column import CrossColumnScanner
+    from dq_profiling.models.profiling_job import ProfilingCrossColumn
+
+    # `a` is unique in the first 1,500 rows only; (a, b) is the real key.
+    rows = [{"a": index % 1_500, "b": index // 1_500} for index in range(30_000)]
+    scanner = CrossColumnScanner(rows, ProfilingCrossColumn())
+    list(scanner)
+    assert [candidate.columns for candidate in scanner.result().key_candidates] == [["a", "b"]]
+
+    # 2% repeated ids, some inside the warm-up rows: within HLL error of unique, but not a key.
+    ids = [index - 1 if index % 50 == 1 else index for index in range(100_000)]
+    rows = [{"id": value, "region": value % 7} for value in ids]
+    scanner = CrossColumnScanner(rows, ProfilingCrossColumn(seed=3))
+    list(scanner)
+    result = scanner.result()
+    assert result.key_candidates == []
+    assert result.suggested_primary_keys == []
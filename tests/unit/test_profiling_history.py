@@ -0,0 +1,120 @@
+"""Tests for the rolling profiling history store."""
+
+import statistics
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "src"))
+
+from dq_contracts.models import ProfilingExpectation
+from dq_profiling.engine.history import MetricSeries, ProfilingHistoryStore
+from dq_profiling.models.profiling_snapshot import (
+    ProfilingFieldStats,
+    ProfilingSnapshot,
+)
+from dq_stores.memory import InMemoryStore
+
+
+def build_snapshot(run: int, mean: float) -> ProfilingSnapshot:
+    """Create a one-field snapshot with the given mean."""
+
+    return ProfilingSnapshot(
+        snapshot_id=f"profile-{run}",
+        tenant_id="tenant-1",
+        dataset_type="billing",
+        record_count=100,
+        field_stats={"Amount": ProfilingFieldStats(field_name="Amount", non_null=100, mean=mean)},
+    )
+
+
+def test_metric_series_matches_window_statistics() -> None:
+    """Rolling aggregates equal the statistics of the last N values."""
+
+    values = [5.0, 1.0, 9.0, 4.0, 7.0, 3.0, 8.0]
+    series = MetricSeries(window=4, alpha=0.5)
+    for value in values:
+        series.add(value)
+
+    window = values[-4:]
+    assert series.count == 4
+    assert series.mean == pytest.approx(statistics.fmean(window))
+    assert series.stddev == pytest.approx(statistics.pstdev(window))
+    assert series.min_value == min(window)
+    assert series.max_value == max(window)
+    assert series.runs == len(values)
+
+
+def test_history_store_derives_thresholds_and_checks_change_tolerance() -> None:
+    """Thresholds come from recorded runs; tolerance compares against the last run."""
+
+    store = InMemoryStore()
+    history = ProfilingHistoryStore(window=3, metrics=("mean",), store=store)
+    for run, mean in enumerate([100.0, 110.0, 90.0]):
+        history.record(build_snapshot(run, mean))
+
+    current = build_snapshot(4, 150.0)
+    enriched = history.apply_thresholds(current, sigmas=2)
+    thresholds = enriched.field_stats["Amount"].thresholds["mean"]
+    assert thresholds["mean"] == pytest.approx(100.0)
+    assert thresholds["upper"] == pytest.approx(100.0 + 2 * statistics.pstdev([100.0, 110.0, 90.0]))
+    assert current.field_stats["Amount"].thresholds == {}
+
+    expectation = ProfilingExpectation(metric="mean", change_tolerance_pct=25)
+    (check,) = history.check_change_tolerance(current, {"Amount": [expectation]})
+    assert check.previous == 90.0
+    assert check.change_pct == pytest.approx(66.666, rel=1e-3)
+    assert not check.within_tolerance
+
+    # A fresh store reloads the persisted series.
+    reloaded = ProfilingHistoryStore(window=3, metrics=("mean",), store=store)
+    assert reloaded.get("tenant-1", "billing", "Amount", "mean").mean == pytest.approx(100.0)
+
+
+def test_change_tolerance_tracks_metrics_outside_the_history_defaults() -> None:
+    """Untracked expectation metrics are skipped at first, then recorded and compared."""
+
+    history = ProfilingHistoryStore(metrics=("mean",))
+    expectations = {"Amount": [ProfilingExpectation(metric="distinct_count", change_tolerance_pct=5)]}
+
+    def snapshot(run: int, distinct: int) -> ProfilingSnapshot:
+        stats = ProfilingFieldStats(field_name="Amount", non_null=100, distinct=distinct, mean=1.0)
+        return build_snapshot(run, 1.0).copy(update={"field_stats": {"Amount": stats}})
+
+    (first,) = history.check_change_tolerance(snapshot(0, 100), expectations)
+    assert first.previous is None
+    assert first.skipped and first.within_tolerance is None
+    history.record(snapshot(0, 100))
+
+    (second,) = history.check_change_tolerance(snapshot(1, 3), expectations)
+    assert second.previous == 100.0
+    assert second.within_tolerance is False
+
+    # Passing expectations to `record` tracks them without a prior check.
+    fresh = ProfilingHistoryStore(metrics=("mean",))
+    fresh.record(snapshot(0, 100), expectations)
+    assert fresh.get("tenant-1", "billing", "Amount", "distinct_count").last_value == 100.0
+
+
+def test_expected_metrics_persist_with_the_history_store() -> None:
+    """A new process keeps recording expectation metrics without being handed them."""
+
+    store = InMemoryStore()
+    expectations = {"Amount": [ProfilingExpectation(metric="distinct_count", change_tolerance_pct=5)]}
+
+    def snapshot(run: int, distinct: int) -> ProfilingSnapshot:
+        stats = ProfilingFieldStats(field_name="Amount", non_null=100, distinct=distinct, mean=1.0)
+        return build_snapshot(run, 1.0).copy(update={"field_stats": {"Amount": stats}})
+
+    ProfilingHistoryStore(metrics=("mean",), store=store).check_change_tolerance(snapshot(0, 100), expectations)
+
+    restarted = ProfilingHistoryStore(metrics=("mean",), store=store)
+    restarted.record(snapshot(0, 100))
+    assert restarted.get("tenant-1", "billing", "Amount", "distinct_count").last_value == 100.0
+
+    (check,) = ProfilingHistoryStore(metrics=("mean",), store=store).check_change_tolerance(
+        snapshot(1, 3), expectations
+    )
+    assert check.previous == 100.0
+    assert check.within_tolerance is False
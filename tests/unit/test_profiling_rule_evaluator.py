@@ -0,0 +1,82 @@
+"""Tests for batch evaluation of profiling rules against snapshots."""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(ROOT / "src"))
+sys.path.append(str(ROOT))
+
+from dq_core.engine.profiling_rules import ProfilingRuleEvaluator  # noqa: E402
+from dq_core.models.data_quality_rule import ProfilingRuleTemplate  # noqa: E402
+from dq_profiling.models.profiling_snapshot import (  # noqa: E402
+    ProfilingFieldStats,
+    ProfilingSnapshot,
+)
+from rule_libraries.loader import load_profiling_rules  # noqa: E402
+
+
+def build_snapshot() -> ProfilingSnapshot:
+    """Billing snapshot with a sparse Amount field."""
+
+    return ProfilingSnapshot(
+        snapshot_id="profile-1",
+        tenant_id="tenant-1",
+        dataset_type="billing",
+        record_count=100,
+        field_stats={
+            "Amount": ProfilingFieldStats(
+                field_name="Amount",
+                non_null=95,
+                nulls=5,
+                quantiles={"p99": 51_000.0},
+            ),
+            "Status": ProfilingFieldStats(field_name="Status", non_null=100),
+        },
+    )
+
+
+def test_profiling_rules_evaluate_in_one_pass_with_tolerance() -> None:
+    """Library rules and field-less rules produce structured pass/fail results."""
+
+    rules = load_profiling_rules(ROOT / "rule_libraries" / "profiling_rules" / "example_profiling.rules.yaml")
+    rules += load_profiling_rules(ROOT / "rule_libraries" / "profiling_rules" / "example_quantile_profiling.rules.yaml")
+    rules += [
+        ProfilingRuleTemplate(
+            rule_id="all-fields-null-ratio",
+            name="No field more than 10% null",
+            dataset_type="billing",
+            profile_metric="null_ratio",
+            threshold=0.1,
+        ),
+        ProfilingRuleTemplate(
+            rule_id="minimum-rows",
+            name="At least 1000 rows",
+            dataset_type="billing",
+            profile_metric="record_count",
+            comparison=">=",
+            threshold=1000,
+        ),
+        ProfilingRuleTemplate(
+            rule_id="payments-only",
+            name="Ignored for billing",
+            dataset_type="payments",
+            profile_metric="null_ratio",
+            threshold=0,
+        ),
+    ]
+    evaluator = ProfilingRuleEvaluator(rules)
+
+    results = {
+        (result.rule_id, result.field): result
+        for result in evaluator.evaluate(build_snapshot(), as_of=date(2024, 7, 1))
+    }
+
+    assert results[("billing-amount-null-threshold", "Amount")].status == "failed"
+    assert results[("billing-amount-p99-ceiling", "Amount")].passed
+    assert results[("all-fields-null-ratio", "Amount")].passed
+    assert results[("all-fields-null-ratio", "Status")].observed == 0.0
+    assert results[("minimum-rows", None)].status == "failed"
+    assert all(rule_id != "payments-only" for rule_id, _ in results)
+    assert len(evaluator.rules_for("billing", "Amount", "P99")) == 1
@@ -103,3 +103,17 @@ def test_rule_type_inferred_from_path() -> None:
     rules = load_rules_from_file(yaml_path)
     assert len(rules) == 1
     assert isinstance(rules[0], ValidationRuleTemplate)
+
+
+def test_profiling_yaml_quantile_metric_resolves_against_stats() -> None:
+    """Quantile profile metrics should resolve against profiling field stats."""
+
+    from dq_profiling import ProfilingFieldStats
+
+    yaml_path = ROOT / "rule_libraries" / "profiling_rules" / "example_quantile_profiling.rules.yaml"
+    rule = load_profiling_rules(yaml_path)[0]
+    stats = ProfilingFieldStats(field_name="Amount", non_null=98, nulls=2, quantiles={"p99": 1200.0})
+
+    assert rule.profile_metric == "p99"
+    assert stats.get_metric(rule.profile_metric) == pytest.approx(1200.0)
+    assert stats.get_metric("null_ratio") == pytest.approx(0.02)